@@ -0,0 +1,84 @@
+# bot/benchmarks/fake_api.py
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from aiohttp import web
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+
+
+class FakeBotAPI:
+    """
+    Mahalliy soxta Bot API serveri (testlar va yuklama o'lchovlari uchun)
+
+    send_message/send_photo/send_document/edit_message_caption so'rovlarini
+    qabul qiladi va vaqti bilan yozib boradi. retry_after[chat_id] = [soniya, ...]
+    berilsa, shu chatga keyingi so'rovlar navbat bilan 429 (Too Many Requests) oladi,
+    failing_chats dagi chatlarga esa har doim 400 (chat not found).
+    """
+
+    def __init__(self):
+        self.requests: List[Tuple[float, str, int]] = []  # (vaqt, metod, chat_id)
+        self.retry_after: Dict[int, List[int]] = {}
+        self.failing_chats: Set[int] = set()
+        self._runner: Optional[web.AppRunner] = None
+        self._message_id = 0
+        self.url = ''
+
+    async def start(self) -> 'FakeBotAPI':
+        app = web.Application()
+        app.router.add_post('/bot{token}/{method}', self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f'http://127.0.0.1:{port}'
+        return self
+
+    async def close(self):
+        if self._runner:
+            await self._runner.cleanup()
+
+    def bot(self, token: str = '1:FAKE') -> Bot:
+        """Shu serverga ulangan Bot"""
+        return Bot(token=token, session=AiohttpSession(api=TelegramAPIServer.from_base(self.url)))
+
+    def chat_requests(self, chat_id: int) -> List[float]:
+        """Chatga kelgan so'rovlar vaqtlari"""
+        return [at for at, _, chat in self.requests if chat == chat_id]
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        data = await request.post()
+        chat_id = int(data['chat_id'])
+        method = request.match_info['method']
+        self.requests.append((time.monotonic(), method, chat_id))
+
+        if chat_id in self.failing_chats:
+            return web.json_response({
+                'ok': False,
+                'error_code': 400,
+                'description': 'Bad Request: chat not found'
+            })
+
+        delays = self.retry_after.get(chat_id)
+        if delays:
+            retry_after = delays.pop(0)
+            return web.json_response({
+                'ok': False,
+                'error_code': 429,
+                'description': f'Too Many Requests: retry after {retry_after}',
+                'parameters': {'retry_after': retry_after}
+            })
+
+        self._message_id += 1
+        return web.json_response({
+            'ok': True,
+            'result': {
+                'message_id': self._message_id,
+                'date': int(time.time()),
+                'chat': {'id': chat_id, 'type': 'group' if chat_id < 0 else 'private'},
+                'text': data.get('text', '')
+            }
+        })
@@ -0,0 +1,109 @@
+# bot/benchmarks/fsm_writes.py
+"""
+Bitta chek yuborish jarayoni (ReceiptSubmission) uchun FSM xotirasi operatsiyalari
+
+Handlerlar ketma-ketligi (yangi talaba) FSMContext orqali takrorlanadi;
+har bir update oldidan dispatcher holatni o'qiydi, oxirida
+FSMCommitMiddleware end_update ni chaqiradi.
+
+    python -m bot.benchmarks.fsm_writes
+"""
+import asyncio
+from collections import Counter
+
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from bot.utils.fsm_buffer import CoalescingStorage
+
+STATE = 'ReceiptSubmission:{}'
+
+# (update_data, keyingi holat) - student.py dagi qadamlar
+STEPS = [
+    ({}, 'waiting_for_student_id'),
+    ({'student_id': 'ST-1001'}, 'waiting_for_first_name'),
+    ({'first_name': 'Ali'}, 'waiting_for_last_name'),
+    ({'last_name': 'Valiyev'}, 'waiting_for_patronymic'),
+    ({'patronymic': 'Olimovich'}, 'waiting_for_passport'),
+    ({'passport_series': 'AA', 'passport_number': '1234567'}, 'waiting_for_jshshir'),
+    ({'jshshir': '12345678901234'}, 'waiting_for_phone'),
+    ({'phone': '+998901234567'}, 'waiting_for_stage'),
+    ({'stage': '1', 'schedule_id': 1}, 'waiting_for_file'),
+    ({'file_id': 'AgACAgIAAxkBAAI' + 'x' * 60}, 'confirmation'),
+]
+
+
+class CountingStorage(MemoryStorage):
+    """Operatsiyalarni sanaydigan xotira (set_record - DatabaseStorage dagidek bitta yozuv)"""
+
+    def __init__(self):
+        super().__init__()
+        self.ops = Counter()
+
+    async def set_state(self, key, state=None):
+        self.ops['write'] += 1
+        await super().set_state(key, state)
+
+    async def set_data(self, key, data):
+        self.ops['write'] += 1
+        await super().set_data(key, data)
+
+    async def set_record(self, key, state, data):
+        self.ops['write'] += 1
+        await super().set_state(key, state)
+        await super().set_data(key, data)
+
+    async def get_state(self, key):
+        self.ops['read'] += 1
+        return await super().get_state(key)
+
+    async def get_data(self, key):
+        self.ops['read'] += 1
+        return await super().get_data(key)
+
+
+async def submit_receipt(storage, key: StorageKey):
+    """Bitta to'liq chek yuborish jarayoni"""
+    context = FSMContext(storage, key)
+
+    async def update(handler):
+        await storage.get_state(key)
+        await handler()
+        if isinstance(storage, CoalescingStorage):
+            await storage.end_update(key)
+
+    for data, next_state in STEPS:
+        async def step():
+            if data:
+                await context.update_data(**data)
+            if next_state == 'confirmation':
+                await context.get_data()
+            await context.set_state(STATE.format(next_state))
+        await update(step)
+
+    async def confirm():
+        await context.get_data()
+        await context.clear()
+    await update(confirm)
+
+
+async def run(submissions: int = 100):
+    print("{:<12}{:>10}{:>10}   (bitta chek uchun)".format('rejim', 'yozish', "o'qish"))
+
+    for durability in ('none', 'always', 'step', 'checkpoint'):
+        counting = CountingStorage()
+        storage = counting if durability == 'none' else CoalescingStorage(
+            counting,
+            durability=durability,
+            checkpoints=[STATE.format('waiting_for_stage'), STATE.format('confirmation')]
+        )
+
+        for chat_id in range(submissions):
+            await submit_receipt(storage, StorageKey(bot_id=1, chat_id=chat_id, user_id=chat_id))
+
+        print(f"{durability:<12}{counting.ops['write'] / submissions:>10.1f}{counting.ops['read'] / submissions:>10.1f}")
+
+
+if __name__ == '__main__':
+    asyncio.run(run())
@@ -0,0 +1,102 @@
+# bot/benchmarks/review_load.py
+"""
+Bir vaqtda ko'rib chiquvchi adminlar simulyatsiyasi (Bot API siz)
+
+Har bir chekni `reviewers` ta admin bir vaqtda tasdiqlash/rad etishga
+urinadi. Test ma'lumotlari (bench-* talabalar, jadval, adminlar)
+yaratiladi va oxirida o'chiriladi - ishlab chiqish bazasida ishga tushiring.
+
+    python -m bot.benchmarks.review_load --receipts 200 --reviewers 5
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import date
+
+from bot.django_setup import setup_django
+
+setup_django()
+
+from webapp.admin_panel.models import User, Student, PaymentSchedule, Receipt
+from bot.services.receipt_service import ReceiptService
+
+PREFIX = 'bench-review'
+
+
+async def naive_review(receipt_id: int, status: str, reviewer: User) -> bool:
+    """Oldingi usul: o'qish - tekshirish - saqlash (qulfsiz)"""
+    receipt = await Receipt.objects.aget(id=receipt_id)
+    if receipt.status != 'pending':
+        return False
+    receipt.status = status
+    receipt.reviewed_by = reviewer
+    await receipt.asave()
+    return True
+
+
+async def run_round(review, receipt_ids, reviewers):
+    rnd = random.Random(0)
+    attempts = [
+        review(receipt_id, rnd.choice(['approved', 'rejected']), reviewer)
+        for receipt_id in receipt_ids
+        for reviewer in reviewers
+    ]
+    rnd.shuffle(attempts)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*attempts)
+    duration = time.perf_counter() - started
+
+    claims = sum(1 for result in results if (result[0] if isinstance(result, tuple) else result))
+    return claims, duration
+
+
+async def run(receipts: int, reviewers: int):
+    schedule = await PaymentSchedule.objects.acreate(academic_year=PREFIX, stage='1/4', due_date=date.today())
+    admins = [
+        await User.objects.acreate(username=f'{PREFIX}-admin-{i}', role='admin')
+        for i in range(reviewers)
+    ]
+    students = await Student.objects.abulk_create([
+        Student(
+            student_id=f'{PREFIX}-{i}', first_name='Test', last_name='Test', patronymic='Test',
+            passport_series='AA', passport_number=f'{i:07d}', jshshir=f'99{i:012d}', phone='+998000000000'
+        )
+        for i in range(receipts)
+    ])
+
+    try:
+        for name, review in (('UPDATE ... WHERE pending', ReceiptService.review_receipt), ('o\'qish-saqlash', naive_review)):
+            await Receipt.objects.filter(payment_schedule=schedule).adelete()
+            await Receipt.objects.abulk_create([
+                Receipt(student=student, payment_schedule=schedule, file_id='bench')
+                for student in students
+            ])
+            receipt_ids = [
+                receipt_id async for receipt_id in Receipt.objects.filter(
+                    payment_schedule=schedule
+                ).values_list('id', flat=True)
+            ]
+
+            claims, duration = await run_round(review, receipt_ids, admins)
+            print(f"{name:<26} cheklar: {len(receipt_ids)}, urinishlar: {len(receipt_ids) * reviewers}, "
+                  f"muvaffaqiyatli: {claims}, dublikat: {claims - len(receipt_ids)}, {duration:.2f} s")
+    finally:
+        await Receipt.objects.filter(payment_schedule=schedule).adelete()
+        await Student.objects.filter(student_id__startswith=PREFIX).adelete()
+        await User.objects.filter(username__startswith=PREFIX).adelete()
+        await schedule.adelete()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bir vaqtda ko'rib chiqish testi")
+    parser.add_argument('--receipts', type=int, default=100)
+    parser.add_argument('--reviewers', type=int, default=5)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.receipts, args.reviewers))
+
+
+if __name__ == '__main__':
+    main()
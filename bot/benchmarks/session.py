@@ -0,0 +1,27 @@
+# bot/benchmarks/session.py
+import asyncio
+from typing import Any, AsyncGenerator, Dict, Optional
+
+from aiogram.client.session.base import BaseSession
+
+
+class DryRunSession(BaseSession):
+    """Bot API ga so'rov yubormaydigan sessiya (yuklama testlari uchun)"""
+
+    def __init__(self, latency: float = 0.005, **kwargs):
+        super().__init__(**kwargs)
+        self.latency = latency
+        self.requests: Dict[str, int] = {}
+
+    async def make_request(self, bot, method, timeout: Optional[int] = None) -> Any:
+        name = type(method).__name__
+        self.requests[name] = self.requests.get(name, 0) + 1
+        await asyncio.sleep(self.latency)
+        return None
+
+    async def stream_content(self, url: str, headers=None, timeout: int = 30, chunk_size: int = 65536,
+                             raise_for_status: bool = True) -> AsyncGenerator[bytes, None]:
+        yield b''
+
+    async def close(self):
+        pass
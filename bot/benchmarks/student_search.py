@@ -0,0 +1,128 @@
+# bot/benchmarks/student_search.py
+"""
+Talabalarni qidirish: to'rtta icontains (oldingi usul) va Student.objects.search
+
+Tranzaksiya ichida `--students` ta talaba yaratiladi, har bir so'rov
+`--repeat` marta bajariladi va oxirida hammasi bekor qilinadi (rollback).
+Indekslar PostgreSQL da ishlaydi - ishlab chiqish bazasida ishga tushiring.
+
+    python -m bot.benchmarks.student_search --students 100000
+"""
+import argparse
+import random
+import statistics
+import time
+
+from bot.django_setup import setup_django
+
+setup_django()
+
+from django.db import connection, transaction
+from django.db.models import Q
+
+from webapp.admin_panel.models import Student
+
+LAST_NAMES = [
+    'Karimov', 'Rahimov', 'Toshmatov', 'Abdullayev', 'Yusupov', 'Nazarov', 'Ismoilov', 'Qodirov',
+    'Saidov', 'Xolmatov', 'Ergashev', 'Mirzayev', 'Sobirov', 'Jurayev', 'Aliyev', 'Hasanov'
+]
+FIRST_NAMES = [
+    'Ali', 'Vali', 'Jasur', 'Dilshod', 'Sardor', 'Aziz', 'Bekzod', 'Shoxrux',
+    'Malika', 'Dilnoza', 'Gulnora', 'Madina', 'Nilufar', 'Sevara', 'Zarina', 'Kamola'
+]
+BATCH_SIZE = 5000
+
+
+def legacy_search(query: str):
+    """Oldingi usul (views.students_list): to'rtta icontains OR"""
+    return Student.objects.filter(
+        Q(student_id__icontains=query) |
+        Q(first_name__icontains=query) |
+        Q(last_name__icontains=query) |
+        Q(jshshir__icontains=query)
+    ).order_by('last_name')
+
+
+def generate(count: int, seed: int = 0):
+    """Tasodifiy talabalar (ID va JSHSHIR unikal)"""
+    rnd = random.Random(seed)
+    for start in range(0, count, BATCH_SIZE):
+        Student.objects.bulk_create([
+            Student(
+                student_id=f'B{i:07d}',
+                first_name=rnd.choice(FIRST_NAMES),
+                last_name=rnd.choice(LAST_NAMES) + rnd.choice(['', 'a']),
+                patronymic=rnd.choice(FIRST_NAMES),
+                passport_series='AB',
+                passport_number=f'{i:07d}',
+                jshshir=f'9{rnd.randint(0, 10 ** 6):06d}{i:07d}',
+                phone='+998000000000'
+            )
+            for i in range(start, min(start + BATCH_SIZE, count))
+        ])
+
+
+def measure(queryset, repeat: int, limit: int = 50):
+    """Birinchi sahifa (limit ta) ni olish vaqti, mediana (ms)"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = list(queryset[:limit])
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), len(rows)
+
+
+def plan_summary(queryset) -> str:
+    """EXPLAIN dagi skanerlash turlari (PostgreSQL)"""
+    if connection.vendor != 'postgresql':
+        return '-'
+    plan = queryset[:50].explain()
+    nodes = [
+        line.strip().lstrip('-> ').split('  ')[0]
+        for line in plan.splitlines()
+        if 'Scan' in line
+    ]
+    return '; '.join(nodes)
+
+
+def run(students: int, repeat: int):
+    with transaction.atomic():
+        started = time.perf_counter()
+        generate(students)
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE students')
+        print(f"{students} ta talaba yaratildi: {time.perf_counter() - started:.1f} s\n")
+
+        sample = Student.objects.filter(student_id__startswith='B').order_by('?').first()
+        cases = [
+            ("familiya qismi", sample.last_name[:5]),
+            ("familiya + ism", f"{sample.last_name} {sample.first_name}"),
+            ("imlo xatosi", sample.last_name[:-1].replace('o', 'a', 1) + sample.last_name[-1]),
+            ("to'liq JSHSHIR", sample.jshshir),
+            ("JSHSHIR boshi", sample.jshshir[:7]),
+            ("talaba ID boshi", sample.student_id[:6].lower()),
+        ]
+
+        columns = ("so'rov", 'icontains, ms', 'natija', 'search, ms', 'natija')
+        print("{:<18} {:>14} {:>7} {:>11} {:>7}  reja".format(*columns))
+        for name, query in cases:
+            legacy_ms, legacy_rows = measure(legacy_search(query), repeat)
+            search_ms, search_rows = measure(Student.objects.search(query), repeat)
+            print(f"{name:<18} {legacy_ms:>14.2f} {legacy_rows:>7} {search_ms:>11.2f} {search_rows:>7}  "
+                  f"{plan_summary(Student.objects.search(query))}")
+
+        transaction.set_rollback(True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Talabalarni qidirish benchmarki")
+    parser.add_argument('--students', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    run(args.students, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
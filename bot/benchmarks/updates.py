@@ -0,0 +1,36 @@
+# bot/benchmarks/updates.py
+import itertools
+import random
+import time
+from typing import Dict, Iterator, Sequence
+
+# Sintetik foydalanuvchilar ID si shu qiymatdan boshlanadi (haqiqiy ID lar bilan to'qnashmasligi uchun)
+FAKE_USER_ID_BASE = 9_000_000_000
+
+
+def make_update(update_id: int, chat_id: int, text: str) -> Dict:
+    """Shaxsiy chatdagi matnli xabar uchun Telegram update (dict)"""
+    user = {'id': chat_id, 'is_bot': False, 'first_name': f'Test {chat_id}'}
+    return {
+        'update_id': update_id,
+        'message': {
+            'message_id': update_id,
+            'date': int(time.time()),
+            'chat': {'id': chat_id, 'type': 'private', 'first_name': user['first_name']},
+            'from': user,
+            'text': text
+        }
+    }
+
+
+def generate_updates(
+        count: int,
+        chats: int = 100,
+        texts: Sequence[str] = ('/id',),
+        seed: int = 0
+) -> Iterator[Dict]:
+    """`chats` ta soxta foydalanuvchidan tasodifiy `count` ta update"""
+    rnd = random.Random(seed)
+    for update_id in itertools.islice(itertools.count(1), count):
+        chat_id = FAKE_USER_ID_BASE + rnd.randrange(chats)
+        yield make_update(update_id, chat_id, rnd.choice(texts))
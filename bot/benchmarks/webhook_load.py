@@ -0,0 +1,63 @@
+# bot/benchmarks/webhook_load.py
+"""
+Webhook yuklama testi - sintetik update larni webhook ga yuboradi
+
+    BOT_MODE=webhook python bot/main.py
+    python -m bot.benchmarks.webhook_load --count 5000 --concurrency 50
+"""
+import argparse
+import asyncio
+import time
+from collections import Counter
+from typing import List
+
+from aiohttp import ClientSession
+
+from bot.benchmarks.updates import generate_updates
+from bot.config import WEBHOOK_PORT, WEBHOOK_PATH, WEBHOOK_SECRET
+
+
+async def run(url: str, count: int, concurrency: int, chats: int, texts: List[str], secret: str):
+    updates = generate_updates(count, chats=chats, texts=texts)
+    statuses: Counter = Counter()
+    latencies: List[float] = []
+    headers = {'X-Telegram-Bot-Api-Secret-Token': secret} if secret else {}
+
+    async def worker(session: ClientSession):
+        for update in updates:
+            started = time.perf_counter()
+            try:
+                async with session.post(url, json=update, headers=headers) as response:
+                    statuses[response.status] += 1
+            except Exception as e:
+                statuses[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    async with ClientSession() as session:
+        await asyncio.gather(*(worker(session) for _ in range(concurrency)))
+    duration = time.perf_counter() - started
+
+    latencies.sort()
+    print(f"Update lar: {len(latencies)}, vaqt: {duration:.2f} s, {len(latencies) / duration:.0f} update/s")
+    print(f"Kechikish: p50={latencies[len(latencies) // 2] * 1000:.1f} ms, "
+          f"p95={latencies[int(len(latencies) * 0.95)] * 1000:.1f} ms, "
+          f"max={latencies[-1] * 1000:.1f} ms")
+    print(f"Javoblar: {dict(statuses)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Webhook yuklama testi")
+    parser.add_argument('--url', default=f'http://127.0.0.1:{WEBHOOK_PORT}{WEBHOOK_PATH}')
+    parser.add_argument('--count', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--chats', type=int, default=100)
+    parser.add_argument('--text', action='append', dest='texts', help="xabar matni (bir necha marta berish mumkin)")
+    parser.add_argument('--secret', default=WEBHOOK_SECRET)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.url, args.count, args.concurrency, args.chats, args.texts or ['/id'], args.secret))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+# bot/benchmarks/workers_load.py
+"""
+Ko'p jarayonli rejim testi - soxta update manbai bilan, Bot API siz
+
+    python -m bot.benchmarks.workers_load --workers 4 --count 5000 --chats 200
+"""
+import argparse
+import asyncio
+import time
+
+from bot.benchmarks.updates import generate_updates
+from bot.workers import WorkerPool
+
+
+async def run(workers: int, count: int, chats: int, concurrency: int, texts):
+    pool = WorkerPool(workers=workers, concurrency=concurrency, dry_run=True)
+    pool.start()
+
+    started = time.perf_counter()
+    for update in generate_updates(count, chats=chats, texts=texts):
+        await pool.feed(None, update)
+    stats = await pool.stop()
+    duration = time.perf_counter() - started
+
+    for item in stats:
+        print(f"Worker {item['worker']}: {item['processed']} ta, xatolik: {item['failed']}, "
+              f"tartib buzilishi: {item['out_of_order']}, {item['duration']:.2f} s")
+
+    processed = sum(item['processed'] for item in stats)
+    print(f"Jami: {processed}/{count} ta update, {duration:.2f} s, {processed / duration:.0f} update/s "
+          f"(jarayonlarni ishga tushirish vaqti bilan)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ko'p jarayonli rejim testi")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--count', type=int, default=2000)
+    parser.add_argument('--chats', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--text', action='append', dest='texts', help="xabar matni (bir necha marta berish mumkin)")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.workers, args.count, args.chats, args.concurrency, args.texts or ['/id']))
+
+
+if __name__ == '__main__':
+    main()
@@ -8,8 +8,91 @@ load_dotenv()
 BOT_TOKEN = os.getenv('BOT_TOKEN')
 ADMIN_IDS = [int(id) for id in os.getenv('ADMIN_IDS', '').split(',') if id]
 
+# Ishga tushirish rejimi: polling yoki webhook
+BOT_MODE = os.getenv('BOT_MODE', 'polling')
+
+# Webhook sozlamalari
+WEBHOOK_URL = os.getenv('WEBHOOK_URL', '')  # tashqi manzil (masalan, https://bot.example.uz); bo'sh - set_webhook qilinmaydi
+WEBHOOK_PATH = os.getenv('WEBHOOK_PATH', '/webhook')
+WEBHOOK_SECRET = os.getenv('WEBHOOK_SECRET', '')
+WEBHOOK_HOST = os.getenv('WEBHOOK_HOST', '0.0.0.0')
+WEBHOOK_PORT = int(os.getenv('WEBHOOK_PORT', '8080'))
+WEBHOOK_QUEUE_SIZE = int(os.getenv('WEBHOOK_QUEUE_SIZE', '1000'))  # navbatdagi update lar chegarasi
+WEBHOOK_WORKERS = int(os.getenv('WEBHOOK_WORKERS', '20'))  # parallel qayta ishlovchilar
+WEBHOOK_DRAIN_TIMEOUT = float(os.getenv('WEBHOOK_DRAIN_TIMEOUT', '30'))  # to'xtashda navbatni kutish (soniya)
+
+# Update larni alohida jarayonlarda qayta ishlash (0 - o'chirilgan, bitta jarayon)
+UPDATE_WORKERS = int(os.getenv('UPDATE_WORKERS', '0'))
+WORKER_CONCURRENCY = int(os.getenv('WORKER_CONCURRENCY', '10'))  # har bir jarayonda parallel chatlar
+WORKER_QUEUE_SIZE = int(os.getenv('WORKER_QUEUE_SIZE', '1000'))
+
+# FSM holatlari saqlanadigan joy: database (PostgreSQL), redis yoki memory
+FSM_STORAGE = os.getenv('FSM_STORAGE', 'database')
+REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
+FSM_STATE_TTL = int(os.getenv('FSM_STATE_TTL', str(24 * 60 * 60)))  # tashlab ketilgan holatlar o'chiriladi (soniya)
+FSM_FLUSH_INTERVAL = float(os.getenv('FSM_FLUSH_INTERVAL', '1'))  # yozuvlarni to'plash (soniya); 0 - darhol yozish
+FSM_CACHE_TTL = int(os.getenv('FSM_CACHE_TTL', '600'))  # o'qish keshi, faqat UPDATE_WORKERS (chat bo'yicha bo'lingan) rejimida
+FSM_COMPRESS_MIN = 512  # shundan katta ma'lumotlar zlib bilan siqiladi (bayt)
+
+# FSM yozuvlari: always (har bir o'zgarish), step (update ga bitta yozuv) yoki checkpoint
+FSM_DURABILITY = os.getenv('FSM_DURABILITY', 'step')
+FSM_CHECKPOINT_STATES = [
+    state for state in os.getenv(
+        'FSM_CHECKPOINT_STATES',
+        'ReceiptSubmission:waiting_for_stage,ReceiptSubmission:confirmation'
+    ).split(',') if state
+]
+
+# Foydalanuvchi (rol) keshi; CACHE_URL siz web paneldagi o'zgarishlar shu vaqtdan keyin ko'rinadi
+IDENTITY_CACHE_TTL = int(os.getenv('IDENTITY_CACHE_TTL', '60'))  # soniya
+
+# Cheklar yuboriladigan admin/buxgalterlar ro'yxati keshi
+ADMIN_CACHE_TTL = int(os.getenv('ADMIN_CACHE_TTL', '300'))  # soniya
+
 # Timezone
 TIMEZONE = os.getenv('TIMEZONE', 'Asia/Tashkent')
 
 # Eslatma uchun kunlar
-REMINDER_DAYS = [30, 15, 7, 3, 0]
\ No newline at end of file
+REMINDER_DAYS = [30, 15, 7, 3, 0]
+
+# Kunlik eslatmalar jadvali (TIMEZONE bo'yicha)
+REMINDER_HOUR = int(os.getenv('REMINDER_HOUR', '9'))
+REMINDER_MINUTE = int(os.getenv('REMINDER_MINUTE', '0'))
+
+# APScheduler job store (PostgreSQL)
+SCHEDULER_DB_URL = os.getenv(
+    'SCHEDULER_DB_URL',
+    f"postgresql://{os.getenv('DB_USER', 'postgres')}:{os.getenv('DB_PASSWORD', '')}"
+    f"@{os.getenv('DB_HOST', 'localhost')}:{os.getenv('DB_PORT', '5432')}/{os.getenv('DB_NAME', 'isft_bot')}"
+)
+SCHEDULER_MISFIRE_GRACE = int(os.getenv('SCHEDULER_MISFIRE_GRACE', str(12 * 60 * 60)))  # soniya
+
+# O'tkazib yuborilgan kunlar uchun eslatmalarni necha kungacha qayta yuborish
+REMINDER_CATCHUP_DAYS = int(os.getenv('REMINDER_CATCHUP_DAYS', '7'))
+
+# Tugamay qolgan jarayon qulfini boshqa replika necha soniyadan keyin olishi mumkin
+REMINDER_RUN_LOCK_TIMEOUT = int(os.getenv('REMINDER_RUN_LOCK_TIMEOUT', str(60 * 60)))
+
+# Web paneldagi ommaviy ko'rib chiqishlar bo'yicha xabarlarni tekshirish oralig'i (soniya)
+REVIEW_BATCH_POLL_INTERVAL = int(os.getenv('REVIEW_BATCH_POLL_INTERVAL', '60'))
+
+# Ommaviy xabar yuborish (Telegram limitlari)
+BROADCAST_GLOBAL_RATE = float(os.getenv('BROADCAST_GLOBAL_RATE', '30'))  # xabar/soniya
+BROADCAST_CHAT_RATE = float(os.getenv('BROADCAST_CHAT_RATE', '1'))  # bitta chatga xabar/soniya
+BROADCAST_GROUP_RATE = float(os.getenv('BROADCAST_GROUP_RATE', '20')) / 60  # bitta guruhga xabar/soniya
+BROADCAST_CONCURRENCY = int(os.getenv('BROADCAST_CONCURRENCY', '20'))
+
+# Guruhlarga har bir talaba uchun emas, bitta umumiy (digest) eslatma yuborish
+REMINDER_GROUP_DIGEST = os.getenv('REMINDER_GROUP_DIGEST', 'True') == 'True'
+
+# Eslatma shablonlari keshining yashash vaqti (soniya)
+REMINDER_TEMPLATE_CACHE_TTL = int(os.getenv('REMINDER_TEMPLATE_CACHE_TTL', '300'))
+
+# Yuborilgan, lekin bazada hali belgilanmagan eslatmalar jurnali
+REMINDER_CHECKPOINT_FILE = os.getenv('REMINDER_CHECKPOINT_FILE', 'reminders_sent.checkpoint')
+
+# Telegram xabar uzunligi chegarasi
+MESSAGE_MAX_LENGTH = 4096
+
+# Bot ro'yxatlarida bitta sahifadagi yozuvlar soni
+LIST_PAGE_SIZE = int(os.getenv('LIST_PAGE_SIZE', '20'))
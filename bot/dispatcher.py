@@ -0,0 +1,92 @@
+# bot/dispatcher.py
+import importlib
+import logging
+import time
+from typing import Dict, Optional, Sequence
+
+from aiogram import Dispatcher
+from aiogram.fsm.storage.base import BaseStorage
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from bot.config import FSM_STORAGE, FSM_DURABILITY, FSM_CACHE_TTL, REDIS_URL, UPDATE_WORKERS
+from bot.django_setup import setup_django
+from bot.utils.background import wait_background_tasks
+
+logger = logging.getLogger(__name__)
+
+# Routerlar tartibi muhim: accountant dagi umumiy matn handleri oxirida turishi kerak
+ROUTERS = ('common', 'student', 'admin', 'group', 'accountant')
+
+# Foydalanuvchi/rol (RoleMiddleware) kerak bo'lgan routerlar
+ROLE_ROUTERS = ('common', 'student', 'admin', 'accountant')
+
+
+def create_storage() -> BaseStorage:
+    """FSM_STORAGE bo'yicha FSM xotirasi (FSM_DURABILITY bo'yicha yozuvlar birlashtiriladi)"""
+    if FSM_STORAGE == 'memory':
+        return MemoryStorage()
+
+    if FSM_STORAGE == 'redis':
+        from aiogram.fsm.storage.redis import RedisStorage
+
+        storage = RedisStorage.from_url(REDIS_URL)
+    else:
+        from bot.utils.fsm_storage import DatabaseStorage
+
+        # O'qish keshi faqat chatlar jarayonlarga bo'linganda (UPDATE_WORKERS) xavfsiz
+        storage = DatabaseStorage(cache_ttl=FSM_CACHE_TTL if UPDATE_WORKERS else 0)
+
+    if FSM_DURABILITY == 'always':
+        return storage
+
+    from bot.utils.fsm_buffer import CoalescingStorage
+
+    return CoalescingStorage(storage)
+
+
+def create_dispatcher(routers: Optional[Sequence[str]] = None, **kwargs) -> Dispatcher:
+    """
+    Dispatcher yaratish
+
+    Django bir marta sozlanadi, handler modullari faqat shu yerda
+    import qilinadi. Har bir bosqich vaqti dp['startup_timings'] da.
+    routers: faqat kerakli routerlar (masalan, testlar uchun)
+    """
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+
+    phase = time.perf_counter()
+    setup_django()
+    timings['django'] = time.perf_counter() - phase
+
+    phase = time.perf_counter()
+    from bot.middlewares.fsm_middleware import FSMCommitMiddleware
+    from bot.middlewares.role_middleware import RoleMiddleware
+    timings['middlewares'] = time.perf_counter() - phase
+
+    if 'storage' not in kwargs:
+        kwargs['storage'] = create_storage()
+    dp = Dispatcher(**kwargs)
+    dp.update.outer_middleware(FSMCommitMiddleware())
+    dp.shutdown.register(wait_background_tasks)
+    role_middleware = RoleMiddleware()
+
+    for name in routers or ROUTERS:
+        phase = time.perf_counter()
+        router = importlib.import_module(f'bot.handlers.{name}').router
+
+        if name in ROLE_ROUTERS:
+            router.message.middleware(role_middleware)
+            router.callback_query.middleware(role_middleware)
+
+        dp.include_router(router)
+        timings[f'router:{name}'] = time.perf_counter() - phase
+
+    timings['total'] = time.perf_counter() - started
+    dp['startup_timings'] = timings
+
+    logger.info(
+        "Dispatcher tayyor: %s",
+        ', '.join(f"{phase}={seconds * 1000:.0f}ms" for phase, seconds in timings.items())
+    )
+    return dp
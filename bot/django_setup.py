@@ -0,0 +1,21 @@
+# bot/django_setup.py
+import os
+import sys
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def setup_django():
+    """Django ni bir marta sozlash (keyingi chaqiruvlar hech narsa qilmaydi)"""
+    from django.apps import apps
+
+    if apps.ready:
+        return
+
+    if BASE_DIR not in sys.path:
+        sys.path.append(BASE_DIR)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'webapp.webapp.settings')
+
+    import django
+
+    django.setup()
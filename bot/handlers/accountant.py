@@ -4,18 +4,11 @@ from aiogram.types import Message, CallbackQuery
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 from datetime import datetime
-import sys
-import os
-
-sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'webapp.webapp.settings')
-
-import django
-
-django.setup()
+from typing import Optional
 
 from webapp.admin_panel.models import User, AnonymousMessage, AccountingStaff
 from bot.keyboards.admin_kb import main_admin_menu
+from bot.keyboards.student_kb import main_student_menu
 
 router = Router()
 
@@ -50,12 +43,11 @@ async def show_accounting_info(message: Message):
 
 
 @router.message(F.text == "📨 Anonim xabarlar")
-async def show_anonymous_messages(message: Message):
+async def show_anonymous_messages(message: Message, user: Optional[User] = None):
     """Anonim xabarlar ro'yxati (buxgalterlar uchun)"""
-    telegram_id = message.from_user.id
-
     try:
-        user = await User.objects.aget(telegram_id=telegram_id)
+        if user is None:
+            raise User.DoesNotExist
         if user.role not in ['admin', 'accountant']:
             await message.answer("❌ Bu bo'lim faqat buxgalteriya xodimlari uchun!")
             return
@@ -87,7 +79,8 @@ async def show_anonymous_messages(message: Message):
             count += 1
             text += f"{count}. ID: {msg.id}\n"
             text += f"   📅 {msg.replied_at.strftime('%d.%m.%Y %H:%M')}\n"
-            text += f"   👤 {msg.replied_by.get_full_name() if msg.replied_by else 'Noma\'lum'}\n\n"
+            replied_by = msg.replied_by.get_full_name() if msg.replied_by else "Noma'lum"
+            text += f"   👤 {replied_by}\n\n"
 
         await message.answer(text, parse_mode="HTML")
 
@@ -96,12 +89,11 @@ async def show_anonymous_messages(message: Message):
 
 
 @router.message(F.text.startswith("/reply_"))
-async def start_reply_to_anonymous(message: Message, state: FSMContext):
+async def start_reply_to_anonymous(message: Message, state: FSMContext, user: Optional[User] = None):
     """Anonim xabarga javob berishni boshlash"""
-    telegram_id = message.from_user.id
-
     try:
-        user = await User.objects.aget(telegram_id=telegram_id)
+        if user is None:
+            raise User.DoesNotExist
         if user.role not in ['admin', 'accountant']:
             await message.answer("❌ Ruxsat yo'q!")
             return
@@ -140,13 +132,14 @@ async def start_reply_to_anonymous(message: Message, state: FSMContext):
 
 
 @router.message(ReplyToAnonymous.waiting_for_reply)
-async def process_reply_to_anonymous(message: Message, state: FSMContext):
+async def process_reply_to_anonymous(message: Message, state: FSMContext, user: Optional[User] = None):
     """Anonim xabarga javobni qayta ishlash"""
     data = await state.get_data()
     reply_text = message.text
 
     try:
-        user = await User.objects.aget(telegram_id=message.from_user.id)
+        if user is None:
+            raise User.DoesNotExist("Foydalanuvchi topilmadi")
         anon_msg = await AnonymousMessage.objects.aget(id=data['message_id'])
 
         # Javobni saqlash
@@ -182,7 +175,7 @@ async def process_reply_to_anonymous(message: Message, state: FSMContext):
 
 # Talabalar tomonidan anonim xabar yuborish
 @router.message(F.text, F.chat.type == "private")
-async def handle_anonymous_question(message: Message, state: FSMContext):
+async def handle_anonymous_question(message: Message, state: FSMContext, user: Optional[User] = None):
     """Oddiy xabarlarni anonim savol sifatida qabul qilish"""
     # Faqat "Buxgalteriya" bo'limidan keyin yozilgan xabarlar
     current_state = await state.get_state()
@@ -200,8 +193,6 @@ async def handle_anonymous_question(message: Message, state: FSMContext):
         if message.text not in menu_buttons:
             # Anonim xabar sifatida saqlash
             try:
-                user = await User.objects.filter(telegram_id=message.from_user.id).afirst()
-
                 # Faqat talabalar uchun
                 if not user or user.role != 'student':
                     return
@@ -214,8 +205,7 @@ async def handle_anonymous_question(message: Message, state: FSMContext):
                 await message.answer(
                     "✅ Sizning xabaringiz buxgalteriyaga yuborildi.\n"
                     "Javob tez orada beriladi. Barcha ma'lumotlar maxfiy saqlanadi.",
-                    reply_markup=
-                from bot.keyboards.student_kb import main_student_menu
+                    reply_markup=main_student_menu()
                 )
 
                 # Buxgalterlarga xabar berish
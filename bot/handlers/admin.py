@@ -1,33 +1,74 @@
 # bot/handlers/admin.py
 from aiogram import Router, F
-from aiogram.types import Message, CallbackQuery
-from aiogram.filters import Command
+from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup
+from aiogram.filters import Command, CommandObject
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.state import State, StatesGroup
 from datetime import datetime
-import sys
-import os
+from typing import Dict, Optional, Union
 
-sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'webapp.webapp.settings')
+from django.db.models import Count
 
-import django
-
-django.setup()
-
-from webapp.admin_panel.models import User, Student, Group, Receipt, PaymentSchedule
+from webapp.admin_panel.models import User, Student, Group, Receipt, PaymentSchedule, ReviewBatch
 from bot.keyboards.admin_kb import (
     main_admin_menu, student_management_keyboard,
-    group_management_keyboard, payment_schedule_keyboard
+    group_management_keyboard, payment_schedule_keyboard, bulk_review_keyboard
 )
+from bot.keyboards.inline_kb import create_pagination_keyboard
 from bot.config import ADMIN_IDS
+from bot.services.receipt_service import ReceiptService
+from bot.utils.background import run_in_background
+from bot.utils.pagination import KeysetPaginator, parse_page_callback
 
 router = Router()
 
 
+class BulkReview(StatesGroup):
+    """Cheklarni ommaviy ko'rib chiqish"""
+    waiting_for_confirm = State()
+
+
 def is_admin(telegram_id: int) -> bool:
     """Admin ekanligini tekshirish"""
     return telegram_id in ADMIN_IDS
 
 
+async def show_page(
+        event: Union[Message, CallbackQuery],
+        paginator: KeysetPaginator,
+        callback_prefix: str
+):
+    """
+    Ro'yxat sahifasini ko'rsatish
+
+    Xabar (menyu tugmasi) - yangi xabar, callback - birinchi sahifa
+    yoki sahifalash tugmasi, joriy xabar tahrirlanadi.
+    """
+    number, direction, cursor, position = 1, 'next', None, None
+    if isinstance(event, CallbackQuery):
+        number, direction, cursor, position = parse_page_callback(event.data)
+
+    page = await paginator.page(number, direction, cursor, position)
+    keyboard: Optional[InlineKeyboardMarkup] = None
+    if page.has_prev or page.has_next:
+        keyboard = create_pagination_keyboard(
+            page.number,
+            None,
+            callback_prefix,
+            prev_cursor=page.first_id if page.has_prev else None,
+            next_cursor=page.last_id if page.has_next else None,
+            back_callback="admin_back",
+            prev_position=page.first_position,
+            next_position=page.last_position
+        )
+
+    if isinstance(event, CallbackQuery):
+        await event.message.edit_text(page.text, reply_markup=keyboard, parse_mode="HTML")
+        await event.answer()
+    else:
+        await event.answer(page.text, reply_markup=keyboard, parse_mode="HTML")
+
+
 @router.message(F.text == "👨‍🎓 Talabalar")
 async def show_student_management(message: Message):
     """Talabalarni boshqarish"""
@@ -43,32 +84,36 @@ async def show_student_management(message: Message):
     )
 
 
+def format_student_item(number: int, student: Student) -> str:
+    """Talabalar ro'yxatidagi bitta yozuv"""
+    return (
+        f"{number}. {student.full_name}\n"
+        f"   🆔 {student.student_id}\n"
+        f"   👥 {student.group.name if student.group else '—'}\n"
+        f"   📱 {student.phone}\n\n"
+    )
+
+
+def students_paginator() -> KeysetPaginator:
+    """Talabalar ro'yxati (familiya, id bo'yicha)"""
+    return KeysetPaginator(
+        Student.objects.select_related('group'),
+        ordering=('last_name', 'id'),
+        render=format_student_item,
+        header="👨‍🎓 <b>Talabalar ro'yxati</b>\n\n",
+        empty_text="Talabalar topilmadi."
+    )
+
+
 @router.callback_query(F.data == "admin_list_students")
+@router.callback_query(F.data.startswith("adm_students_page_"))
 async def list_students(callback: CallbackQuery):
     """Talabalar ro'yxati"""
     if not is_admin(callback.from_user.id):
         await callback.answer("❌ Ruxsat yo'q!", show_alert=True)
         return
 
-    students = Student.objects.select_related('group').order_by('last_name')[:50]
-
-    text = "👨‍🎓 <b>Talabalar ro'yxati</b>\n\n"
-
-    count = 0
-    async for student in students:
-        count += 1
-        text += f"{count}. {student.full_name}\n"
-        text += f"   🆔 {student.student_id}\n"
-        text += f"   👥 {student.group.name if student.group else '—'}\n"
-        text += f"   📱 {student.phone}\n\n"
-
-    if count == 0:
-        text += "Talabalar topilmadi."
-    elif count == 50:
-        text += "\n⚠️ Faqat 50 ta talaba ko'rsatildi."
-
-    await callback.message.edit_text(text, parse_mode="HTML")
-    await callback.answer()
+    await show_page(callback, students_paginator(), "adm_students")
 
 
 @router.message(F.text == "👥 Guruhlar")
@@ -86,34 +131,37 @@ async def show_group_management(message: Message):
     )
 
 
+def format_group_item(number: int, group: Group) -> str:
+    """Guruhlar ro'yxatidagi bitta yozuv"""
+    status = "✅" if group.is_active else "❌"
+
+    text = f"{number}. {status} <b>{group.name}</b>\n"
+    text += f"   👥 Talabalar: {group.student_count}\n"
+    if group.telegram_chat_id:
+        text += f"   🆔 Chat ID: <code>{group.telegram_chat_id}</code>\n"
+    return text + "\n"
+
+
+def groups_paginator() -> KeysetPaginator:
+    """Guruhlar ro'yxati (nomi, id bo'yicha)"""
+    return KeysetPaginator(
+        Group.objects.annotate(student_count=Count('students')),
+        ordering=('name', 'id'),
+        render=format_group_item,
+        header="👥 <b>Guruhlar ro'yxati</b>\n\n",
+        empty_text="Guruhlar topilmadi."
+    )
+
+
 @router.callback_query(F.data == "admin_list_groups")
+@router.callback_query(F.data.startswith("adm_groups_page_"))
 async def list_groups(callback: CallbackQuery):
     """Guruhlar ro'yxati"""
     if not is_admin(callback.from_user.id):
         await callback.answer("❌ Ruxsat yo'q!", show_alert=True)
         return
 
-    groups = Group.objects.order_by('name')
-
-    text = "👥 <b>Guruhlar ro'yxati</b>\n\n"
-
-    count = 0
-    async for group in groups:
-        count += 1
-        student_count = await group.students.acount()
-        status = "✅" if group.is_active else "❌"
-
-        text += f"{count}. {status} <b>{group.name}</b>\n"
-        text += f"   👥 Talabalar: {student_count}\n"
-        if group.telegram_chat_id:
-            text += f"   🆔 Chat ID: <code>{group.telegram_chat_id}</code>\n"
-        text += "\n"
-
-    if count == 0:
-        text += "Guruhlar topilmadi."
-
-    await callback.message.edit_text(text, parse_mode="HTML")
-    await callback.answer()
+    await show_page(callback, groups_paginator(), "adm_groups")
 
 
 @router.message(F.text == "📅 To'lov jadvali")
@@ -131,63 +179,77 @@ async def show_schedule_management(message: Message):
     )
 
 
+def format_schedule_item(number: int, schedule: PaymentSchedule) -> str:
+    """To'lov jadvallari ro'yxatidagi bitta yozuv"""
+    status = "✅" if schedule.is_active else "❌"
+    return (
+        f"{number}. {status} <b>{schedule.academic_year} - {schedule.stage}</b>\n"
+        f"   📆 Muddat: {schedule.due_date.strftime('%d.%m.%Y')}\n"
+        f"   💰 Summa: {schedule.amount} so'm\n\n"
+    )
+
+
+def schedules_paginator() -> KeysetPaginator:
+    """To'lov jadvallari (o'quv yili kamayish, bosqich o'sish tartibida)"""
+    return KeysetPaginator(
+        PaymentSchedule.objects.all(),
+        ordering=('-academic_year', 'stage', 'id'),
+        render=format_schedule_item,
+        header="📅 <b>To'lov jadvallari</b>\n\n",
+        empty_text="To'lov jadvallari topilmadi."
+    )
+
+
 @router.callback_query(F.data == "admin_list_schedules")
+@router.callback_query(F.data.startswith("adm_schedules_page_"))
 async def list_schedules(callback: CallbackQuery):
     """To'lov jadvallari ro'yxati"""
     if not is_admin(callback.from_user.id):
         await callback.answer("❌ Ruxsat yo'q!", show_alert=True)
         return
 
-    schedules = PaymentSchedule.objects.order_by('-academic_year', 'stage')
+    await show_page(callback, schedules_paginator(), "adm_schedules")
 
-    text = "📅 <b>To'lov jadvallari</b>\n\n"
 
-    count = 0
-    async for schedule in schedules:
-        count += 1
-        status = "✅" if schedule.is_active else "❌"
+def format_receipt_item(number: int, receipt: Receipt) -> str:
+    """Cheklar ro'yxatidagi bitta yozuv"""
+    status_emoji = {
+        'pending': '⏳',
+        'approved': '✅',
+        'rejected': '❌'
+    }.get(receipt.status, '❓')
 
-        text += f"{count}. {status} <b>{schedule.academic_year} - {schedule.stage}</b>\n"
-        text += f"   📆 Muddat: {schedule.due_date.strftime('%d.%m.%Y')}\n"
-        text += f"   💰 Summa: {schedule.amount} so'm\n\n"
+    return (
+        f"{number}. {status_emoji} {receipt.student.full_name}\n"
+        f"   🆔 {receipt.student.student_id}\n"
+        f"   📊 {receipt.payment_schedule.stage}\n"
+        f"   📅 {receipt.submitted_at.strftime('%d.%m.%Y %H:%M')}\n\n"
+    )
 
-    if count == 0:
-        text += "To'lov jadvallari topilmadi."
 
-    await callback.message.edit_text(text, parse_mode="HTML")
-    await callback.answer()
+def receipts_paginator() -> KeysetPaginator:
+    """Cheklar (yangilari birinchi)"""
+    return KeysetPaginator(
+        Receipt.objects.select_related('student', 'payment_schedule'),
+        ordering=('-submitted_at', '-id'),
+        render=format_receipt_item,
+        header="📋 <b>Oxirgi cheklar</b>\n\n",
+        empty_text="Cheklar topilmadi."
+    )
 
 
 @router.message(F.text == "📋 Cheklar")
-async def show_receipts(message: Message):
+@router.callback_query(F.data.startswith("adm_receipts_page_"))
+async def show_receipts(event: Union[Message, CallbackQuery]):
     """Cheklar ro'yxati"""
-    if not is_admin(message.from_user.id):
-        await message.answer("❌ Bu bo'lim faqat adminlar uchun!")
+    if not is_admin(event.from_user.id):
+        if isinstance(event, CallbackQuery):
+            await event.answer("❌ Ruxsat yo'q!", show_alert=True)
+        else:
+            await event.answer("❌ Bu bo'lim faqat adminlar uchun!")
         return
 
-    # Oxirgi 20 ta chekni olish
-    receipts = Receipt.objects.select_related('student', 'payment_schedule').order_by('-submitted_at')[:20]
-
-    text = "📋 <b>Oxirgi cheklar</b>\n\n"
-
-    count = 0
-    async for receipt in receipts:
-        count += 1
-        status_emoji = {
-            'pending': '⏳',
-            'approved': '✅',
-            'rejected': '❌'
-        }.get(receipt.status, '❓')
-
-        text += f"{count}. {status_emoji} {receipt.student.full_name}\n"
-        text += f"   🆔 {receipt.student.student_id}\n"
-        text += f"   📊 {receipt.payment_schedule.stage}\n"
-        text += f"   📅 {receipt.submitted_at.strftime('%d.%m.%Y %H:%M')}\n\n"
-
-    if count == 0:
-        text += "Cheklar topilmadi."
-
-    await message.answer(text, parse_mode="HTML")
+    await show_page(event, receipts_paginator(), "adm_receipts")
 
 
 @router.message(F.text == "📊 Statistika")
@@ -229,86 +291,220 @@ async def show_statistics(message: Message):
 
 
 # Chekni tasdiqlash/rad etish
-@router.callback_query(F.data.startswith("approve_receipt_"))
-async def approve_receipt(callback: CallbackQuery):
-    """Chekni tasdiqlash"""
+async def review_receipt(callback: CallbackQuery, user: Optional[User], status: str):
+    """Chekni tasdiqlash yoki rad etish (bir vaqtda bosgan adminlardan faqat bittasi)"""
     if not is_admin(callback.from_user.id):
         await callback.answer("❌ Ruxsat yo'q!", show_alert=True)
         return
 
-    receipt_id = int(callback.data.replace("approve_receipt_", ""))
+    receipt_id = int(callback.data.rsplit("_", 1)[1])
 
     try:
-        user = await User.objects.aget(telegram_id=callback.from_user.id)
-        receipt = await Receipt.objects.select_related('student').aget(id=receipt_id)
+        if user is None:
+            raise User.DoesNotExist("Foydalanuvchi topilmadi")
 
-        receipt.status = 'approved'
-        receipt.reviewed_by = user
-        receipt.reviewed_at = datetime.now()
-        await receipt.asave()
+        claimed, receipt = await ReceiptService.review_receipt(receipt_id, status, user)
 
         await callback.message.edit_caption(
-            caption=callback.message.caption + "\n\n✅ <b>TASDIQLANDI</b>",
-            parse_mode="HTML"
+            caption=ReceiptService.format_reviewed_message(receipt),
+            parse_mode="HTML",
+            reply_markup=None
         )
 
+        if not claimed:
+            await callback.answer(
+                f"⚠️ Bu chek allaqachon ko'rib chiqilgan: {receipt.get_status_display()}",
+                show_alert=True
+            )
+            return
+
+        # Boshqa adminlardagi nusxalardan tugmalarni olib tashlash
+        run_in_background(ReceiptService.close_admin_copies(
+            callback.bot, receipt.id, exclude=(callback.message.chat.id, callback.message.message_id)
+        ))
+
         # Talabaga xabar yuborish
         if receipt.student.user and receipt.student.user.telegram_id:
             try:
                 await callback.bot.send_message(
                     chat_id=receipt.student.user.telegram_id,
-                    text=f"✅ Sizning chekingiz tasdiqlandi!\n\n"
-                         f"📊 To'lov: {receipt.payment_schedule.stage}\n"
-                         f"👤 Tasdiqladi: {user.get_full_name() or 'Admin'}"
+                    text=ReceiptService.format_student_notification(
+                        status, receipt.payment_schedule.stage, user.get_full_name() or 'Admin'
+                    )
                 )
             except Exception:
                 pass
 
-        await callback.answer("✅ Tasdiqlandi!", show_alert=True)
+        await callback.answer("✅ Tasdiqlandi!" if status == 'approved' else "❌ Rad etildi!", show_alert=True)
 
     except Exception as e:
         await callback.answer(f"❌ Xatolik: {str(e)}", show_alert=True)
 
 
+@router.callback_query(F.data.startswith("approve_receipt_"))
+async def approve_receipt(callback: CallbackQuery, user: Optional[User] = None):
+    """Chekni tasdiqlash"""
+    await review_receipt(callback, user, 'approved')
+
+
 @router.callback_query(F.data.startswith("reject_receipt_"))
-async def reject_receipt(callback: CallbackQuery):
+async def reject_receipt(callback: CallbackQuery, user: Optional[User] = None):
     """Chekni rad etish"""
-    if not is_admin(callback.from_user.id):
+    await review_receipt(callback, user, 'rejected')
+
+
+BULK_USAGE = (
+    "📋 <b>Ommaviy ko'rib chiqish</b>\n\n"
+    "<code>/bulk approve|reject [stage=1/4] [group=NOMI] [from=01.03.2025] [to=31.03.2025]</code>\n\n"
+    "Filtrga mos barcha kutilayotgan cheklar bitta amal bilan tasdiqlanadi yoki rad etiladi."
+)
+
+
+def parse_bulk_args(args: str) -> Dict:
+    """/bulk argumentlarini ajratish (xato bo'lsa ValueError)"""
+    parts = (args or '').split()
+    if not parts or parts[0] not in ('approve', 'reject'):
+        raise ValueError("approve yoki reject ko'rsating")
+
+    filters = {'status': 'approved' if parts[0] == 'approve' else 'rejected'}
+    for part in parts[1:]:
+        key, _, value = part.partition('=')
+        if not value:
+            raise ValueError(f"Noto'g'ri parametr: {part}")
+
+        if key == 'stage':
+            if value not in dict(PaymentSchedule.STAGE_CHOICES):
+                raise ValueError(f"Noto'g'ri bosqich: {value}")
+            filters['stage'] = value
+        elif key == 'group':
+            filters['group'] = value
+        elif key in ('from', 'to'):
+            try:
+                date = datetime.strptime(value, '%d.%m.%Y').date()
+            except ValueError:
+                raise ValueError(f"Noto'g'ri sana: {value} (kk.oo.yyyy)")
+            filters['date_from' if key == 'from' else 'date_to'] = date.isoformat()
+        else:
+            raise ValueError(f"Noma'lum parametr: {key}")
+
+    return filters
+
+
+def bulk_filter_kwargs(filters: Dict) -> Dict:
+    """FSM da saqlangan filtrni ReviewBatch.review argumentlariga o'tkazish"""
+    return {
+        'stage': filters.get('stage'),
+        'group_id': filters.get('group_id'),
+        'date_from': datetime.fromisoformat(filters['date_from']).date() if filters.get('date_from') else None,
+        'date_to': datetime.fromisoformat(filters['date_to']).date() if filters.get('date_to') else None,
+    }
+
+
+@router.message(Command("bulk"))
+async def bulk_review_start(message: Message, command: CommandObject, state: FSMContext):
+    """Cheklarni ommaviy ko'rib chiqish: filtr va oldindan ko'rish"""
+    if not is_admin(message.from_user.id):
+        await message.answer("❌ Bu bo'lim faqat adminlar uchun!")
+        return
+
+    try:
+        filters = parse_bulk_args(command.args)
+    except ValueError as e:
+        await message.answer(f"❌ {e}\n\n{BULK_USAGE}", parse_mode="HTML")
+        return
+
+    group_name = filters.pop('group', None)
+    if group_name:
+        group = await Group.objects.filter(name__iexact=group_name).afirst()
+        if group is None:
+            await message.answer(f"❌ Guruh topilmadi: {group_name}")
+            return
+        filters['group_id'] = group.id
+        filters['group_name'] = group.name
+
+    count = await ReviewBatch.pending_receipts(**bulk_filter_kwargs(filters)).acount()
+    if count == 0:
+        await message.answer("📋 Filtrga mos kutilayotgan cheklar topilmadi.")
+        return
+
+    await state.set_state(BulkReview.waiting_for_confirm)
+    await state.update_data(bulk_review=filters)
+
+    action = "✅ Tasdiqlash" if filters['status'] == 'approved' else "❌ Rad etish"
+    text = f"📋 <b>Ommaviy ko'rib chiqish</b>\n\n{action}: <b>{count}</b> ta chek\n"
+    if filters.get('stage'):
+        text += f"📊 Bosqich: {filters['stage']}\n"
+    if filters.get('group_name'):
+        text += f"👥 Guruh: {filters['group_name']}\n"
+    if filters.get('date_from'):
+        text += f"📅 Sanadan: {datetime.fromisoformat(filters['date_from']):%d.%m.%Y}\n"
+    if filters.get('date_to'):
+        text += f"📅 Sanagacha: {datetime.fromisoformat(filters['date_to']):%d.%m.%Y}\n"
+
+    await message.answer(text, reply_markup=bulk_review_keyboard(), parse_mode="HTML")
+
+
+@router.callback_query(BulkReview.waiting_for_confirm, F.data == "bulk_review_confirm")
+async def bulk_review_confirm(callback: CallbackQuery, state: FSMContext, user: Optional[User] = None):
+    """Ommaviy ko'rib chiqishni bajarish"""
+    if not is_admin(callback.from_user.id) or user is None:
         await callback.answer("❌ Ruxsat yo'q!", show_alert=True)
         return
 
-    receipt_id = int(callback.data.replace("reject_receipt_", ""))
+    data = await state.get_data()
+    filters = data.get('bulk_review', {})
+    await state.clear()
 
     try:
-        user = await User.objects.aget(telegram_id=callback.from_user.id)
-        receipt = await Receipt.objects.select_related('student').aget(id=receipt_id)
+        batch = await ReceiptService.bulk_review(filters['status'], user, **bulk_filter_kwargs(filters))
+    except Exception as e:
+        await callback.answer(f"❌ Xatolik: {str(e)}", show_alert=True)
+        return
+
+    if not batch.total:
+        await callback.message.edit_text("📭 Filtrga mos kutilayotgan cheklar topilmadi.")
+        await callback.answer()
+        return
 
-        receipt.status = 'rejected'
-        receipt.reviewed_by = user
-        receipt.reviewed_at = datetime.now()
-        await receipt.asave()
+    await callback.message.edit_text(
+        f"{ReceiptService.VERDICTS[batch.status]}: {batch.total} ta chek\n\n"
+        f"📤 Talabalarga xabar yuborilmoqda...",
+        parse_mode="HTML"
+    )
+    await callback.answer()
 
-        await callback.message.edit_caption(
-            caption=callback.message.caption + "\n\n❌ <b>RAD ETILDI</b>",
+    async def notify_and_report():
+        notified = await ReceiptService.notify_batch(callback.bot, batch.id)
+        if notified is None:
+            return
+        await callback.message.edit_text(
+            f"{ReceiptService.VERDICTS[notified.status]}: {notified.total} ta chek\n\n"
+            f"📤 Xabar berildi: {notified.notified} ta\n"
+            f"⚠️ Xatolik: {notified.failed} ta",
             parse_mode="HTML"
         )
 
-        # Talabaga xabar yuborish
-        if receipt.student.user and receipt.student.user.telegram_id:
-            try:
-                await callback.bot.send_message(
-                    chat_id=receipt.student.user.telegram_id,
-                    text=f"❌ Sizning chekingiz rad etildi!\n\n"
-                         f"📊 To'lov: {receipt.payment_schedule.stage}\n"
-                         f"📝 Iltimos, to'g'ri chek yuboring yoki buxgalteriya bilan bog'laning."
-                )
-            except Exception:
-                pass
+    run_in_background(notify_and_report())
 
-        await callback.answer("❌ Rad etildi!", show_alert=True)
 
-    except Exception as e:
-        await callback.answer(f"❌ Xatolik: {str(e)}", show_alert=True)
+@router.callback_query(F.data == "bulk_review_confirm")
+async def bulk_review_expired(callback: CallbackQuery):
+    """Holati saqlanmagan (eskirgan) tasdiqlash tugmasi"""
+    await callback.answer("⚠️ So'rov eskirgan, /bulk ni qayta yuboring.", show_alert=True)
+
+
+@router.callback_query(F.data == "bulk_review_cancel")
+async def bulk_review_cancel(callback: CallbackQuery, state: FSMContext):
+    """Ommaviy ko'rib chiqishni bekor qilish"""
+    await state.clear()
+    await callback.message.edit_text("❌ Bekor qilindi.")
+    await callback.answer()
+
+
+@router.callback_query(F.data == "current_page")
+async def current_page(callback: CallbackQuery):
+    """Joriy sahifa raqami tugmasi"""
+    await callback.answer()
 
 
 @router.callback_query(F.data == "admin_back")
@@ -3,15 +3,7 @@ from aiogram import Router, F
 from aiogram.filters import CommandStart, Command
 from aiogram.types import Message
 from aiogram.fsm.context import FSMContext
-import sys
-import os
-
-sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'webapp.webapp.settings')
-
-import django
-
-django.setup()
+from typing import Optional
 
 from webapp.admin_panel.models import User, Student
 from bot.keyboards.student_kb import main_student_menu, faq_keyboard
@@ -21,56 +13,54 @@ router = Router()
 
 
 @router.message(CommandStart())
-async def cmd_start(message: Message, state: FSMContext):
+async def cmd_start(message: Message, state: FSMContext, user: Optional[User] = None):
     """Start komandasi"""
     await state.clear()
 
     telegram_id = message.from_user.id
 
-    # Foydalanuvchini tekshirish
-    try:
-        user = await User.objects.aget(telegram_id=telegram_id)
+    # Foydalanuvchini tekshirish (RoleMiddleware keshidan)
+    if user is None:
+        await message.answer(
+            f"Assalomu alaykum!\n\n"
+            f"Siz hali ro'yxatdan o'tmagansiz.\n"
+            f"Sizning telegram ID: {telegram_id}\n\n"
+            f"Iltimos, bu ID ni administrator ga yuboring."
+        )
+        return
 
-        if user.role == 'admin':
-            await message.answer(
-                f"Assalomu alaykum, Admin!\n\n"
-                f"Sizning telegram ID: {telegram_id}\n"
-                f"Sizning role: {user.get_role_display()}",
-                reply_markup=main_admin_menu()
-            )
-        elif user.role == 'accountant':
+    if user.role == 'admin':
+        await message.answer(
+            f"Assalomu alaykum, Admin!\n\n"
+            f"Sizning telegram ID: {telegram_id}\n"
+            f"Sizning role: {user.get_role_display()}",
+            reply_markup=main_admin_menu()
+        )
+    elif user.role == 'accountant':
+        await message.answer(
+            f"Assalomu alaykum, Buxgalter!\n\n"
+            f"Sizning telegram ID: {telegram_id}",
+            reply_markup=main_admin_menu()
+        )
+    elif user.role == 'student':
+        try:
+            student = await Student.objects.select_related('group').aget(user=user)
             await message.answer(
-                f"Assalomu alaykum, Buxgalter!\n\n"
-                f"Sizning telegram ID: {telegram_id}",
-                reply_markup=main_admin_menu()
+                f"Assalomu alaykum, {student.first_name}!\n\n"
+                f"👤 Talaba ID: {student.student_id}\n"
+                f"👥 Guruh: {student.group.name if student.group else 'Biriktirilmagan'}\n\n"
+                f"Quyidagi tugmalardan birini tanlang:",
+                reply_markup=main_student_menu()
             )
-        elif user.role == 'student':
-            try:
-                student = await Student.objects.select_related('user', 'group').aget(user=user)
-                await message.answer(
-                    f"Assalomu alaykum, {student.first_name}!\n\n"
-                    f"👤 Talaba ID: {student.student_id}\n"
-                    f"👥 Guruh: {student.group.name if student.group else 'Biriktirilmagan'}\n\n"
-                    f"Quyidagi tugmalardan birini tanlang:",
-                    reply_markup=main_student_menu()
-                )
-            except Student.DoesNotExist:
-                await message.answer(
-                    "Sizning profil ma'lumotlaringiz topilmadi.\n"
-                    "Iltimos, administrator bilan bog'laning."
-                )
-        else:
+        except Student.DoesNotExist:
             await message.answer(
-                f"Assalomu alaykum!\n\n"
-                f"Sizning telegram ID: {telegram_id}"
+                "Sizning profil ma'lumotlaringiz topilmadi.\n"
+                "Iltimos, administrator bilan bog'laning."
             )
-
-    except User.DoesNotExist:
+    else:
         await message.answer(
             f"Assalomu alaykum!\n\n"
-            f"Siz hali ro'yxatdan o'tmagansiz.\n"
-            f"Sizning telegram ID: {telegram_id}\n\n"
-            f"Iltimos, bu ID ni administrator ga yuboring."
+            f"Sizning telegram ID: {telegram_id}"
         )
 
 
@@ -97,6 +87,7 @@ async def cmd_help(message: Message):
 • Guruhlarni boshqarish
 • To'lov jadvalini sozlash
 • Cheklarni ko'rish va tasdiqlash
+• Cheklarni ommaviy tasdiqlash (/bulk)
 • Statistika
 
 📞 Texnik yordam: @admin_username
@@ -107,9 +98,10 @@ async def cmd_help(message: Message):
 @router.message(Command("id"))
 async def cmd_id(message: Message):
     """Telegram ID ni ko'rsatish"""
+    username = message.from_user.username or "Yo'q"
     await message.answer(
         f"📱 Sizning Telegram ID: <code>{message.from_user.id}</code>\n"
-        f"👤 Username: @{message.from_user.username or 'Yo\'q'}",
+        f"👤 Username: @{username}",
         parse_mode="HTML"
     )
 
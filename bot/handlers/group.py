@@ -2,18 +2,10 @@
 from aiogram import Router, F
 from aiogram.types import Message, ChatMemberUpdated
 from aiogram.filters import ChatMemberUpdatedFilter, IS_NOT_MEMBER, IS_MEMBER, ADMINISTRATOR
-import sys
-import os
-
-sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'webapp.webapp.settings')
-
-import django
-
-django.setup()
 
 from webapp.admin_panel.models import Group, User
 from bot.config import ADMIN_IDS
+from bot.services.payment_service import PaymentService
 
 router = Router()
 
@@ -159,14 +151,35 @@ async def handle_group_messages(message: Message):
         if message.text == '/status':
             try:
                 group = await Group.objects.aget(telegram_chat_id=message.chat.id)
-                student_count = await group.students.acount()
-
-                await message.reply(
+                student_ids = [
+                    student_id async for student_id in group.students.values_list('id', flat=True)
+                ]
+                statuses = await PaymentService.get_payment_status_for_students(student_ids)
+
+                # Bosqich bo'yicha: [jadval, tasdiqlangan, kutilmoqda, muddati o'tgan]
+                stages = {}
+                for payments in statuses.values():
+                    for payment in payments:
+                        stage = stages.setdefault(payment['schedule'].id, [payment['schedule'], 0, 0, 0])
+                        if payment['status'] == 'approved':
+                            stage[1] += 1
+                        elif payment['status'] == 'pending':
+                            stage[2] += 1
+                        elif payment['is_overdue']:
+                            stage[3] += 1
+
+                text = (
                     f"📊 <b>Guruh statistikasi</b>\n\n"
                     f"📌 Guruh: {group.name}\n"
-                    f"👥 Talabalar: {student_count} ta\n"
-                    f"✅ Status: {'Faol' if group.is_active else 'Nofaol'}",
-                    parse_mode="HTML"
+                    f"👥 Talabalar: {len(student_ids)} ta\n"
+                    f"✅ Status: {'Faol' if group.is_active else 'Nofaol'}\n"
                 )
+                for schedule, approved, pending, overdue in stages.values():
+                    text += (
+                        f"\n💰 <b>{schedule.stage}</b> ({schedule.due_date.strftime('%d.%m.%Y')})\n"
+                        f"   ✅ {approved} · ⏳ {pending} · 🔴 {overdue}\n"
+                    )
+
+                await message.reply(text, parse_mode="HTML")
             except Group.DoesNotExist:
                 await message.reply("❌ Guruh ma'lumotlari topilmadi!")
\ No newline at end of file
@@ -60,4 +60,16 @@ def receipt_action_keyboard(receipt_id: int):
             [InlineKeyboardButton(text="📝 Izoh qo'shish", callback_data=f"note_receipt_{receipt_id}")]
         ]
     )
-    return keyboard
\ No newline at end of file
+    return keyboard
+
+def bulk_review_keyboard():
+    """Ommaviy ko'rib chiqishni tasdiqlash"""
+    keyboard = InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(text="✅ Bajarish", callback_data="bulk_review_confirm"),
+                InlineKeyboardButton(text="🔙 Bekor qilish", callback_data="bulk_review_cancel")
+            ]
+        ]
+    )
+    return keyboard
@@ -1,28 +1,59 @@
 # bot/keyboards/inline_kb.py
+from typing import Optional
+
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 
 
 def create_pagination_keyboard(
         page: int,
-        total_pages: int,
-        callback_prefix: str
+        total_pages: Optional[int],
+        callback_prefix: str,
+        prev_cursor: Optional[int] = None,
+        next_cursor: Optional[int] = None,
+        back_callback: str = "back_to_menu",
+        prev_position: Optional[int] = None,
+        next_position: Optional[int] = None
 ) -> InlineKeyboardMarkup:
-    """Sahifalash klaviaturasi"""
+    """
+    Sahifalash klaviaturasi
+
+    Kursor berilsa (keyset sahifalash) callback: <prefix>_page_<sahifa>_<next|prev>_<id>[_<tartib raqami>],
+    total_pages None bo'lsa faqat joriy sahifa raqami ko'rsatiladi.
+    """
     buttons = []
 
     # Navigatsiya tugmalari
     nav_buttons = []
 
-    if page > 1:
+    if prev_cursor is not None:
+        nav_buttons.append(
+            InlineKeyboardButton(
+                text="⬅️ Oldingi",
+                callback_data=f"{callback_prefix}_page_{max(page - 1, 1)}_prev_{prev_cursor}"
+                              + (f"_{prev_position}" if prev_position is not None else "")
+            )
+        )
+    elif page > 1 and total_pages:
         nav_buttons.append(
             InlineKeyboardButton(text="⬅️ Oldingi", callback_data=f"{callback_prefix}_page_{page - 1}")
         )
 
     nav_buttons.append(
-        InlineKeyboardButton(text=f"📄 {page}/{total_pages}", callback_data="current_page")
+        InlineKeyboardButton(
+            text=f"📄 {page}/{total_pages}" if total_pages else f"📄 {page}",
+            callback_data="current_page"
+        )
     )
 
-    if page < total_pages:
+    if next_cursor is not None:
+        nav_buttons.append(
+            InlineKeyboardButton(
+                text="Keyingi ➡️",
+                callback_data=f"{callback_prefix}_page_{page + 1}_next_{next_cursor}"
+                              + (f"_{next_position}" if next_position is not None else "")
+            )
+        )
+    elif total_pages and page < total_pages:
         nav_buttons.append(
             InlineKeyboardButton(text="Keyingi ➡️", callback_data=f"{callback_prefix}_page_{page + 1}")
         )
@@ -31,7 +62,7 @@ def create_pagination_keyboard(
 
     # Orqaga qaytish
     buttons.append([
-        InlineKeyboardButton(text="🔙 Orqaga", callback_data="back_to_menu")
+        InlineKeyboardButton(text="🔙 Orqaga", callback_data=back_callback)
     ])
 
     return InlineKeyboardMarkup(inline_keyboard=buttons)
@@ -1,14 +1,12 @@
 import logging
 import asyncio
 
-from aiogram import Bot, Dispatcher
+from aiogram import Bot
 from aiogram.enums import ParseMode
 from aiogram.client.default import DefaultBotProperties
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
-from bot.config import BOT_TOKEN
-from bot.handlers import common, student, admin
-from bot.services.reminder_service import ReminderService
+from bot.config import BOT_TOKEN, BOT_MODE, UPDATE_WORKERS
+from bot.dispatcher import create_dispatcher
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -16,22 +14,41 @@ logger = logging.getLogger(__name__)
 async def main():
     """Main function to run the bot"""
     # Initialize bot and dispatcher
-    bot = Bot(token=BOT_TOKEN, parse_mode=ParseMode.HTML)
-    dp = Dispatcher()
+    bot = Bot(token=BOT_TOKEN, default=DefaultBotProperties(parse_mode=ParseMode.HTML))
 
-    # Include routers
-    dp.include_router(common.router)
-    dp.include_router(student.router)
-    dp.include_router(admin.router)
+    # Django, routerlar va middlewarelar
+    dp = create_dispatcher()
 
-    # Start reminder service
-    reminder_service = ReminderService(bot)
-    reminder_service.start()
+    # Start reminder scheduler
+    from bot.services.scheduler_service import SchedulerService
+
+    scheduler = SchedulerService(bot)
+    scheduler.start()
+
+    # Update larni chat.id bo'yicha alohida jarayonlarda qayta ishlash
+    pool = None
+    if UPDATE_WORKERS:
+        from bot.workers import WorkerPool
+
+        pool = WorkerPool()
+        pool.start()
 
     try:
-        logger.info("Bot is starting...")
-        await dp.start_polling(bot)
+        logger.info("Bot is starting (%s, workers: %s)...", BOT_MODE, UPDATE_WORKERS)
+        if BOT_MODE == 'webhook':
+            from bot.webhook import run_webhook
+
+            await run_webhook(bot, dp, feed=pool.feed if pool else None)
+        elif pool:
+            from bot.workers import poll_updates
+
+            await poll_updates(bot, pool.feed, allowed_updates=dp.resolve_used_update_types())
+        else:
+            await dp.start_polling(bot)
     finally:
+        if pool:
+            await pool.stop()
+        scheduler.shutdown()
         await bot.session.close()
 
 if __name__ == "__main__":
@@ -0,0 +1,23 @@
+# bot/middlewares/fsm_middleware.py
+from typing import Callable, Dict, Any, Awaitable
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from bot.utils.fsm_buffer import CoalescingStorage
+
+
+class FSMCommitMiddleware(BaseMiddleware):
+    """Update qayta ishlangandan keyin FSM draftini yozish (CoalescingStorage)"""
+
+    async def __call__(
+            self,
+            handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+            event: TelegramObject,
+            data: Dict[str, Any]
+    ) -> Any:
+        try:
+            return await handler(event, data)
+        finally:
+            state = data.get('state')
+            if state is not None and isinstance(state.storage, CoalescingStorage):
+                await state.storage.end_update(state.key)
@@ -1,18 +1,35 @@
 # bot/middlewares/role_middleware.py
-from typing import Callable, Dict, Any, Awaitable
+from typing import Callable, Dict, Any, Awaitable, Optional
 from aiogram import BaseMiddleware
-from aiogram.types import Message
-import sys
-import os
+from aiogram.types import Message, TelegramObject
 
-sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'webapp.webapp.settings')
+from bot.django_setup import setup_django
 
-import django
+setup_django()
 
-django.setup()
+from django.core.cache import cache
 
+from webapp.admin_panel.identity import identity_cache_key
 from webapp.admin_panel.models import User
+from bot.config import IDENTITY_CACHE_TTL
+
+MISSING = object()
+
+
+async def get_cached_user(telegram_id: int) -> Optional[User]:
+    """
+    Foydalanuvchini keshdan yoki bazadan olish (ro'yxatdan o'tmaganlar uchun None)
+
+    Kesh Django CACHES (CACHE_URL) da: User saqlanganda/o'chirilganda istalgan
+    jarayonda (web panel ham) tozalanadi. CACHE_URL siz har bir jarayonning o'z
+    keshi - boshqa jarayondagi o'zgarishlar IDENTITY_CACHE_TTL dan keyin ko'rinadi.
+    """
+    key = identity_cache_key(telegram_id)
+    user = await cache.aget(key, MISSING)
+    if user is MISSING:
+        user = await User.objects.filter(telegram_id=telegram_id).afirst()
+        await cache.aset(key, user, IDENTITY_CACHE_TTL)
+    return user
 
 
 class RoleMiddleware(BaseMiddleware):
@@ -20,20 +37,16 @@ class RoleMiddleware(BaseMiddleware):
 
     async def __call__(
             self,
-            handler: Callable[[Message, Dict[str, Any]], Awaitable[Any]],
-            event: Message,
+            handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+            event: TelegramObject,
             data: Dict[str, Any]
     ) -> Any:
-        telegram_id = event.from_user.id
+        from_user = getattr(event, 'from_user', None)
 
         # Foydalanuvchini tekshirish
-        try:
-            user = await User.objects.aget(telegram_id=telegram_id)
-            data['user'] = user
-            data['role'] = user.role
-        except User.DoesNotExist:
-            data['user'] = None
-            data['role'] = 'guest'
+        user = await get_cached_user(from_user.id) if from_user else None
+        data['user'] = user
+        data['role'] = user.role if user else 'guest'
 
         # Handlerga o'tkazish
         return await handler(event, data)
@@ -48,15 +61,18 @@ class AdminOnlyMiddleware(BaseMiddleware):
             event: Message,
             data: Dict[str, Any]
     ) -> Any:
-        telegram_id = event.from_user.id
-
-        try:
-            user = await User.objects.aget(telegram_id=telegram_id)
-            if user.role not in ['admin', 'accountant']:
-                await event.answer("❌ Bu funksiya faqat adminlar uchun!")
-                return
-        except User.DoesNotExist:
+        user = data.get('user')
+        if 'user' not in data:
+            user = await get_cached_user(event.from_user.id)
+            data['user'] = user
+            data['role'] = user.role if user else 'guest'
+
+        if user is None:
             await event.answer("❌ Sizda ruxsat yo'q!")
             return
 
-        return await handler(event, data)
\ No newline at end of file
+        if user.role not in ['admin', 'accountant']:
+            await event.answer("❌ Bu funksiya faqat adminlar uchun!")
+            return
+
+        return await handler(event, data)
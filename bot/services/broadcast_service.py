@@ -0,0 +1,156 @@
+# bot/services/broadcast_service.py
+import asyncio
+import time
+from typing import Any, AsyncIterable, Awaitable, Callable, Dict, Iterable, Optional, Union
+
+from aiogram.exceptions import TelegramRetryAfter
+
+from bot.config import (
+    BROADCAST_GLOBAL_RATE, BROADCAST_CHAT_RATE,
+    BROADCAST_GROUP_RATE, BROADCAST_CONCURRENCY
+)
+
+
+class TokenBucket:
+    """Token bucket - soniyasiga `rate` ta so'rovga ruxsat beradi"""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Bitta token olish (kerak bo'lsa kutish)"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class BroadcastService:
+    """
+    Ommaviy xabar yuborish xizmati
+
+    Umumiy va har bir chat uchun alohida token bucket, cheklangan
+    parallellik va RetryAfter (429) ni qayta urinish bilan ishlaydi.
+    `bot` o'rniga ishlatish mumkin: send_message/send_photo/send_document imzolari bir xil.
+    """
+
+    def __init__(
+            self,
+            bot,
+            global_rate: float = BROADCAST_GLOBAL_RATE,
+            chat_rate: float = BROADCAST_CHAT_RATE,
+            group_rate: float = BROADCAST_GROUP_RATE,
+            concurrency: int = BROADCAST_CONCURRENCY,
+            max_retries: int = 3
+    ):
+        self.bot = bot
+        self.chat_rate = chat_rate
+        self.group_rate = group_rate
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self._global_bucket = TokenBucket(global_rate)
+        self._chat_buckets: Dict[int, TokenBucket] = {}
+
+    def _chat_bucket(self, chat_id: int) -> TokenBucket:
+        """Chat uchun bucket (guruhlar manfiy ID ga ega)"""
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            if chat_id < 0:
+                bucket = TokenBucket(self.group_rate, capacity=1)
+            else:
+                bucket = TokenBucket(self.chat_rate, capacity=1)
+            self._chat_buckets[chat_id] = bucket
+        return bucket
+
+    async def _call(self, chat_id: int, method: Callable[..., Awaitable[Any]], **kwargs) -> Any:
+        """Limitlarga rioya qilgan holda Bot API ni chaqirish"""
+        for attempt in range(self.max_retries + 1):
+            await self._chat_bucket(chat_id).acquire()
+            await self._global_bucket.acquire()
+
+            try:
+                return await method(chat_id=chat_id, **kwargs)
+            except TelegramRetryAfter as e:
+                if attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(e.retry_after)
+
+    async def send_message(self, chat_id: int, text: str, **kwargs) -> Any:
+        """bot.send_message ning limitlangan varianti"""
+        return await self._call(chat_id, self.bot.send_message, text=text, **kwargs)
+
+    async def send_photo(self, chat_id: int, photo: Any, **kwargs) -> Any:
+        """bot.send_photo ning limitlangan varianti"""
+        return await self._call(chat_id, self.bot.send_photo, photo=photo, **kwargs)
+
+    async def send_document(self, chat_id: int, document: Any, **kwargs) -> Any:
+        """bot.send_document ning limitlangan varianti"""
+        return await self._call(chat_id, self.bot.send_document, document=document, **kwargs)
+
+    async def edit_message_caption(self, chat_id: int, **kwargs) -> Any:
+        """bot.edit_message_caption ning limitlangan varianti"""
+        return await self._call(chat_id, self.bot.edit_message_caption, **kwargs)
+
+    async def run(
+            self,
+            items: Union[Iterable, AsyncIterable],
+            handler: Callable[[Any], Awaitable[bool]],
+            on_progress: Optional[Callable[[Dict], Awaitable[None]]] = None,
+            progress_every: int = 100
+    ) -> Dict:
+        """
+        Har bir element uchun handler ni parallel ishga tushirish
+
+        handler True qaytarsa - yuborildi, False yoki xatolik - muvaffaqiyatsiz.
+        Returns: {'total': int, 'sent': int, 'failed': int, 'duration': float}
+        """
+        report = {'total': 0, 'sent': 0, 'failed': 0, 'duration': 0.0}
+        started = time.monotonic()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        done = object()
+
+        async def produce():
+            try:
+                if hasattr(items, '__aiter__'):
+                    async for item in items:
+                        await queue.put(item)
+                else:
+                    for item in items:
+                        await queue.put(item)
+            finally:
+                for _ in range(self.concurrency):
+                    await queue.put(done)
+
+        async def consume():
+            while True:
+                item = await queue.get()
+                if item is done:
+                    return
+
+                try:
+                    success = await handler(item)
+                except Exception as e:
+                    print(f"Ommaviy yuborishda xatolik: {e}")
+                    success = False
+
+                report['total'] += 1
+                report['sent' if success else 'failed'] += 1
+
+                if on_progress and report['total'] % progress_every == 0:
+                    await on_progress(dict(report, duration=time.monotonic() - started))
+
+        await asyncio.gather(produce(), *(consume() for _ in range(self.concurrency)))
+
+        report['duration'] = time.monotonic() - started
+        return report
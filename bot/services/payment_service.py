@@ -1,15 +1,13 @@
 # bot/services/payment_service.py
 from datetime import datetime, date
-from typing import List, Dict, Optional
-import sys
-import os
+from typing import AsyncIterator, Iterable, List, Dict, Optional
 
-sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'webapp.webapp.settings')
+from bot.django_setup import setup_django
 
-import django
+setup_django()
 
-django.setup()
+from django.db.models import Count, Exists, F, Func, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 
 from webapp.admin_panel.models import (
     Student, PaymentSchedule, Receipt, PaymentReminder
@@ -20,121 +18,161 @@ class PaymentService:
     """To'lovlar xizmati"""
 
     @staticmethod
-    async def get_student_payment_status(student_id: int) -> Dict:
+    async def get_student_payment_status(student_id: int) -> Optional[Dict]:
         """
         Talabaning to'lov statusini olish
         """
         try:
             student = await Student.objects.aget(id=student_id)
-            schedules = PaymentSchedule.objects.filter(is_active=True)
+        except Student.DoesNotExist:
+            return None
 
-            status = {
-                'student': student,
-                'payments': []
-            }
+        statuses = await PaymentService.get_payment_status_for_students([student.id])
+        return {
+            'student': student,
+            'payments': statuses[student.id]
+        }
+
+    @staticmethod
+    async def get_payment_status_for_students(student_ids: Iterable[int]) -> Dict[int, List[Dict]]:
+        """
+        Bir nechta talabaning to'lov statusini birdaniga olish
 
-            async for schedule in schedules:
-                receipt = await Receipt.objects.filter(
-                    student=student,
-                    payment_schedule=schedule
-                ).afirst()
+        Talabalar soniga bog'liq bo'lmagan holda ikkita so'rov bajariladi:
+        faol jadvallar va talabalarning barcha cheklari (student_id__in).
+        Returns: {student_id: [{'schedule': ..., 'receipt': ..., 'status': ...}, ...]}
+        """
+        student_ids = list(student_ids)
+        if not student_ids:
+            return {}
+
+        schedules = [
+            schedule async for schedule in PaymentSchedule.objects.filter(is_active=True).order_by('due_date')
+        ]
+
+        # (student_id, schedule_id) -> receipt
+        receipts = {}
+        async for receipt in Receipt.objects.filter(
+                student_id__in=student_ids,
+                payment_schedule_id__in=[schedule.id for schedule in schedules]
+        ):
+            receipts[(receipt.student_id, receipt.payment_schedule_id)] = receipt
 
-                payment_info = {
+        today = date.today()
+        statuses = {}
+        for student_id in student_ids:
+            payments = []
+            for schedule in schedules:
+                receipt = receipts.get((student_id, schedule.id))
+                payments.append({
                     'schedule': schedule,
                     'has_receipt': receipt is not None,
                     'receipt': receipt,
                     'status': receipt.status if receipt else 'not_submitted',
-                    'is_overdue': schedule.due_date < date.today() and not receipt
-                }
-
-                status['payments'].append(payment_info)
+                    'is_overdue': schedule.due_date < today and not receipt
+                })
+            statuses[student_id] = payments
 
-            return status
-
-        except Student.DoesNotExist:
-            return None
+        return statuses
 
     @staticmethod
-    async def get_overdue_students() -> List[Student]:
+    async def get_overdue_students(
+            group_id: Optional[int] = None,
+            chunk_size: int = 500
+    ) -> AsyncIterator[Dict]:
         """
         To'lovni kechiktirgan talabalarni olish
+
+        Har bir muddati o'tgan jadval uchun chek yubormagan talabalar
+        bazada anti-join (NOT EXISTS) orqali topiladi va natija
+        bo'laklab qaytariladi (async generator).
         """
         today = date.today()
-        overdue_schedules = PaymentSchedule.objects.filter(
-            due_date__lt=today,
-            is_active=True
-        )
-
-        overdue_students = []
-
-        async for schedule in overdue_schedules:
-            students = Student.objects.filter(is_active=True)
-
-            async for student in students:
-                receipt = await Receipt.objects.filter(
-                    student=student,
-                    payment_schedule=schedule
-                ).afirst()
-
-                if not receipt:
-                    overdue_students.append({
-                        'student': student,
-                        'schedule': schedule,
-                        'days_overdue': (today - schedule.due_date).days
-                    })
-
-        return overdue_students
+        overdue_schedules = [
+            schedule async for schedule in PaymentSchedule.objects.filter(
+                due_date__lt=today,
+                is_active=True
+            ).order_by('due_date')
+        ]
+
+        for schedule in overdue_schedules:
+            has_receipt = Receipt.objects.filter(
+                student=OuterRef('pk'),
+                payment_schedule=schedule
+            )
+            students = Student.objects.filter(
+                ~Exists(has_receipt),
+                is_active=True
+            ).select_related('group').order_by('group_id', 'last_name', 'id')
+
+            if group_id:
+                students = students.filter(group_id=group_id)
+
+            days_overdue = (today - schedule.due_date).days
+            async for student in students.aiterator(chunk_size=chunk_size):
+                yield {
+                    'student': student,
+                    'schedule': schedule,
+                    'days_overdue': days_overdue
+                }
 
     @staticmethod
-    async def get_payment_statistics(academic_year: Optional[str] = None) -> Dict:
+    async def get_payment_statistics(
+            academic_year: Optional[str] = None,
+            group_id: Optional[int] = None
+    ) -> Dict:
         """
         To'lovlar statistikasi
+
+        Har bir jadval bo'yicha barcha hisoblar (yuborilgan, tasdiqlangan,
+        kutilmoqda, rad etilgan) va faol talabalar soni bitta
+        guruhlangan so'rovda hisoblanadi.
         """
         filters = {'is_active': True}
         if academic_year:
             filters['academic_year'] = academic_year
 
-        schedules = PaymentSchedule.objects.filter(**filters)
+        receipt_filter = Q()
+        students = Student.objects.filter(is_active=True)
+        if group_id:
+            receipt_filter = Q(receipt__student__group_id=group_id)
+            students = students.filter(group_id=group_id)
+
+        # Faol talabalar soni - skalyar subquery
+        total_students_sq = students.order_by().annotate(
+            c=Func(F('id'), function='COUNT')
+        ).values('c')
+
+        schedules = PaymentSchedule.objects.filter(**filters).annotate(
+            total_students=Coalesce(Subquery(total_students_sq), 0),
+            submitted=Count('receipt', filter=receipt_filter),
+            approved=Count('receipt', filter=receipt_filter & Q(receipt__status='approved')),
+            pending=Count('receipt', filter=receipt_filter & Q(receipt__status='pending')),
+            rejected=Count('receipt', filter=receipt_filter & Q(receipt__status='rejected')),
+        )
 
         stats = {
-            'total_students': await Student.objects.filter(is_active=True).acount(),
+            'total_students': None,
             'stages': []
         }
 
         async for schedule in schedules:
-            total_receipts = await Receipt.objects.filter(
-                payment_schedule=schedule
-            ).acount()
+            total_students = schedule.total_students
+            stats['total_students'] = total_students
 
-            approved_receipts = await Receipt.objects.filter(
-                payment_schedule=schedule,
-                status='approved'
-            ).acount()
-
-            pending_receipts = await Receipt.objects.filter(
-                payment_schedule=schedule,
-                status='pending'
-            ).acount()
-
-            rejected_receipts = await Receipt.objects.filter(
-                payment_schedule=schedule,
-                status='rejected'
-            ).acount()
-
-            not_submitted = stats['total_students'] - total_receipts
-
-            stage_stats = {
+            stats['stages'].append({
                 'schedule': schedule,
-                'submitted': total_receipts,
-                'not_submitted': not_submitted,
-                'approved': approved_receipts,
-                'pending': pending_receipts,
-                'rejected': rejected_receipts,
-                'completion_rate': (approved_receipts / stats['total_students'] * 100) if stats[
-                                                                                              'total_students'] > 0 else 0
-            }
-
-            stats['stages'].append(stage_stats)
+                'submitted': schedule.submitted,
+                'not_submitted': total_students - schedule.submitted,
+                'approved': schedule.approved,
+                'pending': schedule.pending,
+                'rejected': schedule.rejected,
+                'completion_rate': (schedule.approved / total_students * 100) if total_students > 0 else 0
+            })
+
+        # Jadval bo'lmasa talabalar sonini alohida olamiz
+        if stats['total_students'] is None:
+            stats['total_students'] = await students.acount()
 
         return stats
 
@@ -0,0 +1,335 @@
+# bot/services/receipt_service.py
+from datetime import timedelta
+from typing import Dict, List, Optional, Tuple
+
+from aiogram import Bot
+from asgiref.sync import sync_to_async
+from aiogram.exceptions import TelegramBadRequest
+
+from bot.django_setup import setup_django
+
+setup_django()
+
+from django.db.models import Q
+from django.db.models.signals import post_save, post_delete
+from django.utils import timezone
+
+from webapp.admin_panel.dashboard import ainvalidate_dashboard
+from webapp.admin_panel.models import User, Receipt, ReceiptAdminMessage, ReviewBatch
+from bot.config import ADMIN_CACHE_TTL
+from bot.keyboards.admin_kb import receipt_action_keyboard
+from bot.services.broadcast_service import BroadcastService
+from bot.utils.cache import TTLCache
+
+# Chek yuboriladigan admin va buxgalterlar (telegram_id lar)
+admin_cache = TTLCache(maxsize=1, ttl=ADMIN_CACHE_TTL)
+
+
+def invalidate_admins(sender, instance: User, **kwargs):
+    """Foydalanuvchi o'zgarganda adminlar ro'yxatini yangilash"""
+    admin_cache.clear()
+
+
+post_save.connect(invalidate_admins, sender=User, dispatch_uid='admin_cache_save')
+post_delete.connect(invalidate_admins, sender=User, dispatch_uid='admin_cache_delete')
+
+
+class ReceiptService:
+    """Cheklar bilan ishlash xizmati"""
+
+    NOTIFY_LOCK_TIMEOUT = 60 * 60  # to'xtab qolgan partiya qayta egallanadi (soniya)
+
+    VERDICTS = {
+        'approved': "✅ <b>TASDIQLANDI</b>",
+        'rejected': "❌ <b>RAD ETILDI</b>",
+    }
+
+    _broadcaster: Optional[BroadcastService] = None
+
+    @staticmethod
+    async def get_admin_chat_ids() -> List[int]:
+        """Admin va buxgalterlar telegram_id lari (keshdan)"""
+        chat_ids = admin_cache.get('admins')
+        if chat_ids is TTLCache.MISSING:
+            chat_ids = [
+                telegram_id async for telegram_id in User.objects.filter(
+                    role__in=['admin', 'accountant'],
+                    telegram_id__isnull=False
+                ).values_list('telegram_id', flat=True)
+            ]
+            admin_cache.set('admins', chat_ids)
+        return chat_ids
+
+    @staticmethod
+    def get_broadcaster(bot: Bot) -> BroadcastService:
+        """Jarayon uchun umumiy (limitlari umumiy) BroadcastService"""
+        if ReceiptService._broadcaster is None or ReceiptService._broadcaster.bot is not bot:
+            ReceiptService._broadcaster = BroadcastService(bot)
+        return ReceiptService._broadcaster
+
+    @staticmethod
+    def format_receipt_message(receipt: Receipt) -> str:
+        """Adminlar uchun chek matni (student__group va payment_schedule yuklangan bo'lishi kerak)"""
+        student = receipt.student
+        schedule = receipt.payment_schedule
+
+        return f"""
+📨 <b>YANGI CHEK KELDI</b>
+
+🆔 Talaba ID: {student.student_id}
+👤 F.I.O: {student.full_name}
+📄 Pasport: {student.passport_full}
+🔢 JSHSHIR: {student.jshshir}
+📱 Telefon: {student.phone}
+👥 Guruh: {student.group.name if student.group else 'Biriktirilmagan'}
+
+📊 To'lov bosqichi: {schedule.stage}
+📅 To'lov muddati: {schedule.due_date.strftime('%d.%m.%Y')}
+💰 Summa: {schedule.amount} so'm
+
+⏰ Yuborilgan vaqt: {receipt.submitted_at.strftime('%d.%m.%Y %H:%M')}
+"""
+
+    @staticmethod
+    async def send_receipt_to_admins(bot: Bot, receipt_id: int) -> List[Tuple[int, int]]:
+        """
+        Chekni adminlar va buxgalterlarga yuborish
+
+        Birinchi muvaffaqiyatli yuborilgan xabardan olingan file_id (rasm yoki
+        hujjat) qolganlariga qayta ishlatiladi; ular parallel, Telegram
+        limitlari doirasida yuboriladi.
+        Returns: [(chat_id, message_id), ...]
+        """
+        chat_ids = await ReceiptService.get_admin_chat_ids()
+        if not chat_ids:
+            return []
+
+        receipt = await Receipt.objects.select_related(
+            'student__group', 'payment_schedule'
+        ).aget(id=receipt_id)
+
+        broadcaster = ReceiptService.get_broadcaster(bot)
+        caption = ReceiptService.format_receipt_message(receipt)
+        reply_markup = receipt_action_keyboard(receipt.id)
+        sent: List[Tuple[int, int]] = []
+
+        async def send(chat_id: int, file_id: str, as_document: bool):
+            method = broadcaster.send_document if as_document else broadcaster.send_photo
+            message = await method(chat_id, file_id, caption=caption, reply_markup=reply_markup, parse_mode="HTML")
+            sent.append((chat_id, message.message_id))
+            return message
+
+        # Fayl turini aniqlash (PDF chek send_photo bilan ketmaydi) - birinchi muvaffaqiyatli
+        # yuborishgacha adminlar ketma-ket olinadi, qolganlariga aniqlangan tur va file_id
+        other_chat_ids = list(chat_ids)
+        file_id, as_document = receipt.file_id, False
+        while other_chat_ids:
+            chat_id = other_chat_ids.pop(0)
+            try:
+                try:
+                    message = await send(chat_id, file_id, as_document)
+                except TelegramBadRequest as e:
+                    if 'file of type' not in e.message:
+                        raise
+                    as_document = True
+                    message = await send(chat_id, file_id, as_document)
+
+                file_id = message.document.file_id if as_document else message.photo[-1].file_id
+                break
+            except Exception as e:
+                print(f"Admin {chat_id} ga yuborishda xatolik: {e}")
+
+        async def handle(chat_id: int) -> bool:
+            try:
+                await send(chat_id, file_id, as_document)
+                return True
+            except Exception as e:
+                print(f"Admin {chat_id} ga yuborishda xatolik: {e}")
+                return False
+
+        await broadcaster.run(other_chat_ids, handle)
+
+        await ReceiptAdminMessage.objects.abulk_create([
+            ReceiptAdminMessage(receipt_id=receipt.id, chat_id=chat_id, message_id=message_id)
+            for chat_id, message_id in sent
+        ])
+
+        # Yuborish davomida ko'rib chiqilgan bo'lsa - tugmalarni darhol olib tashlash
+        if await Receipt.objects.filter(id=receipt.id).exclude(status='pending').aexists():
+            await ReceiptService.close_admin_copies(bot, receipt.id)
+
+        return sent
+
+    @staticmethod
+    async def review_receipt(receipt_id: int, status: str, reviewer: User) -> Tuple[bool, Receipt]:
+        """
+        Chekni ko'rib chiqish (tasdiqlash yoki rad etish)
+
+        Faqat status='pending' bo'lsa bitta shartli UPDATE bilan yangilanadi,
+        shuning uchun bir vaqtda bosgan adminlardan faqat bittasi chekni oladi.
+        Returns: (shu admin oldimi, chekning hozirgi holati)
+        """
+        claimed = await Receipt.objects.filter(id=receipt_id, status='pending').aupdate(
+            status=status,
+            reviewed_by=reviewer,
+            reviewed_at=timezone.now()
+        )
+        if claimed:
+            await ainvalidate_dashboard()
+
+        receipt = await Receipt.objects.select_related(
+            'student__user', 'student__group', 'payment_schedule', 'reviewed_by'
+        ).aget(id=receipt_id)
+
+        return bool(claimed), receipt
+
+    @staticmethod
+    def format_student_notification(status: str, stage: str, reviewer: str = 'Admin') -> str:
+        """Talabaga chek ko'rib chiqilgani haqida xabar"""
+        if status == 'approved':
+            return (
+                f"✅ Sizning chekingiz tasdiqlandi!\n\n"
+                f"📊 To'lov: {stage}\n"
+                f"👤 Tasdiqladi: {reviewer}"
+            )
+
+        return (
+            f"❌ Sizning chekingiz rad etildi!\n\n"
+            f"📊 To'lov: {stage}\n"
+            f"📝 Iltimos, to'g'ri chek yuboring yoki buxgalteriya bilan bog'laning."
+        )
+
+    @staticmethod
+    async def bulk_review(status: str, reviewer: User, **filters) -> ReviewBatch:
+        """Filtr (stage, group_id, date_from, date_to) bo'yicha kutilayotgan cheklarni bitta UPDATE bilan ko'rib chiqish"""
+        batch = await sync_to_async(ReviewBatch.review)(status, reviewer, **filters)
+        if batch.total:
+            await ainvalidate_dashboard()
+        return batch
+
+    @staticmethod
+    def _unnotified_batches() -> Q:
+        """Xabari yuborilmagan yoki yuborish to'xtab qolgan partiyalar"""
+        return Q(notify_started_at__isnull=True) | Q(
+            notified_at__isnull=True,
+            notify_started_at__lt=timezone.now() - timedelta(seconds=ReceiptService.NOTIFY_LOCK_TIMEOUT)
+        )
+
+    @staticmethod
+    async def notify_batch(bot: Bot, batch_id: int) -> Optional[ReviewBatch]:
+        """
+        Ommaviy ko'rib chiqilgan cheklar talabalariga xabar yuborish
+
+        Partiyani shartli UPDATE bilan egallaydi (bir necha replika yoki
+        jadval bilan bir vaqtda ikki marta yuborilmaydi). Natija - xabar
+        berilgan va xatolik sonlari - partiyaga yoziladi.
+        Returns: partiya yoki boshqa jarayon egallagan bo'lsa None
+        """
+        claimed = await ReviewBatch.objects.filter(
+            ReceiptService._unnotified_batches(), id=batch_id
+        ).aupdate(notify_started_at=timezone.now())
+        if not claimed:
+            return None
+
+        batch = await ReviewBatch.objects.select_related('reviewed_by').aget(id=batch_id)
+        reviewer = 'Admin'
+        if batch.reviewed_by:
+            reviewer = batch.reviewed_by.get_full_name() or 'Admin'
+
+        recipients = Receipt.objects.filter(
+            review_batch_id=batch_id,
+            student__user__telegram_id__isnull=False
+        ).values_list('student__user__telegram_id', 'payment_schedule__stage').aiterator()
+
+        broadcaster = ReceiptService.get_broadcaster(bot)
+
+        async def handle(recipient: Tuple[int, str]) -> bool:
+            chat_id, stage = recipient
+            try:
+                await broadcaster.send_message(
+                    chat_id, ReceiptService.format_student_notification(batch.status, stage, reviewer)
+                )
+                return True
+            except Exception as e:
+                print(f"Talaba {chat_id} ga xabar yuborishda xatolik: {e}")
+                return False
+
+        report = await broadcaster.run(recipients, handle)
+
+        batch.notified = report['sent']
+        batch.failed = report['failed']
+        batch.notified_at = timezone.now()
+        await batch.asave(update_fields=['notified', 'failed', 'notified_at'])
+
+        # Adminlardagi nusxalardan tugmalarni olib tashlash
+        receipt_ids = ReceiptAdminMessage.objects.filter(
+            receipt__review_batch_id=batch_id
+        ).values_list('receipt_id', flat=True).distinct()
+        async for receipt_id in receipt_ids:
+            await ReceiptService.close_admin_copies(bot, receipt_id)
+
+        return batch
+
+    @staticmethod
+    async def notify_pending_batches(bot: Bot) -> List[ReviewBatch]:
+        """Xabari hali yuborilmagan partiyalar (masalan, web paneldan) uchun xabar yuborish"""
+        batch_ids = [
+            batch_id async for batch_id in ReviewBatch.objects.filter(
+                ReceiptService._unnotified_batches()
+            ).order_by('created_at').values_list('id', flat=True)
+        ]
+
+        batches = []
+        for batch_id in batch_ids:
+            batch = await ReceiptService.notify_batch(bot, batch_id)
+            if batch:
+                batches.append(batch)
+        return batches
+
+    @staticmethod
+    def format_reviewed_message(receipt: Receipt) -> str:
+        """Ko'rib chiqilgan chek matni (qarori va kim ko'rib chiqqani bilan)"""
+        reviewer = 'Admin'
+        if receipt.reviewed_by:
+            reviewer = receipt.reviewed_by.get_full_name() or receipt.reviewed_by.username
+        return (
+            ReceiptService.format_receipt_message(receipt)
+            + f"\n{ReceiptService.VERDICTS.get(receipt.status, receipt.get_status_display())}\n👤 {reviewer}"
+        )
+
+    @staticmethod
+    async def close_admin_copies(bot: Bot, receipt_id: int, exclude: Optional[Tuple[int, int]] = None) -> Dict:
+        """
+        Boshqa adminlardagi chek nusxalaridan tugmalarni olib tashlash
+
+        exclude: (chat_id, message_id) - allaqachon yangilangan nusxa
+        """
+        receipt = await Receipt.objects.select_related(
+            'student__group', 'payment_schedule', 'reviewed_by'
+        ).aget(id=receipt_id)
+
+        copies = [
+            (chat_id, message_id)
+            async for chat_id, message_id in ReceiptAdminMessage.objects.filter(
+                receipt_id=receipt_id
+            ).values_list('chat_id', 'message_id')
+            if (chat_id, message_id) != exclude
+        ]
+
+        broadcaster = ReceiptService.get_broadcaster(bot)
+        caption = ReceiptService.format_reviewed_message(receipt)
+
+        async def handle(copy: Tuple[int, int]) -> bool:
+            chat_id, message_id = copy
+            try:
+                await broadcaster.edit_message_caption(
+                    chat_id, message_id=message_id, caption=caption, parse_mode="HTML", reply_markup=None
+                )
+                return True
+            except Exception as e:
+                print(f"Admin {chat_id} dagi chekni yangilashda xatolik: {e}")
+                return False
+
+        report = await broadcaster.run(copies, handle)
+        await ReceiptAdminMessage.objects.filter(receipt_id=receipt_id).adelete()
+        return report
@@ -1,99 +1,282 @@
 # bot/services/reminder_service.py
-from datetime import datetime, timedelta
-from typing import List
-import sys
+from datetime import date, datetime, timedelta
+from string import Formatter
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+import asyncio
+import html
+import time
 import os
 
-sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'webapp.webapp.settings')
+from bot.django_setup import setup_django
 
-import django
+setup_django()
 
-django.setup()
+from django.db.models import Exists, OuterRef
+from django.db.models.signals import post_save, post_delete
 
 from webapp.admin_panel.models import (
     PaymentSchedule, Student, PaymentReminder,
     ReminderTemplate, Group
 )
-from bot.config import REMINDER_DAYS
+from bot.config import (
+    REMINDER_DAYS, REMINDER_GROUP_DIGEST, REMINDER_TEMPLATE_CACHE_TTL,
+    REMINDER_CHECKPOINT_FILE, MESSAGE_MAX_LENGTH
+)
+from bot.services.broadcast_service import BroadcastService
+
+
+class ReminderTemplateCache:
+    """
+    Eslatma shablonlari keshi (days_before -> tayyor format funksiyasi)
+
+    Shablonlar bir marta yuklanadi va oldindan tekshiriladi. Kesh TTL
+    o'tganda yoki shu jarayonda ReminderTemplate o'zgarganda
+    (post_save/post_delete) yangilanadi.
+    """
+
+    _templates: Optional[Dict[int, Callable[[Dict], str]]] = None
+    _loaded_at: float = 0.0
+
+    @classmethod
+    async def load(cls):
+        """Faol shablonlarni yuklash va oldindan tahlil qilish"""
+        templates = {}
+        async for template in ReminderTemplate.objects.filter(is_active=True):
+            try:
+                # Noto'g'ri shablonni har bir xabarda emas, bir marta aniqlaymiz
+                list(Formatter().parse(template.message_text))
+            except ValueError as e:
+                print(f"Shablon ({template.days_before} kun) noto'g'ri: {e}")
+                continue
+            templates[template.days_before] = template.message_text.format_map
+
+        cls._templates = templates
+        cls._loaded_at = time.monotonic()
+
+    @classmethod
+    async def get(cls, days_before: int) -> Optional[Callable[[Dict], str]]:
+        """days_before uchun shablon (bo'lmasa None)"""
+        if cls._templates is None or time.monotonic() - cls._loaded_at > REMINDER_TEMPLATE_CACHE_TTL:
+            await cls.load()
+        return cls._templates.get(days_before)
+
+    @classmethod
+    def invalidate(cls, **kwargs):
+        """Keshni tozalash (signal handler sifatida ham ishlatiladi)"""
+        cls._templates = None
+
+
+post_save.connect(ReminderTemplateCache.invalidate, sender=ReminderTemplate,
+                  dispatch_uid='reminder_template_cache_save')
+post_delete.connect(ReminderTemplateCache.invalidate, sender=ReminderTemplate,
+                    dispatch_uid='reminder_template_cache_delete')
+
+
+class SentReminderBuffer:
+    """
+    Yuborilgan eslatmalarni yig'ib, bitta UPDATE bilan belgilash
+
+    Har bir yuborilgan eslatma ID si jurnal fayliga yoziladi (add() qaytguncha).
+    Diskka yozish alohida oqimda; bir vaqtda yuborilganlar bitta yozuv va
+    bitta fsync bilan jurnallanadi. Jarayon to'satdan to'xtasa, keyingi ishga
+    tushishda recover() jurnaldagi eslatmalarni yuborilgan deb belgilaydi -
+    qayta yuborilmaydi.
+    """
+
+    def __init__(self, checkpoint_path: str = REMINDER_CHECKPOINT_FILE, batch_size: int = 500):
+        self.checkpoint_path = checkpoint_path
+        self.batch_size = batch_size
+        self.pending: List[int] = []
+        self._unjournaled: List[int] = []
+        self._journal_lock = asyncio.Lock()
+        self._flush_lock = asyncio.Lock()
+
+    def _write_checkpoint(self, ids: List[int], mode: str):
+        with open(self.checkpoint_path, mode) as f:
+            f.writelines(f"{reminder_id}\n" for reminder_id in ids)
+            f.flush()
+            os.fsync(f.fileno())
+
+    async def recover(self) -> int:
+        """Oldingi ishga tushishdan qolgan jurnalni bazaga yozish"""
+        if not os.path.exists(self.checkpoint_path):
+            return 0
+
+        with open(self.checkpoint_path) as f:
+            self.pending = [int(line) for line in f if line.strip()]
+
+        count = len(self.pending)
+        await self.flush()
+        return count
+
+    async def add(self, reminder_id: int):
+        """Eslatmani yuborilgan deb qayd etish"""
+        self.pending.append(reminder_id)
+        self._unjournaled.append(reminder_id)
+
+        async with self._journal_lock:
+            # Kutish davomida boshqalar qo'shganlari ham shu yozuvga tushadi
+            if self._unjournaled:
+                ids, self._unjournaled = self._unjournaled, []
+                await asyncio.to_thread(self._write_checkpoint, ids, 'a')
+
+        if len(self.pending) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self):
+        """
+        Yig'ilgan eslatmalarni bitta UPDATE bilan belgilash
+
+        Ro'yxatdan faqat UPDATE muvaffaqiyatli bo'lgandan keyin olib tashlanadi -
+        xatolikda keyingi flush da qayta urinadi.
+        """
+        async with self._flush_lock:
+            ids = list(self.pending)
+            if ids:
+                await PaymentReminder.objects.filter(id__in=ids).aupdate(
+                    is_sent=True,
+                    sent_at=datetime.now()
+                )
+                done = set(ids)
+                self.pending = [reminder_id for reminder_id in self.pending if reminder_id not in done]
+
+            # Jurnalda faqat hali bazaga yozilmaganlar qoladi
+            async with self._journal_lock:
+                self._unjournaled = []
+                await asyncio.to_thread(self._write_checkpoint, list(self.pending), 'w')
 
 
 class ReminderService:
     """To'lov eslatmalari xizmati"""
 
+    # bulk_create uchun bo'lak hajmi
+    BULK_BATCH_SIZE = 1000
+
     @staticmethod
     async def create_reminders_for_schedule(schedule_id: int):
         """
         To'lov jadvali uchun eslatmalarni yaratish
+
+        Yetishmayotgan (schedule, student, days_before) uchliklari bitta
+        so'rovda aniqlanadi va bo'laklab bulk_create orqali qo'shiladi.
+
+        Qaytariladigan son - qo'shishga urinilgan eslatmalar soni: parallel
+        ishga tushgan boshqa chaqiruv ulgurgan qatorlar ignore_conflicts bilan
+        o'tkazib yuboriladi, lekin bu songa kiradi.
         """
         try:
             schedule = await PaymentSchedule.objects.aget(id=schedule_id)
-            students = Student.objects.filter(is_active=True)
-
-            created_count = 0
-            async for student in students:
-                for days in REMINDER_DAYS:
-                    reminder, created = await PaymentReminder.objects.aget_or_create(
-                        payment_schedule=schedule,
-                        student=student,
-                        days_before=days
-                    )
-                    if created:
-                        created_count += 1
 
-            return created_count
+            # Har bir kun uchun eslatma mavjudligini belgilash
+            flags = {
+                f'has_{days}': Exists(PaymentReminder.objects.filter(
+                    payment_schedule=schedule,
+                    student=OuterRef('pk'),
+                    days_before=days
+                ))
+                for days in REMINDER_DAYS
+            }
+            students = Student.objects.filter(is_active=True).annotate(**flags).values_list(
+                'id', *flags.keys()
+            )
+
+            attempted_count = 0
+            batch = []
+            async for row in students.aiterator(chunk_size=ReminderService.BULK_BATCH_SIZE):
+                student_id, existing = row[0], row[1:]
+                for days, exists in zip(REMINDER_DAYS, existing):
+                    if not exists:
+                        batch.append(PaymentReminder(
+                            payment_schedule=schedule,
+                            student_id=student_id,
+                            days_before=days
+                        ))
+
+                if len(batch) >= ReminderService.BULK_BATCH_SIZE:
+                    await PaymentReminder.objects.abulk_create(batch, ignore_conflicts=True)
+                    attempted_count += len(batch)
+                    batch = []
+
+            if batch:
+                await PaymentReminder.objects.abulk_create(batch, ignore_conflicts=True)
+                attempted_count += len(batch)
+
+            return attempted_count
         except Exception as e:
             print(f"Eslatma yaratishda xatolik: {e}")
             return 0
 
     @staticmethod
-    async def get_due_reminders() -> List[PaymentReminder]:
+    async def get_due_reminders(
+            chunk_size: int = 500,
+            since: Optional[date] = None
+    ) -> AsyncIterator[PaymentReminder]:
         """
         Yuborish kerak bo'lgan eslatmalarni olish
+
+        Shart (due_date - days_before == bugun) SQL da tekshiriladi:
+        jadvallar uchun kerakli days_before qiymati hisoblanib (PaymentReminder.due_filter),
+        faqat bugungi eslatmalar (reminder_unsent_due_idx) o'qiladi.
+        since berilsa, [since, bugun] oralig'idagi o'tkazib yuborilgan
+        kunlarning eslatmalari ham qaytariladi.
         """
         today = datetime.now().date()
+        since = min(since or today, today)
 
-        reminders = []
+        # Muddati since dan keyin bo'lgan jadvallar (o'tkazib yuborilgan kunlarda muddati o'tganlari ham)
+        schedules = [
+            schedule async for schedule in PaymentSchedule.objects.filter(
+                due_date__gte=since
+            ).values_list('id', 'due_date')
+        ]
+        due_filter = PaymentReminder.due_filter(schedules, since, today)
 
-        async for reminder in PaymentReminder.objects.filter(
-                is_sent=False
-        ).select_related('payment_schedule', 'student', 'student__user', 'student__group'):
-
-            schedule = reminder.payment_schedule
-            days_until_due = (schedule.due_date - today).days
+        if not due_filter:
+            return
 
-            # Agar belgilangan kun bo'lsa
-            if days_until_due == reminder.days_before:
-                reminders.append(reminder)
+        reminders = PaymentReminder.objects.filter(
+            due_filter,
+            is_sent=False
+        ).select_related('payment_schedule', 'student', 'student__user', 'student__group')
 
-        return reminders
+        async for reminder in reminders.aiterator(chunk_size=chunk_size):
+            yield reminder
 
     @staticmethod
-    async def send_reminder(bot, reminder: PaymentReminder):
+    async def send_reminder(
+            bot,
+            reminder: PaymentReminder,
+            digest: Optional[Dict] = None,
+            sent_buffer: Optional[SentReminderBuffer] = None
+    ):
         """
         Eslatmani yuborish
+
+        digest berilsa, guruh xabari darhol yuborilmaydi - u
+        send_group_digests() orqali bitta umumiy xabarga yig'iladi va eslatma
+        digest yetkazilgandan keyin belgilanadi (aks holda keyingi ishga
+        tushishda qayta yuboriladi).
+        sent_buffer berilsa, eslatma alohida asave() o'rniga
+        guruhlangan UPDATE bilan belgilanadi.
         """
         try:
             student = reminder.student
             schedule = reminder.payment_schedule
 
-            # Shablon olish
-            template = await ReminderTemplate.objects.filter(
-                days_before=reminder.days_before,
-                is_active=True
-            ).afirst()
+            # Shablon olish (keshdan)
+            render_template = await ReminderTemplateCache.get(reminder.days_before)
 
-            if not template:
+            if not render_template:
                 # Default xabar
                 message_text = ReminderService._get_default_message(reminder)
             else:
-                message_text = template.message_text.format(
-                    student_name=student.first_name,
-                    stage=schedule.stage,
-                    due_date=schedule.due_date.strftime('%d.%m.%Y'),
-                    days=reminder.days_before,
-                    amount=schedule.amount
-                )
+                message_text = render_template({
+                    'student_name': student.first_name,
+                    'stage': schedule.stage,
+                    'due_date': schedule.due_date.strftime('%d.%m.%Y'),
+                    'days': reminder.days_before,
+                    'amount': schedule.amount
+                })
 
             # Talabaga yuborish
             if student.user and student.user.telegram_id:
@@ -108,46 +291,133 @@ class ReminderService:
 
             # Guruhga yuborish
             if student.group and student.group.telegram_chat_id and student.group.is_active:
-                try:
-                    group_message = f"📢 {student.full_name}\n\n{message_text}"
-                    await bot.send_message(
-                        chat_id=student.group.telegram_chat_id,
-                        text=group_message,
-                        parse_mode="HTML"
-                    )
-                except Exception as e:
-                    print(f"Guruhga yuborishda xatolik: {e}")
-
-            # Eslatmani belgilash
-            reminder.is_sent = True
-            reminder.sent_at = datetime.now()
-            await reminder.asave()
+                if digest is not None:
+                    # Digest yuborilgandan keyin belgilanadi (send_group_digests)
+                    ReminderService._add_to_digest(digest, reminder)
+                    return True
+                await ReminderService._send_group_reminder(bot, student, message_text)
 
+            await ReminderService._mark_sent([reminder.id], sent_buffer)
             return True
 
         except Exception as e:
             print(f"Eslatma yuborishda xatolik: {e}")
             return False
 
+    @staticmethod
+    async def _mark_sent(reminder_ids: List[int], sent_buffer: Optional[SentReminderBuffer] = None):
+        """Eslatmalarni yuborilgan deb belgilash (sent_buffer orqali yoki darhol)"""
+        if sent_buffer is not None:
+            for reminder_id in reminder_ids:
+                await sent_buffer.add(reminder_id)
+        else:
+            await PaymentReminder.objects.filter(id__in=reminder_ids).aupdate(
+                is_sent=True,
+                sent_at=datetime.now()
+            )
+
+    @staticmethod
+    async def _send_group_reminder(bot, student: Student, message_text: str):
+        """Bitta talaba uchun guruhga eslatma (digest rejimisiz)"""
+        try:
+            group_message = f"📢 {student.full_name}\n\n{message_text}"
+            await bot.send_message(
+                chat_id=student.group.telegram_chat_id,
+                text=group_message,
+                parse_mode="HTML"
+            )
+        except Exception as e:
+            print(f"Guruhga yuborishda xatolik: {e}")
+
+    @staticmethod
+    def _add_to_digest(digest: Dict, reminder: PaymentReminder):
+        """Eslatmani guruh/bosqich/kun bo'yicha digest ga qo'shish"""
+        student = reminder.student
+        key = (student.group.telegram_chat_id, reminder.payment_schedule_id, reminder.days_before)
+
+        entry = digest.get(key)
+        if entry is None:
+            entry = digest[key] = {
+                'chat_id': student.group.telegram_chat_id,
+                'schedule': reminder.payment_schedule,
+                'days_before': reminder.days_before,
+                'students': [],
+                'reminder_ids': []
+            }
+        entry['students'].append(student.full_name)
+        entry['reminder_ids'].append(reminder.id)
+
+    @staticmethod
+    def _build_digest_messages(entry: Dict) -> List[str]:
+        """Digest matnini Telegram limitiga sig'adigan sahifalarga bo'lish"""
+        schedule = entry['schedule']
+        urgency, message = ReminderService._get_urgency(entry['days_before'])
+
+        header = (
+            f"📢 {urgency}\n\n"
+            f"📊 To'lov bosqichi: {schedule.stage}\n"
+            f"📅 Muddat: {schedule.due_date.strftime('%d.%m.%Y')}\n"
+            f"⏰ {message}\n"
+            f"💰 Summa: {schedule.amount} so'm\n\n"
+            f"👥 <b>Talabalar:</b>\n"
+        )
+        footer = "\n📤 To'lovdan keyin chekni botga yuborishni unutmang!"
+        # Sahifa raqami "(12/12)" uchun joy qoldiramiz
+        limit = MESSAGE_MAX_LENGTH - len(header) - len(footer) - 16
+
+        pages = []
+        lines = ''
+        for number, name in enumerate(sorted(entry['students']), start=1):
+            line = f"{number}. {html.escape(name)}\n"
+            if lines and len(lines) + len(line) > limit:
+                pages.append(lines)
+                lines = ''
+            lines += line
+        pages.append(lines)
+
+        if len(pages) == 1:
+            return [header + pages[0] + footer]
+
+        return [
+            f"{header}{page}{footer}\n({index}/{len(pages)})"
+            for index, page in enumerate(pages, start=1)
+        ]
+
+    @staticmethod
+    async def send_group_digests(
+            broadcaster,
+            digest: Dict,
+            sent_buffer: Optional[SentReminderBuffer] = None
+    ) -> Dict:
+        """
+        Yig'ilgan digest larni guruhlarga yuborish
+
+        Digestning barcha sahifalari yetkazilgandan keyingina undagi eslatmalar
+        yuborilgan deb belgilanadi; yuborilmagan digest eslatmalari keyingi
+        ishga tushishda (talabaga ham) qayta yuboriladi.
+        Returns: {'total': int, 'sent': int, 'failed': int, 'duration': float,
+                  'messages': int} (total/sent/failed - digestlar, messages - xabarlar)
+        """
+        messages = 0
+
+        async def send(entry):
+            nonlocal messages
+            for text in ReminderService._build_digest_messages(entry):
+                await broadcaster.send_message(chat_id=entry['chat_id'], text=text, parse_mode="HTML")
+                messages += 1
+            await ReminderService._mark_sent(entry['reminder_ids'], sent_buffer)
+            return True
+
+        report = await broadcaster.run(digest.values(), send)
+        report['messages'] = messages
+        return report
+
     @staticmethod
     def _get_default_message(reminder: PaymentReminder) -> str:
         """Default eslatma xabari"""
         student = reminder.student
         schedule = reminder.payment_schedule
-        days = reminder.days_before
-
-        if days == 0:
-            urgency = "🔴 <b>BUGUN!</b>"
-            message = "Bugun to'lov kuni!"
-        elif days <= 3:
-            urgency = "🟠 <b>SHOSHILING!</b>"
-            message = f"{days} kun qoldi"
-        elif days <= 7:
-            urgency = "🟡 <b>DIQQAT!</b>"
-            message = f"{days} kun qoldi"
-        else:
-            urgency = "🟢 <b>Eslatma</b>"
-            message = f"{days} kun qoldi"
+        urgency, message = ReminderService._get_urgency(reminder.days_before)
 
         return f"""
 {urgency}
@@ -165,17 +435,67 @@ class ReminderService:
 """
 
     @staticmethod
-    async def check_and_send_reminders(bot):
+    def _get_urgency(days: int) -> Tuple[str, str]:
+        """Qolgan kunlarga qarab shoshilinchlik belgisi va matni"""
+        if days == 0:
+            urgency = "🔴 <b>BUGUN!</b>"
+            message = "Bugun to'lov kuni!"
+        elif days <= 3:
+            urgency = "🟠 <b>SHOSHILING!</b>"
+            message = f"{days} kun qoldi"
+        elif days <= 7:
+            urgency = "🟡 <b>DIQQAT!</b>"
+            message = f"{days} kun qoldi"
+        else:
+            urgency = "🟢 <b>Eslatma</b>"
+            message = f"{days} kun qoldi"
+
+        return urgency, message
+
+    @staticmethod
+    async def check_and_send_reminders(
+            bot,
+            on_progress=None,
+            since: Optional[date] = None,
+            sent_buffer: Optional[SentReminderBuffer] = None
+    ) -> Dict:
         """
         Barcha eslatmalarni tekshirish va yuborish
         (Har kuni avtomatik ishga tushadi)
+
+        Eslatmalar BroadcastService orqali parallel va Telegram
+        limitlariga rioya qilgan holda yuboriladi. Digest rejimida
+        guruhlarga har bir bosqich/kun uchun bitta umumiy xabar ketadi.
+        Yuborilganlar SentReminderBuffer orqali guruhlab belgilanadi.
+        since - o'tkazib yuborilgan kunlarni qamrab olish uchun (get_due_reminders).
+        sent_buffer - berilmasa REMINDER_CHECKPOINT_FILE jurnali bilan yaratiladi.
+        Returns: {'total': int, 'sent': int, 'failed': int, 'duration': float,
+                  'group_messages': int, 'group_failed': int}
         """
-        reminders = await ReminderService.get_due_reminders()
+        broadcaster = BroadcastService(bot)
+        digest = {} if REMINDER_GROUP_DIGEST else None
+        if sent_buffer is None:
+            sent_buffer = SentReminderBuffer()
 
-        sent_count = 0
-        for reminder in reminders:
-            success = await ReminderService.send_reminder(bot, reminder)
-            if success:
-                sent_count += 1
+        # Oldingi (to'xtab qolgan) ishga tushishdan qolganlarni belgilash
+        await sent_buffer.recover()
 
-        return sent_count
\ No newline at end of file
+        # Shablonlar har bir ishga tushishda bir marta yuklanadi
+        await ReminderTemplateCache.load()
+
+        try:
+            report = await broadcaster.run(
+                ReminderService.get_due_reminders(since=since),
+                lambda reminder: ReminderService.send_reminder(broadcaster, reminder, digest, sent_buffer),
+                on_progress=on_progress
+            )
+
+            report['group_messages'] = report['group_failed'] = 0
+            if digest:
+                group_report = await ReminderService.send_group_digests(broadcaster, digest, sent_buffer)
+                report['group_messages'] = group_report['messages']
+                report['group_failed'] = group_report['failed']
+        finally:
+            await sent_buffer.flush()
+
+        return report
@@ -0,0 +1,196 @@
+# bot/services/scheduler_service.py
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+import asyncio
+import logging
+import time
+
+from bot.django_setup import setup_django
+
+setup_django()
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+from django.db import IntegrityError
+from django.db.models import Q
+
+from webapp.admin_panel.models import ReminderRun
+from bot.config import (
+    TIMEZONE, REMINDER_HOUR, REMINDER_MINUTE,
+    SCHEDULER_DB_URL, SCHEDULER_MISFIRE_GRACE,
+    REMINDER_CATCHUP_DAYS, REMINDER_RUN_LOCK_TIMEOUT, REVIEW_BATCH_POLL_INTERVAL
+)
+from bot.services.receipt_service import ReceiptService
+from bot.services.reminder_service import ReminderService
+
+logger = logging.getLogger(__name__)
+
+
+async def run_daily_reminders():
+    """
+    APScheduler job funksiyasi
+
+    Job store ga pickle qilinadigan bo'lgani uchun argumentsiz,
+    modul darajasidagi funksiya; bot SchedulerService dan olinadi.
+    """
+    await SchedulerService.run_reminders(SchedulerService.bot)
+
+
+async def run_batch_notifications():
+    """Ommaviy ko'rib chiqilgan cheklar (web panel) bo'yicha talabalarga xabar yuborish"""
+    for batch in await ReceiptService.notify_pending_batches(SchedulerService.bot):
+        logger.info(
+            "Ommaviy ko'rib chiqish #%s: %s ta chek, xabar berildi: %s ta, xatolik: %s ta",
+            batch.id, batch.total, batch.notified, batch.failed
+        )
+
+
+class SchedulerService:
+    """Kunlik eslatmalarni rejalashtirish xizmati"""
+
+    JOB_ID = 'daily_reminders'
+    BATCH_JOB_ID = 'review_batch_notifications'
+    bot = None
+
+    def __init__(self, bot):
+        SchedulerService.bot = bot
+        self.scheduler = AsyncIOScheduler(
+            jobstores={'default': SQLAlchemyJobStore(url=SCHEDULER_DB_URL)},
+            job_defaults={
+                'coalesce': True,
+                'max_instances': 1,
+                'misfire_grace_time': SCHEDULER_MISFIRE_GRACE
+            },
+            timezone=TIMEZONE
+        )
+
+    def start(self):
+        """
+        Rejalashtiruvchini ishga tushirish
+
+        Job saqlangan bo'lsa qayta yaratilmaydi - aks holda to'xtab
+        turgan vaqtda o'tkazib yuborilgan ishga tushish yo'qolardi.
+        """
+        trigger = CronTrigger(hour=REMINDER_HOUR, minute=REMINDER_MINUTE, timezone=TIMEZONE)
+
+        self.scheduler.start(paused=True)
+
+        job = self.scheduler.get_job(self.JOB_ID)
+        if job is None:
+            self.scheduler.add_job(
+                'bot.services.scheduler_service:run_daily_reminders',
+                trigger=trigger,
+                id=self.JOB_ID
+            )
+        elif str(job.trigger) != str(trigger):
+            self.scheduler.reschedule_job(self.JOB_ID, trigger=trigger)
+
+        self.scheduler.add_job(
+            'bot.services.scheduler_service:run_batch_notifications',
+            trigger=IntervalTrigger(seconds=REVIEW_BATCH_POLL_INTERVAL),
+            id=self.BATCH_JOB_ID,
+            replace_existing=True
+        )
+
+        self.scheduler.resume()
+        logger.info("Eslatmalar jadvali: har kuni %02d:%02d (%s)", REMINDER_HOUR, REMINDER_MINUTE, TIMEZONE)
+
+    def shutdown(self):
+        """Rejalashtiruvchini to'xtatish"""
+        if self.scheduler.running:
+            self.scheduler.shutdown(wait=False)
+
+    @staticmethod
+    async def _acquire_run(run_date) -> Optional[ReminderRun]:
+        """
+        Bugungi jarayonni egallash (replikalar orasidagi qulf)
+
+        run_date unikal: faqat bitta replika yozuv yarata oladi. Tugamay
+        qolgan (qulfi eskirgan) yoki xatolik bilan tugagan jarayon qayta egallanadi.
+        """
+        now = datetime.now()
+
+        try:
+            return await ReminderRun.objects.acreate(run_date=run_date, started_at=now)
+        except IntegrityError:
+            pass
+
+        taken = await ReminderRun.objects.filter(
+            Q(finished_at__isnull=True, started_at__lt=now - timedelta(seconds=REMINDER_RUN_LOCK_TIMEOUT)) |
+            ~Q(error=''),
+            run_date=run_date
+        ).aupdate(started_at=now, finished_at=None, error='')
+
+        if taken:
+            return await ReminderRun.objects.aget(run_date=run_date)
+        return None
+
+    @staticmethod
+    async def _finish_run(run: ReminderRun, started: float, report: Optional[Dict] = None, error: str = ''):
+        """Jarayonni yopish: tugagan vaqt, davomiylik, metrikalar yoki xatolik"""
+        run.finished_at = datetime.now()
+        run.duration = time.monotonic() - started
+        run.error = error
+        if report is not None:
+            run.duration = report['duration']
+            run.total = report['total']
+            run.sent = report['sent']
+            run.failed = report['failed']
+            run.group_messages = report['group_messages']
+        await run.asave()
+
+    @staticmethod
+    async def run_reminders(bot) -> Optional[Dict]:
+        """
+        Kunlik eslatmalarni yuborish
+
+        Oxirgi muvaffaqiyatli jarayondan beri o'tkazib yuborilgan kunlar
+        (REMINDER_CATCHUP_DAYS gacha) ham qamrab olinadi. Xatolik bo'lsa ham
+        jarayon yopiladi (finished_at, error) - keyingi ishga tushish shu
+        kunlarni qayta qamrab oladi. Guruh digestlari yetkazilmasa ham jarayon
+        muvaffaqiyatsiz hisoblanadi.
+        Returns: metrikalar yoki None (boshqa replika ishlayapti yoki xatolik)
+        """
+        today = datetime.now().date()
+
+        run = await SchedulerService._acquire_run(today)
+        if run is None:
+            logger.info("Bugungi eslatmalar boshqa jarayon tomonidan yuborilmoqda")
+            return None
+
+        last_run = await ReminderRun.objects.filter(
+            run_date__lt=today,
+            finished_at__isnull=False,
+            error=''
+        ).order_by('-run_date').afirst()
+
+        since = today
+        if last_run:
+            since = max(last_run.run_date + timedelta(days=1), today - timedelta(days=REMINDER_CATCHUP_DAYS))
+
+        started = time.monotonic()
+        try:
+            report = await ReminderService.check_and_send_reminders(bot, since=since)
+        except asyncio.CancelledError:
+            # To'xtatilgan jarayon ham muvaffaqiyatsiz - keyingi ishga tushish qayta qamrab oladi
+            await SchedulerService._finish_run(run, started, error="To'xtatildi")
+            raise
+        except Exception as e:
+            logger.exception("Eslatmalarni yuborishda xatolik")
+            await SchedulerService._finish_run(run, started, error=str(e) or e.__class__.__name__)
+            return None
+
+        # Yetkazilmagan guruh digestlari eslatmalari belgilanmagan - kun qayta qamrab olinadi
+        error = ''
+        if report['group_failed']:
+            error = f"{report['group_failed']} ta guruh digesti yuborilmadi"
+            logger.warning(error)
+
+        await SchedulerService._finish_run(run, started, report=report, error=error)
+        logger.info(
+            "Eslatmalar yuborildi: %s ta, xatolik: %s ta, guruh xabarlari: %s ta, %.1f s",
+            report['sent'], report['failed'], report['group_messages'], report['duration']
+        )
+        return report
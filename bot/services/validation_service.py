@@ -1,15 +1,10 @@
 # bot/services/validation_service.py
 from typing import Tuple, Optional
 import re
-import sys
-import os
 
-sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'webapp.webapp.settings')
+from bot.django_setup import setup_django
 
-import django
-
-django.setup()
+setup_django()
 
 from webapp.admin_panel.models import Student
 
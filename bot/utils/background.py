@@ -0,0 +1,32 @@
+# bot/utils/background.py
+import asyncio
+import logging
+from typing import Coroutine, Set
+
+logger = logging.getLogger(__name__)
+
+_tasks: Set[asyncio.Task] = set()
+
+
+def _done(task: asyncio.Task):
+    _tasks.discard(task)
+    if not task.cancelled() and task.exception():
+        logger.error("Fon vazifasida xatolik", exc_info=task.exception())
+
+
+def run_in_background(coro: Coroutine) -> asyncio.Task:
+    """Korutinani javobni kutmasdan (fonda) bajarish"""
+    task = asyncio.create_task(coro)
+    _tasks.add(task)
+    task.add_done_callback(_done)
+    return task
+
+
+async def wait_background_tasks(timeout: float = 30):
+    """To'xtashdan oldin fon vazifalari tugashini kutish"""
+    if not _tasks:
+        return
+
+    done, pending = await asyncio.wait(set(_tasks), timeout=timeout)
+    if pending:
+        logger.warning("%s ta fon vazifasi tugamay qoldi", len(pending))
@@ -0,0 +1,48 @@
+# bot/utils/cache.py
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class TTLCache:
+    """LRU + TTL kesh (bitta jarayon ichida)"""
+
+    MISSING = object()
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        """Qiymatni olish (muddati o'tgan bo'lsa default)"""
+        item = self._data.get(key)
+        if item is None:
+            return default
+
+        value, expires_at = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        """Qiymatni saqlash (eng eski yozuvlar siqib chiqariladi)"""
+        self._data[key] = (value, time.monotonic() + self.ttl)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable):
+        """Yozuvni o'chirish"""
+        self._data.pop(key, None)
+
+    def clear(self):
+        """Keshni tozalash"""
+        self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
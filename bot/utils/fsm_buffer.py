@@ -0,0 +1,137 @@
+# bot/utils/fsm_buffer.py
+import time
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+
+from bot.config import FSM_DURABILITY, FSM_CHECKPOINT_STATES, FSM_STATE_TTL
+from bot.utils.cache import TTLCache
+
+Record = Tuple[Optional[str], Dict[str, Any]]
+
+
+class CoalescingStorage(BaseStorage):
+    """
+    FSM yozuvlarini birlashtiruvchi o'ram
+
+    Update davomida chatning holati va ma'lumotlari (draft) xotirada turadi,
+    asosiy xotiraga durability darajasiga qarab yoziladi:
+        always     - har bir o'zgarish darhol (o'ramsiz bilan bir xil)
+        step       - update oxirida holat va ma'lumotlar bitta yozuvda
+        checkpoint - faqat checkpoints dagi holatga o'tganda yoki holat
+                     tozalanganda (oradagi qadamlar qayta ishga tushishda yo'qoladi)
+    Update oxiri FSMCommitMiddleware orqali bildiriladi - draft shu yerda
+    tashlanadi, keyingi update asosiy xotiradan o'qiydi (replikalar eskirgan
+    nusxa ko'rmaydi). Yozilmagan (checkpoint) o'zgarishlar siqib chiqarilmaydi,
+    faqat state_ttl dan keyin tashlab ketilgan deb o'chiriladi.
+    """
+
+    SWEEP_INTERVAL = 60  # soniya
+    DRAFT_TTL = 60  # end_update chaqirilmasa ham o'qilgan draft shundan keyin tashlanadi (soniya)
+
+    def __init__(
+            self,
+            storage: BaseStorage,
+            durability: str = FSM_DURABILITY,
+            checkpoints: Iterable[str] = FSM_CHECKPOINT_STATES,
+            cache_ttl: int = DRAFT_TTL,
+            state_ttl: int = FSM_STATE_TTL
+    ):
+        self.storage = storage
+        self.durability = durability
+        self.checkpoints = set(checkpoints)
+        self.state_ttl = state_ttl
+        # Faqat o'qilgan draftlar (update oxirida yoki cache_ttl dan keyin tashlanadi)
+        self._drafts = TTLCache(maxsize=10000, ttl=cache_ttl)
+        # Yozilmagan o'zgarishlar: kalit -> (draft, o'zgargan vaqt)
+        self._pending: Dict[StorageKey, Tuple[Record, float]] = {}
+        self._last_sweep = time.monotonic()
+
+    async def _draft(self, key: StorageKey) -> Record:
+        pending = self._pending.get(key)
+        if pending is not None:
+            record, changed_at = pending
+            if time.monotonic() - changed_at <= self.state_ttl:
+                return record
+            del self._pending[key]
+
+        record = self._drafts.get(key)
+        if record is TTLCache.MISSING:
+            record = (await self.storage.get_state(key), await self.storage.get_data(key))
+            self._drafts.set(key, record)
+        return record
+
+    async def _change(self, key: StorageKey, record: Record):
+        self._pending[key] = (record, time.monotonic())
+        self._drafts.delete(key)
+
+    def _sweep(self):
+        """Tashlab ketilgan (state_ttl dan ko'p yozilmagan) o'zgarishlarni o'chirish"""
+        now = time.monotonic()
+        if now - self._last_sweep < self.SWEEP_INTERVAL:
+            return
+        self._last_sweep = now
+
+        for key, (_, changed_at) in list(self._pending.items()):
+            if now - changed_at > self.state_ttl:
+                del self._pending[key]
+
+    async def commit(self, key: StorageKey):
+        """Draftni asosiy xotiraga yozish"""
+        pending = self._pending.pop(key, None)
+        if pending is None:
+            return
+
+        (state, data), _ = pending
+        if hasattr(self.storage, 'set_record'):
+            await self.storage.set_record(key, state, data)
+        else:
+            await self.storage.set_state(key, state)
+            await self.storage.set_data(key, data)
+
+    async def end_update(self, key: StorageKey):
+        """Update qayta ishlandi - durability bo'yicha yozish va draftni tashlash"""
+        self._drafts.delete(key)
+        self._sweep()
+
+        pending = self._pending.get(key)
+        if pending is None:
+            return
+
+        (state, _), _ = pending
+        if self.durability == 'step' or state is None or state in self.checkpoints:
+            await self.commit(key)
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        if self.durability == 'always':
+            return await self.storage.set_state(key, state)
+
+        _, data = await self._draft(key)
+        await self._change(key, (state.state if isinstance(state, State) else state, data))
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        if self.durability == 'always':
+            return await self.storage.get_state(key)
+
+        state, _ = await self._draft(key)
+        return state
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        if self.durability == 'always':
+            return await self.storage.set_data(key, data)
+
+        state, _ = await self._draft(key)
+        await self._change(key, (state, dict(data)))
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        if self.durability == 'always':
+            return await self.storage.get_data(key)
+
+        _, data = await self._draft(key)
+        return dict(data)
+
+    async def close(self) -> None:
+        for key in list(self._pending):
+            await self.commit(key)
+        await self.storage.close()
@@ -0,0 +1,192 @@
+# bot/utils/fsm_storage.py
+import asyncio
+import json
+import time
+import zlib
+from datetime import timedelta
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, DefaultKeyBuilder, KeyBuilder, StateType, StorageKey
+
+from bot.django_setup import setup_django
+
+setup_django()
+
+from django.utils import timezone
+
+from webapp.admin_panel.models import FSMState
+from bot.config import FSM_STATE_TTL, FSM_FLUSH_INTERVAL, FSM_COMPRESS_MIN
+from bot.utils.cache import TTLCache
+
+Record = Tuple[Optional[str], Dict[str, Any]]
+
+
+def dump_data(data: Mapping[str, Any]) -> bytes:
+    """FSM ma'lumotlarini ixcham saqlash: JSON, katta bo'lsa zlib bilan siqilgan"""
+    if not data:
+        return b''
+
+    raw = json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=str).encode()
+    if len(raw) >= FSM_COMPRESS_MIN:
+        return b'z' + zlib.compress(raw)
+    return b'j' + raw
+
+
+def load_data(payload: bytes) -> Dict[str, Any]:
+    """dump_data ga teskari"""
+    payload = bytes(payload)
+    if not payload:
+        return {}
+
+    if payload[:1] == b'z':
+        return json.loads(zlib.decompress(payload[1:]))
+    return json.loads(payload[1:])
+
+
+class DatabaseStorage(BaseStorage):
+    """
+    FSM holatlarini PostgreSQL da (FSMState) saqlash
+
+    O'zgarishlar xotirada to'planadi va flush_interval da bir marta
+    bitta upsert bilan yoziladi (0 - har bir o'zgarish darhol yoziladi).
+    ttl dan ko'p o'zgarmagan (tashlab ketilgan) holatlar bo'sh hisoblanadi
+    va vaqti-vaqti bilan o'chiriladi.
+
+    cache_ttl > 0 bo'lsa o'qishlar shu vaqt davomida keshdan olinadi - bu
+    faqat chat doim bitta jarayonda qayta ishlanganda (UPDATE_WORKERS) to'g'ri.
+    Standart 0: bo'linmagan replikalar bir-birining holatini eskirgan o'qimaydi.
+    """
+
+    PURGE_INTERVAL = 60 * 60  # soniya
+    RETRY_DELAY = 5  # yozishda xatolik bo'lsa qayta urinish (soniya)
+
+    def __init__(
+            self,
+            ttl: int = FSM_STATE_TTL,
+            flush_interval: float = FSM_FLUSH_INTERVAL,
+            cache_ttl: int = 0,
+            key_builder: Optional[KeyBuilder] = None
+    ):
+        self.ttl = ttl
+        self.flush_interval = flush_interval
+        self.key_builder = key_builder or DefaultKeyBuilder(with_bot_id=True, with_destiny=True)
+        self.cache_ttl = cache_ttl
+        self._cache = TTLCache(maxsize=10000, ttl=cache_ttl)
+        self._dirty: Dict[str, Record] = {}
+        self._flusher: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self._last_purge = 0.0
+
+    async def _load(self, key: str) -> Record:
+        record = self._dirty.get(key)
+        if record is not None:
+            return record
+
+        if self.cache_ttl:
+            record = self._cache.get(key)
+            if record is not TTLCache.MISSING:
+                return record
+
+        row = await FSMState.objects.filter(
+            key=key,
+            updated_at__gte=timezone.now() - timedelta(seconds=self.ttl)
+        ).values_list('state', 'data').afirst()
+
+        record = (row[0], load_data(row[1])) if row else (None, {})
+        if self.cache_ttl:
+            self._cache.set(key, record)
+        return record
+
+    async def _save(self, key: str, record: Record):
+        if self.cache_ttl:
+            self._cache.set(key, record)
+        self._dirty[key] = record
+
+        if self.flush_interval <= 0:
+            await self.flush()
+        else:
+            self._schedule_flush(self.flush_interval)
+
+    def _schedule_flush(self, delay: float):
+        """Kechiktirilgan flush (bittadan ortiq rejalashtirilmaydi)"""
+        if self._flusher is None or self._flusher.done() or self._flusher is asyncio.current_task():
+            self._flusher = asyncio.create_task(self._flush_later(delay))
+
+    async def _flush_later(self, delay: float):
+        await asyncio.sleep(delay)
+        await self.flush()
+
+    async def flush(self):
+        """To'plangan o'zgarishlarni bazaga yozish (bitta upsert + bitta delete)"""
+        async with self._flush_lock:
+            if not self._dirty:
+                return
+
+            dirty, self._dirty = self._dirty, {}
+            now = timezone.now()
+
+            upserts = [
+                FSMState(key=key, state=state, data=dump_data(data), updated_at=now)
+                for key, (state, data) in dirty.items()
+                if state is not None or data
+            ]
+            deletes = [key for key, (state, data) in dirty.items() if state is None and not data]
+
+            try:
+                if upserts:
+                    await FSMState.objects.abulk_create(
+                        upserts,
+                        update_conflicts=True,
+                        unique_fields=['key'],
+                        update_fields=['state', 'data', 'updated_at']
+                    )
+                if deletes:
+                    await FSMState.objects.filter(key__in=deletes).adelete()
+            except Exception as e:
+                print(f"FSM holatlarini saqlashda xatolik: {e}")
+                # Qayta urinish (yangi o'zgarishlar ustun) - yangi yozuvlar kelmasa ham
+                self._dirty = {**dirty, **self._dirty}
+                self._schedule_flush(max(self.flush_interval, self.RETRY_DELAY))
+                return
+
+            if time.monotonic() - self._last_purge > self.PURGE_INTERVAL:
+                self._last_purge = time.monotonic()
+                await self.purge()
+
+    async def purge(self) -> int:
+        """Muddati o'tgan (tashlab ketilgan) holatlarni o'chirish"""
+        deleted, _ = await FSMState.objects.filter(
+            updated_at__lt=timezone.now() - timedelta(seconds=self.ttl)
+        ).adelete()
+        return deleted
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        storage_key = self.key_builder.build(key)
+        _, data = await self._load(storage_key)
+        await self._save(storage_key, (state.state if isinstance(state, State) else state, data))
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        state, _ = await self._load(self.key_builder.build(key))
+        return state
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        storage_key = self.key_builder.build(key)
+        state, _ = await self._load(storage_key)
+        await self._save(storage_key, (state, dict(data)))
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        _, data = await self._load(self.key_builder.build(key))
+        return dict(data)
+
+    async def set_record(self, key: StorageKey, state: StateType, data: Mapping[str, Any]) -> None:
+        """Holat va ma'lumotlarni bitta yozuvda saqlash"""
+        await self._save(self.key_builder.build(key), (state.state if isinstance(state, State) else state, dict(data)))
+
+    async def close(self) -> None:
+        if self._flusher and not self._flusher.done():
+            self._flusher.cancel()
+        await self.flush()
+        # To'xtashda yozilmagan bo'lsa qayta urinish rejalashtirilmaydi
+        if self._flusher and not self._flusher.done():
+            self._flusher.cancel()
@@ -0,0 +1,170 @@
+# bot/utils/pagination.py
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from django.db.models import Model, Q, QuerySet
+
+from bot.config import LIST_PAGE_SIZE, MESSAGE_MAX_LENGTH
+
+
+@dataclass
+class KeysetPage:
+    """Ro'yxatning bitta sahifasi"""
+    text: str
+    number: int = 1
+    first_id: Optional[int] = None
+    last_id: Optional[int] = None
+    first_position: int = 1  # birinchi yozuvning tartib raqami
+    last_position: int = 0
+    has_prev: bool = False
+    has_next: bool = False
+
+
+def parse_page_callback(data: str) -> Tuple[int, str, Optional[int], Optional[int]]:
+    """
+    "<prefix>_page_<sahifa>_<next|prev>_<id>[_<tartib raqami>]" callback ni ajratish
+
+    Returns: (sahifa, yo'nalish, kursor id, kursor yozuvining tartib raqami) -
+    kursorsiz birinchi sahifa; tartib raqamisiz (eski xabarlar) - None
+    """
+    parts = data.rsplit('_', 4)
+    if len(parts) == 5 and parts[2] in ('next', 'prev'):
+        return int(parts[1]), parts[2], int(parts[3]), int(parts[4])
+
+    parts = data.rsplit('_', 3)
+    if len(parts) == 4 and parts[2] in ('next', 'prev'):
+        return int(parts[1]), parts[2], int(parts[3]), None
+    return 1, 'next', None, None
+
+
+class KeysetPaginator:
+    """
+    Keyset (seek) sahifalash
+
+    OFFSET o'rniga oldingi sahifaning chegaradagi yozuvidan keyingilari
+    `ordering` bo'yicha WHERE orqali olinadi - 100-sahifa ham birinchisi
+    kabi indeks bo'yicha o'qiladi. Callback data 64 bayt bilan cheklangani
+    uchun kursor sifatida chegaradagi yozuv id si uzatiladi, saralash
+    qiymatlari esa shu id bo'yicha qayta o'qiladi (ordering oxiri - 'id').
+    Sahifa matni MESSAGE_MAX_LENGTH dan oshsa yozuvlar keyingi sahifaga o'tadi.
+    """
+
+    def __init__(
+            self,
+            queryset: QuerySet,
+            ordering: Sequence[str],
+            render: Callable[[int, Model], str],
+            header: str,
+            empty_text: str,
+            page_size: int = LIST_PAGE_SIZE,
+            limit: int = MESSAGE_MAX_LENGTH
+    ):
+        self.queryset = queryset
+        self.ordering = list(ordering)
+        self.fields = [field.lstrip('-') for field in self.ordering]
+        self.render = render
+        self.header = header
+        self.empty_text = empty_text
+        self.page_size = page_size
+        self.limit = limit
+
+    def _seek(self, values: Sequence[Any], reverse: bool) -> Q:
+        """(a, b, id) > (x, y, z) shartini ustunlar bo'yicha yoyish"""
+        condition = Q()
+        for index, field in enumerate(self.ordering):
+            descending = field.startswith('-') != reverse
+            step = Q(**{f"{self.fields[index]}__{'lt' if descending else 'gt'}": values[index]})
+            for prev_index in range(index):
+                step &= Q(**{self.fields[prev_index]: values[prev_index]})
+            condition |= step
+
+        # Birinchi ustun bo'yicha oraliq - indeksni shu qiymatdan boshlab o'qish uchun
+        descending = self.ordering[0].startswith('-') != reverse
+        first = Q(**{f"{self.fields[0]}__{'lte' if descending else 'gte'}": values[0]})
+        return first & condition
+
+    def window(self, values: Optional[Sequence[Any]] = None, reverse: bool = False) -> QuerySet:
+        """
+        Sahifa so'rovi: kursordan keyingi (reverse - oldingi) page_size + 1 ta yozuv
+
+        values - kursor yozuvining saralash qiymatlari (None - ro'yxat boshi).
+        """
+        queryset = self.queryset
+        if values is not None:
+            queryset = queryset.filter(self._seek(values, reverse))
+
+        ordering = self.ordering
+        if reverse:
+            ordering = [field[1:] if field.startswith('-') else f"-{field}" for field in ordering]
+
+        return queryset.order_by(*ordering)[:self.page_size + 1]
+
+    async def page(
+            self,
+            number: int = 1,
+            direction: str = 'next',
+            cursor: Optional[int] = None,
+            position: Optional[int] = None
+    ) -> KeysetPage:
+        """
+        Sahifani olish
+
+        direction='next' - kursordan keyingi yozuvlar, 'prev' - oldingilari.
+        position - kursor yozuvining tartib raqami (sahifalar xabar uzunligi
+        tufayli qisqargan bo'lsa ham raqamlar ketma-ket davom etadi);
+        berilmasa raqamlar number va page_size dan hisoblanadi.
+        """
+        reverse = direction == 'prev'
+        values = None
+
+        if cursor is not None:
+            values = await self.queryset.filter(pk=cursor).values_list(*self.fields).afirst()
+            if values is None:
+                # Chegaradagi yozuv o'chirilgan - boshidan ko'rsatamiz
+                number, reverse, cursor, position = 1, False, None, None
+
+        items = [item async for item in self.window(values, reverse)]
+        more = len(items) > self.page_size
+        items = items[:self.page_size]
+        if reverse and not more:
+            number = 1
+
+        # Sahifani xabar uzunligiga sig'diramiz (kursorga yaqin yozuvlar qoladi)
+        size = len(self.header)
+        widest = (position or number * self.page_size) + self.page_size
+        fitted: List[Model] = []
+        for item in items:
+            block = self.render(widest, item)
+            if fitted and size + len(block) > self.limit:
+                more = True
+                break
+            fitted.append(item)
+            size += len(block)
+
+        if reverse:
+            fitted.reverse()
+
+        if position is None:
+            first_position = (number - 1) * self.page_size + 1
+        elif reverse:
+            first_position = position - len(fitted)
+        else:
+            first_position = position + 1
+        if cursor is None or (reverse and not more):
+            first_position = 1
+
+        if not fitted:
+            return KeysetPage(text=self.header + self.empty_text, number=number)
+
+        return KeysetPage(
+            text=self.header + ''.join(
+                self.render(index, item) for index, item in enumerate(fitted, start=first_position)
+            ),
+            number=number,
+            first_id=fitted[0].pk,
+            last_id=fitted[-1].pk,
+            first_position=first_position,
+            last_position=first_position + len(fitted) - 1,
+            has_prev=more if reverse else cursor is not None,
+            has_next=True if reverse else more
+        )
@@ -0,0 +1,131 @@
+# bot/webhook.py
+import asyncio
+import logging
+import signal
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from aiohttp import web
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+
+from bot.config import (
+    WEBHOOK_URL, WEBHOOK_PATH, WEBHOOK_SECRET, WEBHOOK_HOST, WEBHOOK_PORT,
+    WEBHOOK_QUEUE_SIZE, WEBHOOK_WORKERS, WEBHOOK_DRAIN_TIMEOUT
+)
+
+logger = logging.getLogger(__name__)
+
+FeedUpdate = Callable[[Bot, Dict[str, Any]], Awaitable[None]]
+
+
+class QueuedRequestHandler(SimpleRequestHandler):
+    """
+    Webhook handler - update lar cheklangan navbat orqali qayta ishlanadi
+
+    Telegram ga darhol javob qaytariladi, update ni `workers` ta
+    qayta ishlovchi navbatdan oladi. Navbat to'la bo'lsa 429 qaytariladi
+    (Telegram keyinroq qayta yuboradi). To'xtashda yangi update lar
+    qabul qilinmaydi va navbatdagilar drain_timeout gacha kutiladi.
+    """
+
+    def __init__(
+            self,
+            dispatcher: Dispatcher,
+            bot: Bot,
+            queue_size: int = WEBHOOK_QUEUE_SIZE,
+            workers: int = WEBHOOK_WORKERS,
+            drain_timeout: float = WEBHOOK_DRAIN_TIMEOUT,
+            feed: Optional[FeedUpdate] = None,
+            **kwargs
+    ):
+        super().__init__(dispatcher, bot, handle_in_background=True, **kwargs)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.workers = workers
+        self.drain_timeout = drain_timeout
+        self.feed = feed or self._background_feed_update
+        self._worker_tasks: List[asyncio.Task] = []
+        self._accepting = False
+
+    async def start(self):
+        """Qayta ishlovchilarni ishga tushirish"""
+        self._worker_tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._accepting = True
+
+    async def _handle_request_background(self, bot: Bot, request: web.Request) -> web.Response:
+        if not self._accepting:
+            return web.Response(status=503)
+
+        update = await request.json(loads=bot.session.json_loads)
+        try:
+            self.queue.put_nowait(update)
+        except asyncio.QueueFull:
+            return web.Response(status=429)
+
+        return web.json_response({}, dumps=bot.session.json_dumps)
+
+    async def _worker(self):
+        while True:
+            update = await self.queue.get()
+            try:
+                await self.feed(self.bot, update)
+            except Exception:
+                logger.exception("Update ni qayta ishlashda xatolik")
+            finally:
+                self.queue.task_done()
+
+    async def close(self):
+        """Navbatni bo'shatib, qayta ishlovchilarni to'xtatish"""
+        self._accepting = False
+
+        try:
+            await asyncio.wait_for(self.queue.join(), timeout=self.drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Webhook navbatida %s ta update qayta ishlanmay qoldi", self.queue.qsize())
+
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+
+        await super().close()
+
+
+async def run_webhook(bot: Bot, dp: Dispatcher, feed: Optional[FeedUpdate] = None):
+    """
+    Webhook serverini ishga tushirish (SIGINT/SIGTERM gacha)
+
+    feed: update ni qayta ishlash funksiyasi (standart - dp.feed_raw_update)
+    """
+    app = web.Application()
+    handler = QueuedRequestHandler(dp, bot, feed=feed, secret_token=WEBHOOK_SECRET or None)
+    handler.register(app, path=WEBHOOK_PATH)
+    setup_application(app, dp, bot=bot)
+
+    async def on_startup(app: web.Application):
+        await handler.start()
+        if WEBHOOK_URL:
+            await bot.set_webhook(
+                url=WEBHOOK_URL.rstrip('/') + WEBHOOK_PATH,
+                secret_token=WEBHOOK_SECRET or None,
+                allowed_updates=dp.resolve_used_update_types()
+            )
+
+    app.on_startup.append(on_startup)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:
+            pass
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, WEBHOOK_HOST, WEBHOOK_PORT).start()
+    logger.info("Webhook server: %s:%s%s", WEBHOOK_HOST, WEBHOOK_PORT, WEBHOOK_PATH)
+
+    try:
+        await stop.wait()
+    finally:
+        logger.info("Webhook server to'xtatilmoqda...")
+        await runner.cleanup()
@@ -0,0 +1,231 @@
+# bot/workers.py
+"""
+Update larni bir nechta jarayonda qayta ishlash
+
+Qabul qiluvchi (polling yoki webhook) update larni chat.id bo'yicha
+jarayonlarga taqsimlaydi: bitta chatning update lari doim bitta
+jarayonga va uning ichida bitta navbatga tushadi, shuning uchun FSM
+qadamlari tartibi saqlanadi. Holatlar jarayonlar orasida umumiy
+bo'lishi uchun FSM_STORAGE umumiy xotira bo'lishi kerak.
+"""
+import asyncio
+import logging
+import multiprocessing
+import queue as queue_module
+import signal
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from aiogram import Bot
+from aiogram.client.default import DefaultBotProperties
+from aiogram.enums import ParseMode
+from aiogram.exceptions import TelegramAPIError, TelegramRetryAfter
+
+from bot.config import BOT_TOKEN, UPDATE_WORKERS, WORKER_CONCURRENCY, WORKER_QUEUE_SIZE, FSM_STORAGE
+
+logger = logging.getLogger(__name__)
+
+STOP = None
+
+# get_updates xatoliklaridan keyin kutish (soniya)
+POLL_BACKOFF_MIN = 1
+POLL_BACKOFF_MAX = 30
+
+
+def shard_key(update: Dict) -> int:
+    """Update qaysi chatga tegishli (chat bo'lmasa - foydalanuvchi yoki update_id)"""
+    for field, value in update.items():
+        if not isinstance(value, dict):
+            continue
+
+        chat = value.get('chat') or (value.get('message') or {}).get('chat')
+        if chat:
+            return chat['id']
+
+        from_user = value.get('from') or value.get('user')
+        if from_user:
+            return from_user['id']
+
+    return update.get('update_id', 0)
+
+
+class WorkerPool:
+    """Update larni chat.id bo'yicha jarayonlarga taqsimlovchi pul"""
+
+    def __init__(
+            self,
+            workers: int = UPDATE_WORKERS,
+            concurrency: int = WORKER_CONCURRENCY,
+            queue_size: int = WORKER_QUEUE_SIZE,
+            dry_run: bool = False
+    ):
+        context = multiprocessing.get_context('spawn')
+        self.results = context.Queue()
+        self.queues = [context.Queue(maxsize=queue_size) for _ in range(workers)]
+        self.processes = [
+            context.Process(
+                target=worker_main,
+                args=(index, workers, queue, self.results, concurrency, dry_run),
+                name=f'bot-worker-{index}'
+            )
+            for index, queue in enumerate(self.queues)
+        ]
+
+        if FSM_STORAGE == 'memory':
+            logger.warning("FSM_STORAGE=memory: holatlar faqat o'z jarayonida saqlanadi")
+
+    def start(self):
+        """Jarayonlarni ishga tushirish"""
+        for process in self.processes:
+            process.start()
+
+    async def feed(self, bot: Bot, update: Dict):
+        """
+        Update ni tegishli jarayon navbatiga qo'yish
+
+        Navbat to'la bo'lsa qabul qiluvchi to'xtab turadi (backpressure) - kutish
+        alohida oqimda, event loop (webhook, scheduler) ishlashda davom etadi;
+        await gacha qo'yilgani uchun update lar tartibi buzilmaydi.
+        """
+        index = shard_key(update) % len(self.queues)
+        queue = self.queues[index]
+        try:
+            queue.put_nowait(update)
+            return
+        except queue_module.Full:
+            pass
+
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await loop.run_in_executor(None, queue.put, update, True, 1)
+                return
+            except queue_module.Full:
+                if not self.processes[index].is_alive():
+                    raise RuntimeError(f"{self.processes[index].name} ishlamayapti")
+
+    async def stop(self, timeout: float = 30) -> List[Dict]:
+        """Navbatlarni bo'shatib, jarayonlarni to'xtatish; har bir jarayon statistikasini qaytaradi"""
+        for queue in self.queues:
+            queue.put(STOP)
+
+        loop = asyncio.get_running_loop()
+        for process in self.processes:
+            await loop.run_in_executor(None, process.join, timeout)
+            if process.is_alive():
+                logger.warning("%s to'xtamadi, majburan yakunlanmoqda", process.name)
+                process.terminate()
+
+        stats = []
+        for _ in self.processes:
+            try:
+                stats.append(self.results.get(timeout=1))
+            except queue_module.Empty:
+                break
+        return sorted(stats, key=lambda item: item['worker'])
+
+
+def worker_main(index: int, workers: int, queue, results, concurrency: int, dry_run: bool):
+    """Jarayon kirish nuqtasi (to'xtatish faqat qabul qiluvchi orqali)"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_run_worker(index, workers, queue, results, concurrency, dry_run))
+
+
+async def _run_worker(index: int, workers: int, queue, results, concurrency: int, dry_run: bool):
+    from bot.dispatcher import create_dispatcher
+
+    token, session = BOT_TOKEN, None
+    if dry_run:
+        from bot.benchmarks.session import DryRunSession
+
+        token, session = '1:DRYRUN', DryRunSession()
+
+    bot = Bot(token=token, session=session, default=DefaultBotProperties(parse_mode=ParseMode.HTML))
+    dp = create_dispatcher()
+    loop = asyncio.get_running_loop()
+
+    stats = {'worker': index, 'processed': 0, 'failed': 0, 'out_of_order': 0, 'duration': 0.0}
+    last_update: Dict[int, int] = {}
+    lanes = [asyncio.Queue(maxsize=WORKER_QUEUE_SIZE) for _ in range(concurrency)]
+
+    async def consume(lane: asyncio.Queue):
+        # Bitta navbat update larni ketma-ket qayta ishlaydi
+        while True:
+            update = await lane.get()
+            if update is STOP:
+                return
+
+            chat_id = shard_key(update)
+            if update['update_id'] < last_update.get(chat_id, 0):
+                stats['out_of_order'] += 1
+            last_update[chat_id] = update['update_id']
+
+            try:
+                await dp.feed_raw_update(bot, update)
+                stats['processed'] += 1
+            except Exception:
+                logger.exception("Worker %s: update ni qayta ishlashda xatolik", index)
+                stats['failed'] += 1
+
+    consumers = [asyncio.create_task(consume(lane)) for lane in lanes]
+    started = None
+
+    while True:
+        update = await loop.run_in_executor(None, queue.get)
+        if update is STOP:
+            break
+        if started is None:
+            started = time.perf_counter()
+        # Jarayonlar orasidagi taqsimotga bog'liq bo'lmasligi uchun // workers
+        await lanes[(shard_key(update) // workers) % concurrency].put(update)
+
+    for lane in lanes:
+        await lane.put(STOP)
+    await asyncio.gather(*consumers)
+
+    stats['duration'] = time.perf_counter() - started if started else 0.0
+    results.put(stats)
+
+    await dp.emit_shutdown(bot=bot)
+    await bot.session.close()
+
+
+async def poll_updates(
+        bot: Bot,
+        feed: Callable[[Bot, Dict], Awaitable[Any]],
+        allowed_updates: Optional[List[str]] = None,
+        timeout: int = 30
+):
+    """
+    Long polling orqali update larni olib, feed ga uzatish
+
+    Telegram xatoliklarida (tarmoq, server, flood) kutish vaqti har safar
+    ikki barobar oshadi (POLL_BACKOFF_MAX gacha), muvaffaqiyatli so'rovdan keyin qaytadan boshlanadi.
+    """
+    offset = None
+    delay = POLL_BACKOFF_MIN
+
+    while True:
+        try:
+            updates = await bot.get_updates(
+                offset=offset,
+                timeout=timeout,
+                allowed_updates=allowed_updates,
+                request_timeout=timeout + 10
+            )
+        except TelegramRetryAfter as e:
+            logger.warning("Update larni olish: %s s kutish (flood control)", e.retry_after)
+            await asyncio.sleep(e.retry_after)
+            continue
+        except TelegramAPIError as e:
+            logger.warning("Update larni olishda xatolik: %s (%.0f s dan keyin qayta urinish)", e, delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, POLL_BACKOFF_MAX)
+            continue
+
+        delay = POLL_BACKOFF_MIN
+
+        for update in updates:
+            await feed(bot, update.model_dump(mode='json', by_alias=True, exclude_none=True))
+            offset = update.update_id + 1
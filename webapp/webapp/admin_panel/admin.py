@@ -4,14 +4,28 @@ from django.contrib import admin
 # webapp/admin_panel/admin.py
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from .models import (
     User, Student, Group, PaymentSchedule, Receipt,
-    PaymentReminder, AnonymousMessage, AccountingStaff, ReminderTemplate
+    PaymentReminder, AnonymousMessage, AccountingStaff, ReminderTemplate,
+    ReminderRun, ReviewBatch
 )
+from .pagination import EstimatedCountPaginator
+
+
+class BigTableAdminMixin:
+    """
+    Ro'yxatlar (barcha ModelAdmin lar): filtrlanganda jadvaldagi jami son (qo'shimcha COUNT)
+    hisoblanmaydi, katta jadvalning filtrsiz ro'yxati soni esa taxminiy
+    (qarang: pagination.EstimatedCountPaginator)
+    """
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
 
 
 @admin.register(User)
-class UserAdmin(BaseUserAdmin):
+class UserAdmin(BigTableAdminMixin, BaseUserAdmin):
     list_display = ['username', 'telegram_id', 'role', 'is_active', 'created_at']
     list_filter = ['role', 'is_active']
     search_fields = ['username', 'telegram_id', 'phone']
@@ -21,12 +35,19 @@ class UserAdmin(BaseUserAdmin):
 
 
 @admin.register(Student)
-class StudentAdmin(admin.ModelAdmin):
+class StudentAdmin(BigTableAdminMixin, admin.ModelAdmin):
     list_display = ['student_id', 'full_name', 'group', 'phone', 'is_active']
+    list_select_related = ['group']
     list_filter = ['group', 'is_active', 'created_at']
     search_fields = ['student_id', 'first_name', 'last_name', 'jshshir', 'passport_number']
     list_per_page = 50
 
+    def get_search_results(self, request, queryset, search_term):
+        """Indekslangan qidiruv (Student.objects.search) - to'rtta icontains o'rniga"""
+        if not search_term:
+            return queryset, False
+        return queryset.search(search_term), False
+
     fieldsets = (
         ('Asosiy ma\'lumotlar', {
             'fields': ('user', 'student_id', 'group', 'is_active')
@@ -44,19 +65,30 @@ class StudentAdmin(admin.ModelAdmin):
 
 
 @admin.register(Group)
-class GroupAdmin(admin.ModelAdmin):
+class GroupAdmin(BigTableAdminMixin, admin.ModelAdmin):
     list_display = ['name', 'chat_title', 'telegram_chat_id', 'is_active', 'student_count']
     list_filter = ['is_active', 'created_at']
     search_fields = ['name', 'chat_title']
 
+    def get_queryset(self, request):
+        # Talabalar soni har bir qator uchun alohida so'rov emas, bog'langan subquery bilan
+        # (GROUP BY emas - sahifalash uchun COUNT(*) annotatsiyasiz hisoblanadi)
+        student_count = Student.objects.filter(group=OuterRef('pk')).order_by().values('group').annotate(
+            c=Count('id')
+        ).values('c')
+        return super().get_queryset(request).annotate(
+            _student_count=Coalesce(Subquery(student_count), 0)
+        )
+
     def student_count(self, obj):
-        return obj.students.count()
+        return obj._student_count
 
     student_count.short_description = 'Talabalar soni'
+    student_count.admin_order_field = '_student_count'
 
 
 @admin.register(PaymentSchedule)
-class PaymentScheduleAdmin(admin.ModelAdmin):
+class PaymentScheduleAdmin(BigTableAdminMixin, admin.ModelAdmin):
     list_display = ['academic_year', 'stage', 'due_date', 'amount', 'is_active']
     list_filter = ['academic_year', 'stage', 'is_active']
     search_fields = ['academic_year']
@@ -64,11 +96,12 @@ class PaymentScheduleAdmin(admin.ModelAdmin):
 
 
 @admin.register(Receipt)
-class ReceiptAdmin(admin.ModelAdmin):
+class ReceiptAdmin(BigTableAdminMixin, admin.ModelAdmin):
     list_display = ['student', 'payment_schedule', 'status', 'submitted_at', 'reviewed_by']
+    list_select_related = ['student', 'payment_schedule', 'reviewed_by']
     list_filter = ['status', 'submitted_at', 'payment_schedule__stage']
     search_fields = ['student__student_id', 'student__first_name', 'student__last_name']
-    readonly_fields = ['submitted_at', 'reviewed_at']
+    readonly_fields = ['submitted_at', 'reviewed_at', 'review_batch']
 
     fieldsets = (
         ('Asosiy ma\'lumotlar', {
@@ -78,7 +111,7 @@ class ReceiptAdmin(admin.ModelAdmin):
             'fields': ('file_id', 'file_path')
         }),
         ('Ko\'rib chiqish', {
-            'fields': ('reviewed_by', 'reviewed_at', 'notes')
+            'fields': ('reviewed_by', 'reviewed_at', 'review_batch', 'notes')
         }),
         ('Vaqt', {
             'fields': ('submitted_at',)
@@ -86,17 +119,44 @@ class ReceiptAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(ReviewBatch)
+class ReviewBatchAdmin(BigTableAdminMixin, admin.ModelAdmin):
+    list_display = ['created_at', 'status', 'reviewed_by', 'stage', 'group', 'total', 'notified', 'failed',
+                    'notified_at']
+    list_select_related = ['reviewed_by', 'group']
+    list_filter = ['status', 'created_at']
+    readonly_fields = ['status', 'reviewed_by', 'stage', 'group', 'date_from', 'date_to', 'total', 'notified',
+                       'failed', 'created_at', 'notify_started_at', 'notified_at']
+
+
 @admin.register(PaymentReminder)
-class PaymentReminderAdmin(admin.ModelAdmin):
+class PaymentReminderAdmin(BigTableAdminMixin, admin.ModelAdmin):
     list_display = ['student', 'payment_schedule', 'days_before', 'is_sent', 'sent_at']
+    list_select_related = ['student', 'payment_schedule']
     list_filter = ['is_sent', 'days_before', 'payment_schedule']
     search_fields = ['student__student_id', 'student__first_name']
     readonly_fields = ['sent_at']
 
 
+@admin.register(ReminderRun)
+class ReminderRunAdmin(BigTableAdminMixin, admin.ModelAdmin):
+    list_display = ['run_date', 'started_at', 'finished_at', 'duration', 'sent', 'failed', 'group_messages',
+                    'is_failed']
+    list_filter = [('error', admin.EmptyFieldListFilter)]
+    readonly_fields = ['run_date', 'started_at', 'finished_at', 'duration', 'total', 'sent', 'failed',
+                       'group_messages', 'error']
+
+    def is_failed(self, obj):
+        return bool(obj.error)
+
+    is_failed.short_description = 'Muvaffaqiyatsiz'
+    is_failed.boolean = True
+
+
 @admin.register(AnonymousMessage)
-class AnonymousMessageAdmin(admin.ModelAdmin):
+class AnonymousMessageAdmin(BigTableAdminMixin, admin.ModelAdmin):
     list_display = ['sender_telegram_id', 'is_replied', 'created_at', 'replied_by']
+    list_select_related = ['replied_by']
     list_filter = ['is_replied', 'created_at']
     search_fields = ['message_text', 'reply_text']
     readonly_fields = ['created_at', 'replied_at']
@@ -115,14 +175,14 @@ class AnonymousMessageAdmin(admin.ModelAdmin):
 
 
 @admin.register(AccountingStaff)
-class AccountingStaffAdmin(admin.ModelAdmin):
+class AccountingStaffAdmin(BigTableAdminMixin, admin.ModelAdmin):
     list_display = ['full_name', 'position', 'working_hours', 'is_active']
     list_filter = ['is_active', 'position']
     search_fields = ['full_name', 'position']
 
 
 @admin.register(ReminderTemplate)
-class ReminderTemplateAdmin(admin.ModelAdmin):
+class ReminderTemplateAdmin(BigTableAdminMixin, admin.ModelAdmin):
     list_display = ['days_before', 'is_active']
     list_filter = ['is_active', 'days_before']
     ordering = ['-days_before']
\ No newline at end of file
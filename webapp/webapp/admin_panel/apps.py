@@ -4,4 +4,8 @@ from django.apps import AppConfig
 class AdminPanelConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'admin_panel'
-    verbose_name = 'Admin Panel'
\ No newline at end of file
+    verbose_name = 'Admin Panel'
+
+    def ready(self):
+        # Dashboard va bot foydalanuvchilari keshini tozalovchi signallarni ulash
+        from . import dashboard, identity  # noqa: F401
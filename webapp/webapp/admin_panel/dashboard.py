@@ -0,0 +1,80 @@
+# webapp/admin_panel/dashboard.py
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.db.models.signals import post_save, post_delete
+
+from .models import Student, Group, PaymentSchedule, Receipt
+
+DASHBOARD_CACHE_KEY = 'dashboard:data'
+
+
+def build_dashboard() -> dict:
+    """
+    Dashboard ma'lumotlarini bazadan yig'ish
+
+    Cheklar holati bo'yicha sonlar bitta shartli agregat so'rov bilan olinadi.
+    Ro'yxatlar keshga qo'yish uchun list ga aylantiriladi.
+    """
+    today = datetime.now().date()
+
+    data = Receipt.objects.aggregate(
+        pending_receipts=Count('id', filter=Q(status='pending')),
+        approved_receipts=Count('id', filter=Q(status='approved')),
+        rejected_receipts=Count('id', filter=Q(status='rejected')),
+    )
+    data['date'] = today
+    data['total_students'] = Student.objects.filter(is_active=True).count()
+    data['total_groups'] = Group.objects.filter(is_active=True).count()
+
+    # Yaqin kunlardagi to'lovlar
+    data['upcoming_payments'] = list(PaymentSchedule.objects.filter(
+        due_date__gte=today,
+        due_date__lte=today + timedelta(days=30),
+        is_active=True
+    ).order_by('due_date'))
+
+    # Oxirgi cheklar
+    data['recent_receipts'] = list(Receipt.objects.select_related(
+        'student', 'payment_schedule'
+    ).order_by('-submitted_at')[:10])
+
+    return data
+
+
+def warm_dashboard() -> dict:
+    """Dashboard ma'lumotlarini qayta hisoblab keshga yozish"""
+    data = build_dashboard()
+    cache.set(DASHBOARD_CACHE_KEY, data, settings.ADMIN_DASHBOARD_CACHE_TTL)
+    return data
+
+
+def get_dashboard() -> dict:
+    """
+    Dashboard ma'lumotlari (keshdan)
+
+    Kesh Receipt/Student/Group/PaymentSchedule o'zgarganda tozalanadi,
+    kun almashganda esa qayta hisoblanadi (yaqin to'lovlar sanaga bog'liq).
+    """
+    data = cache.get(DASHBOARD_CACHE_KEY)
+    if data is None or data['date'] != datetime.now().date():
+        data = warm_dashboard()
+    return data
+
+
+def invalidate_dashboard(**kwargs):
+    """Dashboard keshini tozalash (signal handler sifatida ham ishlatiladi)"""
+    cache.delete(DASHBOARD_CACHE_KEY)
+
+
+async def ainvalidate_dashboard():
+    """Dashboard keshini tozalash (bot uchun)"""
+    await cache.adelete(DASHBOARD_CACHE_KEY)
+
+
+# queryset.update() signal yubormaydi - bunday joylarda invalidate_dashboard() chaqiriladi
+for model in (Receipt, Student, Group, PaymentSchedule):
+    post_save.connect(invalidate_dashboard, sender=model, dispatch_uid=f'dashboard_cache_save_{model.__name__}')
+    post_delete.connect(invalidate_dashboard, sender=model, dispatch_uid=f'dashboard_cache_delete_{model.__name__}')
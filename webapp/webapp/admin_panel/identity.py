@@ -0,0 +1,32 @@
+# webapp/admin_panel/identity.py
+from django.core.cache import cache
+from django.db.models.signals import post_init, post_save, post_delete
+
+from .models import User
+
+
+def identity_cache_key(telegram_id: int) -> str:
+    """Bot foydalanuvchisi (telegram_id -> User) kesh kaliti"""
+    return f'identity:{telegram_id}'
+
+
+def remember_telegram_id(sender, instance: User, **kwargs):
+    """Yuklangan telegram_id ni eslab qolish (o'zgarsa eski kalit ham tozalanadi)"""
+    instance._loaded_telegram_id = instance.__dict__.get('telegram_id')
+
+
+def invalidate_identity(sender, instance: User, **kwargs):
+    """
+    Foydalanuvchi o'zgarganda (rol, telegram_id va h.k.) bot keshidan o'chirish
+
+    Web panel va bot bitta keshni (CACHE_URL) ishlatsa, o'zgarish botda darhol ko'rinadi.
+    """
+    telegram_ids = {instance.telegram_id, getattr(instance, '_loaded_telegram_id', None)} - {None}
+    if telegram_ids:
+        cache.delete_many([identity_cache_key(telegram_id) for telegram_id in telegram_ids])
+    instance._loaded_telegram_id = instance.telegram_id
+
+
+post_init.connect(remember_telegram_id, sender=User, dispatch_uid='identity_cache_init')
+post_save.connect(invalidate_identity, sender=User, dispatch_uid='identity_cache_save')
+post_delete.connect(invalidate_identity, sender=User, dispatch_uid='identity_cache_delete')
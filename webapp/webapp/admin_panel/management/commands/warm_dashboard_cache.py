@@ -0,0 +1,15 @@
+# webapp/admin_panel/management/commands/warm_dashboard_cache.py
+from django.core.management.base import BaseCommand
+
+from ...dashboard import warm_dashboard
+
+
+class Command(BaseCommand):
+    help = "Dashboard keshini oldindan to'ldirish (deploy dan keyin yoki cron orqali)"
+
+    def handle(self, *args, **options):
+        data = warm_dashboard()
+        self.stdout.write(self.style.SUCCESS(
+            f"Dashboard keshi yangilandi: {data['total_students']} ta talaba, "
+            f"{data['pending_receipts']} ta kutilayotgan chek"
+        ))
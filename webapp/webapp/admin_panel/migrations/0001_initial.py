@@ -0,0 +1,199 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:47
+
+from django.conf import settings
+import django.contrib.auth.models
+import django.contrib.auth.validators
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='User',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('password', models.CharField(max_length=128, verbose_name='password')),
+                ('last_login', models.DateTimeField(blank=True, null=True, verbose_name='last login')),
+                ('is_superuser', models.BooleanField(default=False, help_text='Designates that this user has all permissions without explicitly assigning them.', verbose_name='superuser status')),
+                ('username', models.CharField(error_messages={'unique': 'A user with that username already exists.'}, help_text='Required. 150 characters or fewer. Letters, digits and @/./+/-/_ only.', max_length=150, unique=True, validators=[django.contrib.auth.validators.UnicodeUsernameValidator()], verbose_name='username')),
+                ('first_name', models.CharField(blank=True, max_length=150, verbose_name='first name')),
+                ('last_name', models.CharField(blank=True, max_length=150, verbose_name='last name')),
+                ('email', models.EmailField(blank=True, max_length=254, verbose_name='email address')),
+                ('is_staff', models.BooleanField(default=False, help_text='Designates whether the user can log into this admin site.', verbose_name='staff status')),
+                ('is_active', models.BooleanField(default=True, help_text='Designates whether this user should be treated as active. Unselect this instead of deleting accounts.', verbose_name='active')),
+                ('date_joined', models.DateTimeField(default=django.utils.timezone.now, verbose_name='date joined')),
+                ('telegram_id', models.BigIntegerField(blank=True, null=True, unique=True)),
+                ('role', models.CharField(choices=[('admin', 'Admin'), ('accountant', 'Buxgalter'), ('student', 'Talaba'), ('group_admin', 'Guruh Admin')], default='student', max_length=20)),
+                ('phone', models.CharField(blank=True, max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('groups', models.ManyToManyField(blank=True, help_text='The groups this user belongs to. A user will get all permissions granted to each of their groups.', related_name='user_set', related_query_name='user', to='auth.group', verbose_name='groups')),
+                ('user_permissions', models.ManyToManyField(blank=True, help_text='Specific permissions for this user.', related_name='user_set', related_query_name='user', to='auth.permission', verbose_name='user permissions')),
+            ],
+            options={
+                'verbose_name': 'Foydalanuvchi',
+                'verbose_name_plural': 'Foydalanuvchilar',
+                'db_table': 'users',
+            },
+            managers=[
+                ('objects', django.contrib.auth.models.UserManager()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Group',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='Guruh nomi')),
+                ('telegram_chat_id', models.BigIntegerField(blank=True, null=True, unique=True, verbose_name='Telegram Chat ID')),
+                ('chat_title', models.CharField(blank=True, max_length=255, verbose_name='Chat nomi')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Faol')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Guruh',
+                'verbose_name_plural': 'Guruhlar',
+                'db_table': 'groups',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='PaymentSchedule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('academic_year', models.CharField(max_length=20, verbose_name="O'quv yili")),
+                ('stage', models.CharField(choices=[('1/4', "1-to'lov"), ('2/4', "2-to'lov"), ('3/4', "3-to'lov"), ('4/4', "4-to'lov")], max_length=5, verbose_name='Bosqich')),
+                ('due_date', models.DateField(verbose_name="To'lov sanasi")),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Summa')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Faol')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': "To'lov jadvali",
+                'verbose_name_plural': "To'lov jadvallari",
+                'db_table': 'payment_schedules',
+                'ordering': ['academic_year', 'stage'],
+                'unique_together': {('academic_year', 'stage')},
+            },
+        ),
+        migrations.CreateModel(
+            name='ReminderTemplate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('days_before', models.IntegerField(unique=True, verbose_name='Necha kun oldin')),
+                ('message_text', models.TextField(verbose_name='Xabar matni')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Faol')),
+            ],
+            options={
+                'verbose_name': 'Eslatma shabloni',
+                'verbose_name_plural': 'Eslatma shablonlari',
+                'db_table': 'reminder_templates',
+                'ordering': ['-days_before'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Student',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('student_id', models.CharField(max_length=50, unique=True, verbose_name='Talaba ID')),
+                ('first_name', models.CharField(max_length=100, verbose_name='Ism')),
+                ('last_name', models.CharField(max_length=100, verbose_name='Familiya')),
+                ('patronymic', models.CharField(max_length=100, verbose_name='Otasining ismi')),
+                ('passport_series', models.CharField(max_length=2, verbose_name='Pasport seriyasi')),
+                ('passport_number', models.CharField(max_length=7, verbose_name='Pasport raqami')),
+                ('jshshir', models.CharField(max_length=14, unique=True, verbose_name='JSHSHIR')),
+                ('phone', models.CharField(max_length=20, verbose_name='Telefon')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Faol')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('group', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='students', to='admin_panel.group', verbose_name='Guruh')),
+                ('user', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='student_profile', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Talaba',
+                'verbose_name_plural': 'Talabalar',
+                'db_table': 'students',
+                'ordering': ['last_name', 'first_name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='AnonymousMessage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sender_telegram_id', models.BigIntegerField(verbose_name='Yuboruvchi ID')),
+                ('message_text', models.TextField(verbose_name='Xabar matni')),
+                ('reply_text', models.TextField(blank=True, verbose_name='Javob matni')),
+                ('is_replied', models.BooleanField(default=False, verbose_name='Javob berildi')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Yaratilgan vaqt')),
+                ('replied_at', models.DateTimeField(blank=True, null=True, verbose_name='Javob berilgan vaqt')),
+                ('replied_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='Javob berdi')),
+            ],
+            options={
+                'verbose_name': 'Anonim xabar',
+                'verbose_name_plural': 'Anonim xabarlar',
+                'db_table': 'anonymous_messages',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='AccountingStaff',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('full_name', models.CharField(max_length=200, verbose_name="To'liq ismi")),
+                ('position', models.CharField(max_length=100, verbose_name='Lavozim')),
+                ('working_hours', models.CharField(max_length=100, verbose_name='Ish vaqti')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Faol')),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL, verbose_name='Foydalanuvchi')),
+            ],
+            options={
+                'verbose_name': 'Buxgalter',
+                'verbose_name_plural': 'Buxgalterlar',
+                'db_table': 'accounting_staff',
+            },
+        ),
+        migrations.CreateModel(
+            name='Receipt',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file_id', models.CharField(max_length=255, verbose_name='Fayl ID')),
+                ('file_path', models.CharField(blank=True, max_length=500, verbose_name="Fayl yo'li")),
+                ('status', models.CharField(choices=[('pending', 'Kutilmoqda'), ('approved', 'Tasdiqlangan'), ('rejected', 'Rad etilgan')], default='pending', max_length=20, verbose_name='Holat')),
+                ('submitted_at', models.DateTimeField(auto_now_add=True, verbose_name='Yuborilgan vaqt')),
+                ('reviewed_at', models.DateTimeField(blank=True, null=True, verbose_name="Ko'rilgan vaqt")),
+                ('notes', models.TextField(blank=True, verbose_name='Izohlar')),
+                ('payment_schedule', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='admin_panel.paymentschedule', verbose_name="To'lov jadvali")),
+                ('reviewed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reviewed_receipts', to=settings.AUTH_USER_MODEL, verbose_name="Ko'rib chiqdi")),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='receipts', to='admin_panel.student', verbose_name='Talaba')),
+            ],
+            options={
+                'verbose_name': 'Chek',
+                'verbose_name_plural': 'Cheklar',
+                'db_table': 'receipts',
+                'ordering': ['-submitted_at'],
+                'unique_together': {('student', 'payment_schedule')},
+            },
+        ),
+        migrations.CreateModel(
+            name='PaymentReminder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('days_before', models.IntegerField(verbose_name='Necha kun oldin')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='Yuborilgan vaqt')),
+                ('is_sent', models.BooleanField(default=False, verbose_name='Yuborildi')),
+                ('payment_schedule', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='admin_panel.paymentschedule', verbose_name="To'lov jadvali")),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='admin_panel.student', verbose_name='Talaba')),
+            ],
+            options={
+                'verbose_name': 'Eslatma',
+                'verbose_name_plural': 'Eslatmalar',
+                'db_table': 'payment_reminders',
+                'unique_together': {('payment_schedule', 'student', 'days_before')},
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='paymentreminder',
+            index=models.Index(condition=models.Q(('is_sent', False)), fields=['payment_schedule', 'days_before'], name='reminder_unsent_due_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0002_paymentreminder_unsent_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReminderRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('run_date', models.DateField(unique=True, verbose_name='Sana')),
+                ('started_at', models.DateTimeField(verbose_name='Boshlangan vaqt')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Tugagan vaqt')),
+                ('duration', models.FloatField(default=0, verbose_name='Davomiyligi (soniya)')),
+                ('total', models.IntegerField(default=0, verbose_name='Jami')),
+                ('sent', models.IntegerField(default=0, verbose_name='Yuborildi')),
+                ('failed', models.IntegerField(default=0, verbose_name='Xatolik')),
+                ('group_messages', models.IntegerField(default=0, verbose_name='Guruh xabarlari')),
+            ],
+            options={
+                'verbose_name': 'Eslatma jarayoni',
+                'verbose_name_plural': 'Eslatma jarayonlari',
+                'db_table': 'reminder_runs',
+                'ordering': ['-run_date'],
+            },
+        ),
+    ]
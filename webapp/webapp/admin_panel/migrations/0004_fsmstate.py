@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0003_reminderrun'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FSMState',
+            fields=[
+                ('key', models.CharField(max_length=255, primary_key=True, serialize=False, verbose_name='Kalit')),
+                ('state', models.CharField(blank=True, max_length=255, null=True, verbose_name='Holat')),
+                ('data', models.BinaryField(default=b'', verbose_name="Ma'lumotlar")),
+                ('updated_at', models.DateTimeField(db_index=True, verbose_name='Yangilangan vaqt')),
+            ],
+            options={
+                'verbose_name': 'FSM holati',
+                'verbose_name_plural': 'FSM holatlari',
+                'db_table': 'fsm_states',
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:09
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0004_fsmstate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReceiptAdminMessage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('chat_id', models.BigIntegerField(verbose_name='Chat ID')),
+                ('message_id', models.BigIntegerField(verbose_name='Xabar ID')),
+                ('receipt', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='admin_messages', to='admin_panel.receipt', verbose_name='Chek')),
+            ],
+            options={
+                'verbose_name': 'Chek xabari',
+                'verbose_name_plural': 'Chek xabarlari',
+                'db_table': 'receipt_admin_messages',
+            },
+        ),
+    ]
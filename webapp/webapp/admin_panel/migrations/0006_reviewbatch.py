@@ -0,0 +1,44 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:11
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0005_receiptadminmessage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('approved', 'Tasdiqlangan'), ('rejected', 'Rad etilgan')], max_length=20, verbose_name='Holat')),
+                ('stage', models.CharField(blank=True, max_length=5, verbose_name='Bosqich')),
+                ('date_from', models.DateField(blank=True, null=True, verbose_name='Sanadan')),
+                ('date_to', models.DateField(blank=True, null=True, verbose_name='Sanagacha')),
+                ('total', models.IntegerField(default=0, verbose_name='Cheklar soni')),
+                ('notified', models.IntegerField(default=0, verbose_name='Xabar berildi')),
+                ('failed', models.IntegerField(default=0, verbose_name='Xatolik')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Yaratilgan vaqt')),
+                ('notify_started_at', models.DateTimeField(blank=True, null=True, verbose_name='Xabar yuborish boshlandi')),
+                ('notified_at', models.DateTimeField(blank=True, null=True, verbose_name='Xabar yuborish tugadi')),
+                ('group', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='admin_panel.group', verbose_name='Guruh')),
+                ('reviewed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='review_batches', to=settings.AUTH_USER_MODEL, verbose_name="Ko'rib chiqdi")),
+            ],
+            options={
+                'verbose_name': "Ommaviy ko'rib chiqish",
+                'verbose_name_plural': "Ommaviy ko'rib chiqishlar",
+                'db_table': 'review_batches',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='receipt',
+            name='review_batch',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='receipts', to='admin_panel.reviewbatch', verbose_name="Ommaviy ko'rib chiqish"),
+        ),
+    ]
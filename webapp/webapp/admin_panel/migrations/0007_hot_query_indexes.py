@@ -0,0 +1,49 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0006_reviewbatch'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='anonymousmessage',
+            index=models.Index(condition=models.Q(('is_replied', False)), fields=['-created_at'], name='anon_unanswered_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='anonymousmessage',
+            index=models.Index(condition=models.Q(('is_replied', True)), fields=['-replied_at'], name='anon_replied_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='anonymousmessage',
+            index=models.Index(fields=['sender_telegram_id', 'created_at'], name='anon_sender_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='paymentschedule',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['due_date'], name='schedule_active_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='receipt',
+            index=models.Index(fields=['-submitted_at'], name='receipt_submitted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='receipt',
+            index=models.Index(fields=['status', '-submitted_at'], name='receipt_status_submitted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='receipt',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['payment_schedule', 'submitted_at'], name='receipt_pending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['group', 'last_name', 'id'], name='student_active_group_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('telegram_id__isnull', False)), fields=['role'], name='user_role_telegram_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-18 20:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0007_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='receipt',
+            name='receipt_submitted_idx',
+        ),
+        migrations.AddIndex(
+            model_name='receipt',
+            index=models.Index(fields=['-submitted_at', '-id'], name='receipt_submitted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(fields=['last_name', 'id'], name='student_name_idx'),
+        ),
+    ]
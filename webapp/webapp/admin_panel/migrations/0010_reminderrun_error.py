@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 21:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0009_student_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reminderrun',
+            name='error',
+            field=models.TextField(blank=True, verbose_name='Xatolik matni'),
+        ),
+    ]
@@ -2,8 +2,12 @@ from django.db import models
 
 # Create your models here.
 # webapp/admin_panel/models.py
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Greatest, Upper
+from django.utils import timezone
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import TrigramWordSimilarity
 
 
 class User(AbstractUser):
@@ -24,6 +28,69 @@ class User(AbstractUser):
         db_table = 'users'
         verbose_name = 'Foydalanuvchi'
         verbose_name_plural = 'Foydalanuvchilar'
+        indexes = [
+            # Admin/buxgalterlar ro'yxati (faqat telegram_id si borlar)
+            models.Index(
+                fields=['role'],
+                condition=models.Q(telegram_id__isnull=False),
+                name='user_role_telegram_idx'
+            ),
+        ]
+
+
+class StudentQuerySet(models.QuerySet):
+    """Talabalar so'rovlari"""
+
+    def search(self, query: str):
+        """
+        Talabalarni qidirish (natijalar mosligi bo'yicha saralangan)
+
+        Raqamlar - JSHSHIR va talaba ID si boshi bo'yicha (btree prefiks
+        indekslari), AA1234567 - pasport bo'yicha, raqamli so'z - talaba
+        ID si boshi bo'yicha, matn - har
+        bir so'z familiya yoki ismning bir qismi yoki unga o'xshash
+        (pg_trgm GIN indekslari, imlo xatolariga chidamli).
+        """
+        query = ' '.join(query.split())
+        if not query:
+            return self
+
+        if query.isdigit():
+            if len(query) == 14:
+                return self.filter(jshshir=query)
+            return self.filter(
+                models.Q(jshshir__startswith=query) | models.Q(student_id__istartswith=query)
+            ).annotate(
+                rank=models.Case(
+                    models.When(models.Q(student_id__iexact=query), then=models.Value(1.0)),
+                    default=models.Value(0.5),
+                    output_field=models.FloatField()
+                )
+            ).order_by('-rank', 'student_id')
+
+        if len(query) == 9 and query[:2].isalpha() and query[2:].isdigit():
+            return self.filter(passport_series=query[:2].upper(), passport_number=query[2:])
+
+        if ' ' not in query and any(char.isdigit() for char in query):
+            return self.filter(student_id__istartswith=query).order_by('student_id')
+
+        words = query.upper().split()
+        students = self.alias(last_name_upper=Upper('last_name'), first_name_upper=Upper('first_name'))
+        rank = None
+        for word in words:
+            students = students.filter(
+                models.Q(last_name_upper__contains=word) |
+                models.Q(first_name_upper__contains=word) |
+                models.Q(last_name_upper__trigram_word_similar=word) |
+                models.Q(first_name_upper__trigram_word_similar=word)
+            )
+            similarity = Greatest(
+                TrigramWordSimilarity(word, 'last_name_upper'),
+                TrigramWordSimilarity(word, 'first_name_upper')
+            )
+            rank = similarity if rank is None else rank + similarity
+
+        return students.annotate(rank=rank).order_by('-rank', 'last_name', 'id')
 
 
 class Student(models.Model):
@@ -42,11 +109,30 @@ class Student(models.Model):
     is_active = models.BooleanField(default=True, verbose_name='Faol')
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = StudentQuerySet.as_manager()
+
     class Meta:
         db_table = 'students'
         verbose_name = 'Talaba'
         verbose_name_plural = 'Talabalar'
         ordering = ['last_name', 'first_name']
+        indexes = [
+            # Talabalar ro'yxati (keyset sahifalash: familiya, id)
+            models.Index(fields=['last_name', 'id'], name='student_name_idx'),
+            # Faol talabalar: sanash va qarzdorlar ro'yxati (guruh, familiya bo'yicha)
+            models.Index(
+                fields=['group', 'last_name', 'id'],
+                condition=models.Q(is_active=True),
+                name='student_active_group_idx'
+            ),
+            # Qidiruv: familiya/ism bo'yicha (ILIKE '%..%' va o'xshashlik), JSHSHIR va ID boshi bo'yicha
+            GinIndex(OpClass(Upper('last_name'), name='gin_trgm_ops'), name='student_last_name_trgm_idx'),
+            GinIndex(OpClass(Upper('first_name'), name='gin_trgm_ops'), name='student_first_name_trgm_idx'),
+            models.Index(fields=['jshshir'], opclasses=['varchar_pattern_ops'], name='student_jshshir_prefix_idx'),
+            models.Index(OpClass(Upper('student_id'), name='text_pattern_ops'), name='student_id_prefix_idx'),
+            # Pasport bo'yicha aniq qidiruv (AA1234567)
+            models.Index(fields=['passport_number', 'passport_series'], name='student_passport_idx'),
+        ]
 
     def __str__(self):
         return f"{self.last_name} {self.first_name} ({self.student_id})"
@@ -100,6 +186,14 @@ class PaymentSchedule(models.Model):
         verbose_name_plural = 'To\'lov jadvallari'
         unique_together = ['academic_year', 'stage']
         ordering = ['academic_year', 'stage']
+        indexes = [
+            # Faol jadvallar muddati bo'yicha (kelgusi / muddati o'tgan to'lovlar)
+            models.Index(
+                fields=['due_date'],
+                condition=models.Q(is_active=True),
+                name='schedule_active_due_idx'
+            ),
+        ]
 
     def __str__(self):
         return f"{self.academic_year} - {self.stage}"
@@ -123,6 +217,8 @@ class Receipt(models.Model):
                                     related_name='reviewed_receipts', verbose_name='Ko\'rib chiqdi')
     reviewed_at = models.DateTimeField(null=True, blank=True, verbose_name='Ko\'rilgan vaqt')
     notes = models.TextField(blank=True, verbose_name='Izohlar')
+    review_batch = models.ForeignKey('ReviewBatch', on_delete=models.SET_NULL, null=True, blank=True,
+                                     related_name='receipts', verbose_name='Ommaviy ko\'rib chiqish')
 
     class Meta:
         db_table = 'receipts'
@@ -130,11 +226,110 @@ class Receipt(models.Model):
         verbose_name_plural = 'Cheklar'
         unique_together = ['student', 'payment_schedule']
         ordering = ['-submitted_at']
+        indexes = [
+            # Oxirgi cheklar ro'yxati (keyset sahifalash: submitted_at, id)
+            models.Index(fields=['-submitted_at', '-id'], name='receipt_submitted_idx'),
+            # Holat bo'yicha sanash va filtrlangan ro'yxat
+            models.Index(fields=['status', '-submitted_at'], name='receipt_status_submitted_idx'),
+            # Kutilayotgan cheklar navbati (ommaviy ko'rib chiqish)
+            models.Index(
+                fields=['payment_schedule', 'submitted_at'],
+                condition=models.Q(status='pending'),
+                name='receipt_pending_idx'
+            ),
+        ]
 
     def __str__(self):
         return f"{self.student.student_id} - {self.payment_schedule.stage}"
 
 
+class ReviewBatch(models.Model):
+    """Cheklarni ommaviy ko'rib chiqish"""
+    STATUS_CHOICES = [
+        ('approved', 'Tasdiqlangan'),
+        ('rejected', 'Rad etilgan'),
+    ]
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, verbose_name='Holat')
+    reviewed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True,
+                                    related_name='review_batches', verbose_name='Ko\'rib chiqdi')
+    stage = models.CharField(max_length=5, blank=True, verbose_name='Bosqich')
+    group = models.ForeignKey(Group, on_delete=models.SET_NULL, null=True, blank=True, verbose_name='Guruh')
+    date_from = models.DateField(null=True, blank=True, verbose_name='Sanadan')
+    date_to = models.DateField(null=True, blank=True, verbose_name='Sanagacha')
+    total = models.IntegerField(default=0, verbose_name='Cheklar soni')
+    notified = models.IntegerField(default=0, verbose_name='Xabar berildi')
+    failed = models.IntegerField(default=0, verbose_name='Xatolik')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Yaratilgan vaqt')
+    notify_started_at = models.DateTimeField(null=True, blank=True, verbose_name='Xabar yuborish boshlandi')
+    notified_at = models.DateTimeField(null=True, blank=True, verbose_name='Xabar yuborish tugadi')
+
+    class Meta:
+        db_table = 'review_batches'
+        verbose_name = 'Ommaviy ko\'rib chiqish'
+        verbose_name_plural = 'Ommaviy ko\'rib chiqishlar'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.get_status_display()}: {self.total} ta ({self.created_at:%d.%m.%Y %H:%M})"
+
+    @staticmethod
+    def pending_receipts(stage=None, group_id=None, date_from=None, date_to=None):
+        """Filtr bo'yicha kutilayotgan cheklar"""
+        receipts = Receipt.objects.filter(status='pending')
+        if stage:
+            receipts = receipts.filter(payment_schedule__stage=stage)
+        if group_id:
+            receipts = receipts.filter(student__group_id=group_id)
+        if date_from:
+            receipts = receipts.filter(submitted_at__date__gte=date_from)
+        if date_to:
+            receipts = receipts.filter(submitted_at__date__lte=date_to)
+        return receipts
+
+    @classmethod
+    def review(cls, status, reviewed_by, stage=None, group_id=None, date_from=None, date_to=None):
+        """
+        Filtr bo'yicha barcha kutilayotgan cheklarni bitta UPDATE bilan ko'rib chiqish
+
+        Talabalarga xabarlar keyin bot orqali (review_batch bo'yicha) yuboriladi.
+        Mos chek bo'lmasa yozuv saqlanmaydi (qaytarilgan batch.pk - None, total - 0).
+        """
+        with transaction.atomic():
+            batch = cls.objects.create(
+                status=status,
+                reviewed_by=reviewed_by,
+                stage=stage or '',
+                group_id=group_id,
+                date_from=date_from,
+                date_to=date_to
+            )
+            batch.total = cls.pending_receipts(stage, group_id, date_from, date_to).update(
+                status=status,
+                reviewed_by=reviewed_by,
+                reviewed_at=timezone.now(),
+                review_batch=batch
+            )
+            if not batch.total:
+                transaction.set_rollback(True)
+                batch.pk = None
+                return batch
+            batch.save(update_fields=['total'])
+        return batch
+
+
+class ReceiptAdminMessage(models.Model):
+    """Adminlarga yuborilgan chek xabari (ko'rib chiqilgach tugmalarni olib tashlash uchun)"""
+    receipt = models.ForeignKey(Receipt, on_delete=models.CASCADE, related_name='admin_messages', verbose_name='Chek')
+    chat_id = models.BigIntegerField(verbose_name='Chat ID')
+    message_id = models.BigIntegerField(verbose_name='Xabar ID')
+
+    class Meta:
+        db_table = 'receipt_admin_messages'
+        verbose_name = 'Chek xabari'
+        verbose_name_plural = 'Chek xabarlari'
+
+
 class PaymentReminder(models.Model):
     """To'lov eslatmasi"""
     payment_schedule = models.ForeignKey(PaymentSchedule, on_delete=models.CASCADE, verbose_name='To\'lov jadvali')
@@ -148,6 +343,53 @@ class PaymentReminder(models.Model):
         verbose_name = 'Eslatma'
         verbose_name_plural = 'Eslatmalar'
         unique_together = ['payment_schedule', 'student', 'days_before']
+        indexes = [
+            # Kunlik tekshiruv faqat yuborilmagan eslatmalarni o'qiydi
+            models.Index(
+                fields=['payment_schedule', 'days_before'],
+                condition=models.Q(is_sent=False),
+                name='reminder_unsent_due_idx'
+            ),
+        ]
+
+    @staticmethod
+    def due_filter(schedules, since, today):
+        """
+        [since, today] kunlarida yuborilishi kerak bo'lgan eslatmalar sharti
+
+        schedules - (id, due_date) juftliklari (due_date >= since). Kun D uchun
+        days_before = due_date - D, shuning uchun oraliq
+        [due_date - today, due_date - since] (manfiy qiymatlarsiz).
+        """
+        condition = models.Q()
+        for schedule_id, due_date in schedules:
+            condition |= models.Q(
+                payment_schedule_id=schedule_id,
+                days_before__range=(max((due_date - today).days, 0), (due_date - since).days)
+            )
+        return condition
+
+
+class ReminderRun(models.Model):
+    """Kunlik eslatma yuborish jarayoni (metrikalar va replikalar orasidagi qulf)"""
+    run_date = models.DateField(unique=True, verbose_name='Sana')
+    started_at = models.DateTimeField(verbose_name='Boshlangan vaqt')
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name='Tugagan vaqt')
+    duration = models.FloatField(default=0, verbose_name='Davomiyligi (soniya)')
+    total = models.IntegerField(default=0, verbose_name='Jami')
+    sent = models.IntegerField(default=0, verbose_name='Yuborildi')
+    failed = models.IntegerField(default=0, verbose_name='Xatolik')
+    group_messages = models.IntegerField(default=0, verbose_name='Guruh xabarlari')
+    error = models.TextField(blank=True, verbose_name='Xatolik matni')
+
+    class Meta:
+        db_table = 'reminder_runs'
+        verbose_name = 'Eslatma jarayoni'
+        verbose_name_plural = 'Eslatma jarayonlari'
+        ordering = ['-run_date']
+
+    def __str__(self):
+        return f"{self.run_date}"
 
 
 class AnonymousMessage(models.Model):
@@ -165,6 +407,22 @@ class AnonymousMessage(models.Model):
         verbose_name = 'Anonim xabar'
         verbose_name_plural = 'Anonim xabarlar'
         ordering = ['-created_at']
+        indexes = [
+            # Javob berilmagan xabarlar (yangilari birinchi)
+            models.Index(
+                fields=['-created_at'],
+                condition=models.Q(is_replied=False),
+                name='anon_unanswered_idx'
+            ),
+            # Oxirgi javob berilganlar
+            models.Index(
+                fields=['-replied_at'],
+                condition=models.Q(is_replied=True),
+                name='anon_replied_at_idx'
+            ),
+            # Yuboruvchining oxirgi xabari
+            models.Index(fields=['sender_telegram_id', 'created_at'], name='anon_sender_created_idx'),
+        ]
 
 
 class AccountingStaff(models.Model):
@@ -197,4 +455,20 @@ class ReminderTemplate(models.Model):
         ordering = ['-days_before']
 
     def __str__(self):
-        return f"{self.days_before} kun oldin"
\ No newline at end of file
+        return f"{self.days_before} kun oldin"
+
+
+class FSMState(models.Model):
+    """Bot FSM holati (to'ldirilayotgan chek va h.k.)"""
+    key = models.CharField(max_length=255, primary_key=True, verbose_name='Kalit')
+    state = models.CharField(max_length=255, null=True, blank=True, verbose_name='Holat')
+    data = models.BinaryField(default=b'', verbose_name="Ma'lumotlar")
+    updated_at = models.DateTimeField(db_index=True, verbose_name='Yangilangan vaqt')
+
+    class Meta:
+        db_table = 'fsm_states'
+        verbose_name = 'FSM holati'
+        verbose_name_plural = 'FSM holatlari'
+
+    def __str__(self):
+        return self.key
@@ -0,0 +1,136 @@
+# webapp/admin_panel/pagination.py
+import hashlib
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.utils.functional import cached_property
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def cached_count(queryset: QuerySet, timeout: Optional[int] = None) -> int:
+    """
+    Yozuvlar soni (keshdan)
+
+    COUNT(*) katta jadvalda sahifaning o'zidan qimmat - natija SQL so'rov
+    bo'yicha qisqa muddat keshlanadi.
+    """
+    key = 'count:' + hashlib.md5(str(queryset.query).encode()).hexdigest()
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, settings.ADMIN_COUNT_CACHE_TTL if timeout is None else timeout)
+    return count
+
+
+class CachedCountPaginator(Paginator):
+    """Jami soni keshlanadigan Paginator"""
+
+    @cached_property
+    def count(self):
+        return cached_count(self.object_list)
+
+
+def estimated_count(queryset: QuerySet) -> Optional[int]:
+    """
+    Jadvaldagi yozuvlarning taxminiy soni (PostgreSQL statistikasi, pg_class.reltuples)
+
+    Filtrsiz so'rov uchun va jadval ADMIN_ESTIMATED_COUNT_MIN dan katta bo'lsa
+    qaytariladi, aks holda None - aniq son hisoblanadi.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql' or queryset.query.where or queryset.query.distinct:
+        return None
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+            [queryset.model._meta.db_table]
+        )
+        row = cursor.fetchone()
+
+    if row is None or row[0] < settings.ADMIN_ESTIMATED_COUNT_MIN:
+        return None
+    return row[0]
+
+
+class EstimatedCountPaginator(CachedCountPaginator):
+    """
+    Katta jadvallar uchun Paginator (Django admin)
+
+    Filtrsiz ro'yxatda COUNT(*) o'rniga taxminiy son, filtrlanganda keshlangan aniq son.
+    """
+
+    @cached_property
+    def count(self):
+        count = estimated_count(self.object_list)
+        if count is None:
+            count = cached_count(self.object_list)
+        return count
+
+
+def encode_cursor(submitted_at: datetime, pk: int) -> str:
+    """(submitted_at, id) kursorini URL parametriga aylantirish"""
+    return f"{(submitted_at - EPOCH) // timedelta(microseconds=1)}-{pk}"
+
+
+def decode_cursor(value: str) -> Optional[Tuple[datetime, int]]:
+    """URL parametridan (submitted_at, id) kursorini olish (noto'g'ri bo'lsa None)"""
+    try:
+        micros, pk = value.split('-')
+        return EPOCH + timedelta(microseconds=int(micros)), int(pk)
+    except (ValueError, OverflowError):
+        return None
+
+
+def receipts_page(
+        queryset: QuerySet,
+        after: Optional[str] = None,
+        before: Optional[str] = None,
+        per_page: Optional[int] = None
+) -> Tuple[List, Optional[str], Optional[str]]:
+    """
+    Cheklarni (submitted_at, id) kursori bo'yicha sahifalash (yangilari birinchi)
+
+    after - shu chekdan keyingi (eskiroq) sahifa, before - oldingi (yangiroq) sahifa.
+    Returns: (cheklar, oldingi sahifa kursori, keyingi sahifa kursori)
+    """
+    per_page = per_page or settings.ADMIN_LIST_PAGE_SIZE
+    cursor = decode_cursor(after or before or '')
+
+    if cursor and before:
+        submitted_at, pk = cursor
+        queryset = queryset.filter(
+            Q(submitted_at__gt=submitted_at) | Q(submitted_at=submitted_at, id__gt=pk),
+            submitted_at__gte=submitted_at
+        ).order_by('submitted_at', 'id')
+    elif cursor:
+        submitted_at, pk = cursor
+        queryset = queryset.filter(
+            Q(submitted_at__lt=submitted_at) | Q(submitted_at=submitted_at, id__lt=pk),
+            submitted_at__lte=submitted_at
+        ).order_by('-submitted_at', '-id')
+    else:
+        queryset = queryset.order_by('-submitted_at', '-id')
+
+    receipts = list(queryset[:per_page + 1])
+    more = len(receipts) > per_page
+    receipts = receipts[:per_page]
+
+    if cursor and before:
+        receipts.reverse()
+        has_prev, has_next = more, True
+    else:
+        has_prev, has_next = cursor is not None, more
+
+    if not receipts:
+        return receipts, None, None
+
+    prev_cursor = encode_cursor(receipts[0].submitted_at, receipts[0].id) if has_prev else None
+    next_cursor = encode_cursor(receipts[-1].submitted_at, receipts[-1].id) if has_next else None
+    return receipts, prev_cursor, next_cursor
@@ -1,3 +1,822 @@
 from django.test import TestCase
 
 # Create your tests here.
+# webapp/admin_panel/tests.py
+import asyncio
+import sys
+import time
+from datetime import date, timedelta
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock, skipUnless
+
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.db.models import Q
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import (
+    User, Student, Group, PaymentSchedule, Receipt,
+    PaymentReminder, AnonymousMessage, ReviewBatch, ReminderRun, AccountingStaff, ReminderTemplate
+)
+from .dashboard import DASHBOARD_CACHE_KEY
+from .identity import identity_cache_key
+
+# Bot modullari (bot.utils.pagination) repo ildizidan import qilinadi
+REPO_DIR = str(Path(__file__).resolve().parents[3])
+if REPO_DIR not in sys.path:
+    sys.path.append(REPO_DIR)
+
+# Bot servislari ilovani webapp.admin_panel nomi bilan import qiladi - testdagi ilovaning o'zi
+sys.modules.setdefault('webapp.admin_panel', sys.modules[__package__])
+sys.modules.setdefault('webapp.admin_panel.models', sys.modules[f'{__package__}.models'])
+
+from aiogram.exceptions import TelegramRetryAfter  # noqa: E402
+
+from bot.benchmarks.fake_api import FakeBotAPI  # noqa: E402
+from bot.services.broadcast_service import BroadcastService, TokenBucket  # noqa: E402
+from bot.services.payment_service import PaymentService  # noqa: E402
+from bot.services.reminder_service import ReminderService, SentReminderBuffer  # noqa: E402
+from bot.services.scheduler_service import SchedulerService  # noqa: E402
+from bot.utils.pagination import KeysetPaginator, parse_page_callback  # noqa: E402
+
+
+class HotQueryIndexTests(TestCase):
+    """
+    Bot va web paneldagi tez-tez ishlaydigan so'rovlar indeksdan foydalanishini tekshirish (EXPLAIN)
+
+    Test bazasidagi jadvallar kichik, shuning uchun PostgreSQL da ketma-ket
+    skanerlash o'chiriladi - rejalashtiruvchi mos indeks bo'lsa uni tanlaydi.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.group = Group.objects.create(name='101-guruh')
+        cls.schedule = PaymentSchedule.objects.create(
+            academic_year='2025-2026', stage='1/4', due_date=date.today() + timedelta(days=3)
+        )
+
+        for i in range(20):
+            user = User.objects.create(
+                username=f'user{i}', telegram_id=1000 + i,
+                role='admin' if i == 0 else 'accountant' if i == 1 else 'student'
+            )
+            student = Student.objects.create(
+                user=user, student_id=f'S{i:04d}', first_name='Ism', last_name=f'Familiya{i}',
+                patronymic='Otasi', passport_series='AA', passport_number=f'{i:07d}',
+                jshshir=f'{i:014d}', phone='+998901234567', group=cls.group, is_active=i % 5 != 0
+            )
+            Receipt.objects.create(
+                student=student, payment_schedule=cls.schedule, file_id=f'file{i}',
+                status=['pending', 'approved', 'rejected'][i % 3]
+            )
+            PaymentReminder.objects.create(
+                payment_schedule=cls.schedule, student=student, days_before=3, is_sent=i % 2 == 0
+            )
+            AnonymousMessage.objects.create(
+                sender_telegram_id=1000 + i, message_text='Savol',
+                is_replied=i % 2 == 0, replied_at=timezone.now() if i % 2 == 0 else None
+            )
+
+    def setUp(self):
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET enable_seqscan = off')
+
+    def tearDown(self):
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('RESET enable_seqscan')
+
+    def assertUsesIndex(self, queryset, index_name):
+        """So'rov rejasida indeks nomi borligini tekshirish"""
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, f"{index_name} ishlatilmadi:\n{queryset.query}\n\n{plan}")
+
+    def test_recent_receipts(self):
+        """Oxirgi cheklar (admin.show_receipts, views.dashboard)"""
+        self.assertUsesIndex(
+            Receipt.objects.order_by('-submitted_at')[:20],
+            'receipt_submitted_idx'
+        )
+
+    def keyset_window(self, paginator, index):
+        """Paginator ning index-yozuvdan keyingi sahifa so'rovi (bot ro'yxatlari)"""
+        cursor = paginator.queryset.order_by(*paginator.ordering)[index]
+        values = paginator.queryset.filter(pk=cursor.pk).values_list(*paginator.fields).get()
+        return paginator.window(values)
+
+    def test_receipts_keyset_page(self):
+        """Cheklarning keyingi sahifasi (bot ro'yxati, submitted_at, id kursori)"""
+        paginator = KeysetPaginator(Receipt.objects.all(), ('-submitted_at', '-id'), str, '', '')
+        self.assertUsesIndex(self.keyset_window(paginator, 5), 'receipt_submitted_idx')
+
+    def test_students_keyset_page(self):
+        """Talabalarning keyingi sahifasi (bot ro'yxati, last_name, id kursori)"""
+        paginator = KeysetPaginator(Student.objects.all(), ('last_name', 'id'), str, '', '')
+        self.assertUsesIndex(self.keyset_window(paginator, 5), 'student_name_idx')
+
+    def test_receipts_by_status(self):
+        """Holat bo'yicha cheklar (admin.show_statistics, views.receipts_list)"""
+        self.assertUsesIndex(
+            Receipt.objects.filter(status='pending').order_by('-submitted_at'),
+            'receipt_status_submitted_idx'
+        )
+
+    def test_pending_receipts_by_schedule(self):
+        """Bosqich bo'yicha kutilayotgan cheklar (ReviewBatch.pending_receipts)"""
+        self.assertUsesIndex(
+            Receipt.objects.filter(status='pending', payment_schedule=self.schedule).order_by('submitted_at'),
+            'receipt_pending_idx'
+        )
+
+    def test_active_schedules_by_due_date(self):
+        """Kelgusi to'lovlar (payment_service.get_upcoming_payments, views.dashboard)"""
+        today = date.today()
+        self.assertUsesIndex(
+            PaymentSchedule.objects.filter(
+                due_date__gte=today,
+                due_date__lte=today + timedelta(days=30),
+                is_active=True
+            ).order_by('due_date'),
+            'schedule_active_due_idx'
+        )
+
+    def test_unsent_reminders(self):
+        """Bugun yuboriladigan eslatmalar (reminder_service.get_due_reminders)"""
+        self.assertUsesIndex(
+            PaymentReminder.objects.filter(
+                Q(payment_schedule_id=self.schedule.id, days_before__range=(3, 3)),
+                is_sent=False
+            ),
+            'reminder_unsent_due_idx'
+        )
+
+    def test_unanswered_messages(self):
+        """Javob berilmagan anonim xabarlar (accountant.show_anonymous_messages)"""
+        self.assertUsesIndex(
+            AnonymousMessage.objects.filter(is_replied=False).order_by('-created_at'),
+            'anon_unanswered_idx'
+        )
+
+    def test_recently_answered_messages(self):
+        """Oxirgi javob berilgan xabarlar"""
+        self.assertUsesIndex(
+            AnonymousMessage.objects.filter(is_replied=True).order_by('-replied_at')[:5],
+            'anon_replied_at_idx'
+        )
+
+    def test_sender_last_message(self):
+        """Yuboruvchining oxirgi xabari (accountant.handle_anonymous_question)"""
+        self.assertUsesIndex(
+            AnonymousMessage.objects.filter(sender_telegram_id=1001).order_by('-created_at')[:1],
+            'anon_sender_created_idx'
+        )
+
+    def test_admin_chat_ids(self):
+        """Admin va buxgalterlar (ReceiptService.get_admin_chat_ids)"""
+        self.assertUsesIndex(
+            User.objects.filter(
+                role__in=['admin', 'accountant'],
+                telegram_id__isnull=False
+            ).values_list('telegram_id', flat=True),
+            'user_role_telegram_idx'
+        )
+
+    def test_active_students_by_group(self):
+        """Guruhdagi faol talabalar (payment_service.get_overdue_students)"""
+        self.assertUsesIndex(
+            Student.objects.filter(is_active=True, group=self.group).order_by('group_id', 'last_name', 'id'),
+            'student_active_group_idx'
+        )
+
+    @skipUnless(connection.vendor == 'postgresql', "pg_trgm va pattern_ops indekslari PostgreSQL da")
+    def test_student_name_search(self):
+        """Familiya/ism bo'yicha qidiruv (Student.objects.search)"""
+        self.assertUsesIndex(Student.objects.search('Familiya1'), 'student_last_name_trgm_idx')
+
+    @skipUnless(connection.vendor == 'postgresql', "pg_trgm va pattern_ops indekslari PostgreSQL da")
+    def test_student_jshshir_prefix_search(self):
+        """JSHSHIR boshi bo'yicha qidiruv"""
+        self.assertUsesIndex(Student.objects.search('0000000'), 'student_jshshir_prefix_idx')
+
+    @skipUnless(connection.vendor == 'postgresql', "pg_trgm va pattern_ops indekslari PostgreSQL da")
+    def test_student_id_prefix_search(self):
+        """Talaba ID si boshi bo'yicha qidiruv"""
+        self.assertUsesIndex(Student.objects.search('s00'), 'student_id_prefix_idx')
+
+    def test_student_passport_search(self):
+        """Pasport bo'yicha qidiruv"""
+        self.assertUsesIndex(Student.objects.search('aa0000003'), 'student_passport_idx')
+
+
+class DashboardCacheTests(TestCase):
+    """Dashboard statistikasi keshdan olinishi va o'zgarishlarda yangilanishi"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='admin', password='parol', role='admin')
+        cls.schedule = PaymentSchedule.objects.create(
+            academic_year='2025-2026', stage='1/4', due_date=date.today() + timedelta(days=3)
+        )
+        for i, status in enumerate(['pending', 'pending', 'approved', 'rejected']):
+            student = Student.objects.create(
+                student_id=f'S{i:04d}', first_name='Ism', last_name='Familiya', patronymic='Otasi',
+                passport_series='AA', passport_number=f'{i:07d}', jshshir=f'{i:014d}', phone='+998901234567'
+            )
+            Receipt.objects.create(
+                student=student, payment_schedule=cls.schedule, file_id=f'file{i}', status=status
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.admin)
+
+    def test_cache_hit_queries(self):
+        """Kesh bor bo'lsa faqat sessiya va foydalanuvchi so'rovlari"""
+        self.client.get(reverse('admin_panel:dashboard'))
+
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('admin_panel:dashboard'))
+
+        self.assertEqual(response.context['pending_receipts'], 2)
+        self.assertEqual(response.context['approved_receipts'], 1)
+        self.assertEqual(response.context['rejected_receipts'], 1)
+        self.assertEqual(len(response.context['recent_receipts']), 4)
+
+    def test_receipt_save_invalidates(self):
+        """Chek o'zgarganda kesh tozalanadi"""
+        self.client.get(reverse('admin_panel:dashboard'))
+
+        receipt = Receipt.objects.filter(status='pending').first()
+        receipt.status = 'approved'
+        receipt.save()
+        self.assertIsNone(cache.get(DASHBOARD_CACHE_KEY))
+
+        response = self.client.get(reverse('admin_panel:dashboard'))
+        self.assertEqual(response.context['pending_receipts'], 1)
+        self.assertEqual(response.context['approved_receipts'], 2)
+
+    def test_warm_command(self):
+        """warm_dashboard_cache buyrug'i keshni to'ldiradi"""
+        call_command('warm_dashboard_cache', stdout=StringIO())
+        self.assertEqual(cache.get(DASHBOARD_CACHE_KEY)['total_students'], 4)
+
+
+class BulkReviewTests(TestCase):
+    """Ommaviy ko'rib chiqish (ReviewBatch.review, views.receipts_bulk_review)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='admin', password='parol', role='admin')
+        schedule = PaymentSchedule.objects.create(
+            academic_year='2025-2026', stage='1/4', due_date=date.today() + timedelta(days=3)
+        )
+        for i in range(2):
+            student = Student.objects.create(
+                student_id=f'S{i:04d}', first_name='Ism', last_name='Familiya', patronymic='Otasi',
+                passport_series='AA', passport_number=f'{i:07d}', jshshir=f'{i:014d}', phone='+998901234567'
+            )
+            Receipt.objects.create(student=student, payment_schedule=schedule, file_id=f'file{i}')
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def messages(self, response):
+        return [str(message) for message in response.wsgi_request._messages]
+
+    def test_review(self):
+        batch = ReviewBatch.review('approved', self.admin, stage='1/4')
+        self.assertEqual(batch.total, 2)
+        self.assertEqual(Receipt.objects.filter(review_batch=batch, status='approved').count(), 2)
+
+    def test_no_match_keeps_no_batch(self):
+        """Mos chek bo'lmasa bo'sh partiya saqlanmaydi"""
+        batch = ReviewBatch.review('approved', self.admin, stage='2/4')
+        self.assertEqual(batch.total, 0)
+        self.assertIsNone(batch.pk)
+        self.assertFalse(ReviewBatch.objects.exists())
+
+    def test_invalid_group(self):
+        """Raqam bo'lmagan guruh sana xatosi sifatida ko'rsatilmaydi"""
+        response = self.client.post(
+            reverse('admin_panel:receipts_bulk_review'), {'action': 'approved', 'group': 'abc'}
+        )
+        self.assertEqual(self.messages(response), ["Noto'g'ri guruh!"])
+        self.assertFalse(ReviewBatch.objects.exists())
+
+    def test_invalid_date(self):
+        response = self.client.post(
+            reverse('admin_panel:receipts_bulk_review'), {'action': 'approved', 'date_from': '2025-13-01'}
+        )
+        self.assertEqual(self.messages(response), ["Noto'g'ri sana!"])
+        self.assertEqual(Receipt.objects.filter(status='pending').count(), 2)
+
+
+class ChangelistQueryCountTests(TestCase):
+    """Django admin ro'yxatlarida so'rovlar soni qatorlar soniga bog'liq emasligi (N+1 yo'q)"""
+
+    MODELS = [User, Student, Group, PaymentSchedule, Receipt, ReviewBatch, PaymentReminder, AnonymousMessage]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(username='admin', password='parol', role='admin')
+        cls.add_rows(0, 2)
+
+    @classmethod
+    def add_rows(cls, start, stop):
+        """[start, stop) oralig'ida bog'langan yozuvlar yaratish"""
+        for i in range(start, stop):
+            group = Group.objects.create(name=f'{i}-guruh')
+            schedule = PaymentSchedule.objects.create(
+                academic_year=f'20{i:02d}', stage='1/4', due_date=date.today() + timedelta(days=i)
+            )
+            user = User.objects.create(username=f'talaba{i}', telegram_id=2000 + i)
+            student = Student.objects.create(
+                user=user, student_id=f'T{i:04d}', first_name='Ism', last_name=f'Familiya{i}',
+                patronymic='Otasi', passport_series='AA', passport_number=f'{i:07d}',
+                jshshir=f'{i:014d}', phone='+998901234567', group=group
+            )
+            batch = ReviewBatch.objects.create(status='approved', reviewed_by=cls.admin, group=group)
+            Receipt.objects.create(
+                student=student, payment_schedule=schedule, file_id=f'file{i}',
+                status='approved', reviewed_by=cls.admin, review_batch=batch
+            )
+            PaymentReminder.objects.create(payment_schedule=schedule, student=student, days_before=3)
+            AnonymousMessage.objects.create(
+                sender_telegram_id=2000 + i, message_text='Savol', is_replied=True, replied_by=cls.admin
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.admin)
+
+    def changelist_queries(self):
+        """Har bir model ro'yxati sahifasidagi so'rovlar soni"""
+        counts = {}
+        for model in self.MODELS:
+            url = reverse(f'admin:{model._meta.app_label}_{model._meta.model_name}_changelist')
+            cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            counts[model.__name__] = len(queries)
+        return counts
+
+    def test_fixed_query_count(self):
+        """2 va 20 qatorli ro'yxatlar bir xil sondagi so'rov bilan chiqadi"""
+        before = self.changelist_queries()
+        self.add_rows(2, 20)
+        self.assertEqual(self.changelist_queries(), before)
+
+    def test_filtered_changelist_skips_full_count(self):
+        """Filtrlangan ro'yxatda jadvaldagi jami son alohida hisoblanmaydi"""
+        filters = {
+            Receipt: {'status__exact': 'approved'},
+            Group: {'is_active__exact': '1'},
+            PaymentSchedule: {'is_active__exact': '1'},
+            ReviewBatch: {'status__exact': 'approved'},
+            ReminderRun: {'error__isempty': '0'},
+            AccountingStaff: {'is_active__exact': '1'},
+            ReminderTemplate: {'is_active__exact': '1'},
+        }
+        for model, params in filters.items():
+            with self.subTest(model.__name__):
+                url = reverse(f'admin:{model._meta.app_label}_{model._meta.model_name}_changelist')
+                cache.clear()
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(url, params)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotIn('e', response.context['cl'].params)
+                # Faqat sahifalash uchun filtrlangan son (show_full_result_count=False)
+                counts = [query['sql'] for query in queries if query['sql'].upper().startswith('SELECT COUNT(')]
+                self.assertEqual(len(counts), 1, counts)
+
+
+class DueRemindersTests(TestCase):
+    """Yuboriladigan eslatmalar oralig'i (PaymentReminder.due_filter, reminder_service.get_due_reminders)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.today = date.today()
+        student = Student.objects.create(
+            student_id='S0001', first_name='Ism', last_name='Familiya', patronymic='Otasi',
+            passport_series='AA', passport_number='1234567', jshshir='12345678901234', phone='+998901234567'
+        )
+        cls.upcoming = PaymentSchedule.objects.create(
+            academic_year='2025-2026', stage='2/4', due_date=cls.today + timedelta(days=3)
+        )
+        # Bot to'xtab turgan vaqtda muddati o'tgan jadval
+        cls.passed = PaymentSchedule.objects.create(
+            academic_year='2025-2026', stage='1/4', due_date=cls.today - timedelta(days=2)
+        )
+        for schedule in (cls.upcoming, cls.passed):
+            for days in (7, 3, 1, 0):
+                PaymentReminder.objects.create(payment_schedule=schedule, student=student, days_before=days)
+
+    def due(self, since):
+        schedules = PaymentSchedule.objects.filter(due_date__gte=since).values_list('id', 'due_date')
+        return set(
+            PaymentReminder.objects.filter(
+                PaymentReminder.due_filter(schedules, since, self.today)
+            ).values_list('payment_schedule__stage', 'days_before')
+        )
+
+    def test_today(self):
+        """Faqat bugungi eslatmalar"""
+        self.assertEqual(self.due(self.today), {('2/4', 3)})
+
+    def test_catch_up_includes_passed_schedules(self):
+        """O'tkazib yuborilgan kunlar: muddati shu oraliqda o'tgan jadvallar ham"""
+        since = self.today - timedelta(days=5)
+        self.assertEqual(self.due(since), {
+            ('2/4', 7), ('2/4', 3),
+            ('1/4', 3), ('1/4', 1), ('1/4', 0),
+        })
+
+
+class ReminderRunTests(TransactionTestCase):
+    """Kunlik eslatma jarayoni (SchedulerService.run_reminders; run_date to'qnashuvi tranzaksiyasiz tekshiriladi)"""
+
+    REPORT = {'total': 3, 'sent': 2, 'failed': 1, 'duration': 1.5, 'group_messages': 1, 'group_failed': 0}
+
+    def run_reminders(self, send):
+        with mock.patch.object(ReminderService, 'check_and_send_reminders', send):
+            return async_to_sync(SchedulerService.run_reminders)(None)
+
+    def test_failed_send_closes_run(self):
+        """Yuborishda xatolik bo'lsa ham jarayon yopiladi va xatolik yoziladi"""
+        with self.assertLogs('bot.services.scheduler_service', 'ERROR'):
+            report = self.run_reminders(mock.AsyncMock(side_effect=RuntimeError('db down')))
+
+        self.assertIsNone(report)
+        run = ReminderRun.objects.get()
+        self.assertIsNotNone(run.finished_at)
+        self.assertGreaterEqual(run.duration, 0)
+        self.assertEqual(run.error, 'db down')
+
+    def test_failed_run_is_retried(self):
+        """Xatolik bilan tugagan jarayon qayta egallanadi"""
+        with self.assertLogs('bot.services.scheduler_service', 'ERROR'):
+            self.run_reminders(mock.AsyncMock(side_effect=RuntimeError('db down')))
+
+        self.assertEqual(self.run_reminders(mock.AsyncMock(return_value=self.REPORT)), self.REPORT)
+        run = ReminderRun.objects.get()
+        self.assertEqual((run.error, run.sent, run.failed), ('', 2, 1))
+
+    def test_catch_up_skips_failed_days(self):
+        """Xatolik bilan tugagan kunlar keyingi jarayonda qayta qamrab olinadi"""
+        today = date.today()
+        now = timezone.now()
+        ReminderRun.objects.create(run_date=today - timedelta(days=2), started_at=now, finished_at=now)
+        ReminderRun.objects.create(run_date=today - timedelta(days=1), started_at=now, finished_at=now, error='x')
+
+        send = mock.AsyncMock(return_value=self.REPORT)
+        self.run_reminders(send)
+        self.assertEqual(send.call_args.kwargs['since'], today - timedelta(days=1))
+
+
+class IdentityCacheTests(TestCase):
+    """Bot foydalanuvchilari keshi User o'zgarganda tozalanishi"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username='admin', telegram_id=500, role='admin')
+
+    def test_role_change_invalidates(self):
+        cache.set(identity_cache_key(500), self.user)
+        self.user.role = 'student'
+        self.user.save()
+        self.assertIsNone(cache.get(identity_cache_key(500)))
+
+    def test_telegram_id_change_invalidates_old_id(self):
+        user = User.objects.get(pk=self.user.pk)
+        cache.set(identity_cache_key(500), user)
+        cache.set(identity_cache_key(501), None)
+        user.telegram_id = 501
+        user.save()
+        self.assertIsNone(cache.get(identity_cache_key(500)))
+        self.assertEqual(cache.get(identity_cache_key(501), 'missing'), 'missing')
+
+
+class StudentSearchTests(TestCase):
+    """Student.objects.search: so'rov turi bo'yicha yo'naltirish va saralash"""
+
+    @classmethod
+    def setUpTestData(cls):
+        def create(student_id, last_name, jshshir, passport_number):
+            return Student.objects.create(
+                student_id=student_id, first_name='Ism', last_name=last_name, patronymic='Otasi',
+                passport_series='AB', passport_number=passport_number, jshshir=jshshir, phone='+998901234567'
+            )
+
+        cls.karimov = create('B1001', 'Karimov', '31234567890123', '1234567')
+        cls.rahimov = create('B1002', 'Rahimov', '31234500000000', '7654321')
+        cls.numeric = create('3123', 'Nazarov', '41111111111111', '1111111')
+        cls.other = create('C2001', 'Karimova', '51111111111111', '2222222')
+
+    def search(self, query):
+        return list(Student.objects.search(query))
+
+    def test_full_jshshir(self):
+        """14 raqam - JSHSHIR bo'yicha aniq moslik"""
+        self.assertEqual(self.search('31234567890123'), [self.karimov])
+
+    def test_digit_prefix(self):
+        """Raqamlar - JSHSHIR yoki talaba ID si boshi, ID to'liq mos kelgani birinchi"""
+        self.assertEqual(self.search('3123'), [self.numeric, self.karimov, self.rahimov])
+        self.assertEqual(self.search('312345'), [self.karimov, self.rahimov])
+
+    def test_passport(self):
+        """AA1234567 - pasport seriyasi va raqami bo'yicha (katta-kichik harf farqsiz)"""
+        self.assertEqual(self.search('ab7654321'), [self.rahimov])
+        self.assertEqual(self.search('AC7654321'), [])
+
+    def test_alphanumeric_student_id(self):
+        """Harf va raqamli so'z - talaba ID si boshi bo'yicha, ID tartibida"""
+        self.assertEqual(self.search('b100'), [self.karimov, self.rahimov])
+        self.assertEqual(self.search('C2'), [self.other])
+
+    def test_empty_query(self):
+        """Bo'sh so'rov - filtrsiz"""
+        self.assertEqual(len(self.search('   ')), 4)
+
+    @skipUnless(connection.vendor == 'postgresql', "pg_trgm faqat PostgreSQL da")
+    def test_name_ranking(self):
+        """Matn - to'liq mos kelgan familiya birinchi, imlo xatosi ham topiladi"""
+        self.assertEqual(self.search('karimov')[:2], [self.karimov, self.other])
+        self.assertEqual(self.search('Karimow')[0], self.karimov)
+
+
+class PaymentStatusTests(TestCase):
+    """Talabalar to'lov statusi (PaymentService.get_payment_status_for_students)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        today = date.today()
+        cls.passed = PaymentSchedule.objects.create(
+            academic_year='2025-2026', stage='1/4', due_date=today - timedelta(days=3)
+        )
+        cls.upcoming = PaymentSchedule.objects.create(
+            academic_year='2025-2026', stage='2/4', due_date=today + timedelta(days=7)
+        )
+        cls.students = [
+            Student.objects.create(
+                student_id=f'S{i:04d}', first_name='Ism', last_name='Familiya', patronymic='Otasi',
+                passport_series='AA', passport_number=f'{i:07d}', jshshir=f'{i:014d}', phone='+998901234567'
+            )
+            for i in range(10)
+        ]
+        for student in cls.students[::2]:
+            Receipt.objects.create(student=student, payment_schedule=cls.passed, file_id='file', status='approved')
+
+    def statuses(self, students):
+        with CaptureQueriesContext(connection) as queries:
+            statuses = async_to_sync(PaymentService.get_payment_status_for_students)(
+                [student.id for student in students]
+            )
+        return statuses, len(queries)
+
+    def test_fixed_query_count(self):
+        """Talabalar soniga bog'liq bo'lmagan holda ikkita so'rov"""
+        _, few = self.statuses(self.students[:2])
+        statuses, many = self.statuses(self.students)
+        self.assertEqual(few, 2)
+        self.assertEqual(many, 2)
+        self.assertEqual(len(statuses), 10)
+
+    def test_statuses(self):
+        statuses, _ = self.statuses(self.students[:2])
+        self.assertEqual(
+            [(payment['schedule'].stage, payment['status'], payment['is_overdue'])
+             for payment in statuses[self.students[0].id]],
+            [('1/4', 'approved', False), ('2/4', 'not_submitted', False)]
+        )
+        self.assertEqual(
+            [(payment['status'], payment['is_overdue']) for payment in statuses[self.students[1].id]],
+            [('not_submitted', True), ('not_submitted', False)]
+        )
+
+    def test_single_student_wrapper(self):
+        get_status = async_to_sync(PaymentService.get_student_payment_status)
+        status = get_status(self.students[0].id)
+        self.assertEqual(status['student'], self.students[0])
+        self.assertEqual(status['payments'][0]['status'], 'approved')
+        self.assertIsNone(get_status(0))
+
+
+class KeysetPaginatorTests(TestCase):
+    """Bot ro'yxatlari sahifalash (bot.utils.pagination.KeysetPaginator)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.students = [
+            Student.objects.create(
+                student_id=f'S{i:04d}', first_name='Ism', last_name=f'Familiya{i:02d}', patronymic='Otasi',
+                passport_series='AA', passport_number=f'{i:07d}', jshshir=f'{i:014d}', phone='+998901234567'
+            )
+            for i in range(12)
+        ]
+
+    def paginator(self, page_size=5, limit=4096, width=0):
+        return KeysetPaginator(
+            Student.objects.all(),
+            ordering=('last_name', 'id'),
+            render=lambda number, student: f"{number}. {student.last_name}{' ' * width}\n",
+            header='',
+            empty_text="Bo'sh",
+            page_size=page_size,
+            limit=limit
+        )
+
+    def numbers(self, page):
+        return [int(line.split('.')[0]) for line in page.text.splitlines()]
+
+    async def test_next_and_prev(self):
+        paginator = self.paginator()
+        first = await paginator.page()
+        self.assertEqual(self.numbers(first), [1, 2, 3, 4, 5])
+        self.assertEqual((first.has_prev, first.has_next), (False, True))
+
+        second = await paginator.page(2, 'next', first.last_id, first.last_position)
+        self.assertEqual(second.first_id, self.students[5].pk)
+        self.assertEqual(self.numbers(second), [6, 7, 8, 9, 10])
+        self.assertEqual((second.has_prev, second.has_next), (True, True))
+
+        last = await paginator.page(3, 'next', second.last_id, second.last_position)
+        self.assertEqual(self.numbers(last), [11, 12])
+        self.assertFalse(last.has_next)
+
+        back = await paginator.page(2, 'prev', last.first_id, last.first_position)
+        self.assertEqual(back.first_id, self.students[5].pk)
+        self.assertEqual(self.numbers(back), [6, 7, 8, 9, 10])
+
+        start = await paginator.page(1, 'prev', back.first_id, back.first_position)
+        self.assertEqual(self.numbers(start), [1, 2, 3, 4, 5])
+        self.assertFalse(start.has_prev)
+
+    async def test_deleted_cursor(self):
+        """Kursor yozuvi o'chirilgan bo'lsa birinchi sahifa"""
+        paginator = self.paginator()
+        first = await paginator.page()
+        await Student.objects.filter(pk=first.last_id).adelete()
+
+        page = await paginator.page(2, 'next', first.last_id, first.last_position)
+        self.assertEqual(page.first_id, self.students[0].pk)
+        self.assertEqual(self.numbers(page)[0], 1)
+        self.assertFalse(page.has_prev)
+
+    async def test_message_length_cut(self):
+        """Xabar limitidan oshgan yozuvlar keyingi sahifaga o'tadi, raqamlar ketma-ket davom etadi"""
+        paginator = self.paginator(page_size=5, limit=110, width=20)
+        first = await paginator.page()
+        self.assertEqual(self.numbers(first), [1, 2, 3])
+        self.assertTrue(first.has_next)
+        self.assertLessEqual(len(first.text), 110)
+
+        second = await paginator.page(2, 'next', first.last_id, first.last_position)
+        self.assertEqual(second.first_id, self.students[3].pk)
+        self.assertEqual(self.numbers(second), [4, 5, 6])
+
+        back = await paginator.page(1, 'prev', second.first_id, second.first_position)
+        self.assertEqual(self.numbers(back), [1, 2, 3])
+
+    def test_parse_page_callback(self):
+        self.assertEqual(parse_page_callback('adm_students_page_3_next_42_15'), (3, 'next', 42, 15))
+        self.assertEqual(parse_page_callback('adm_students_page_3_prev_42'), (3, 'prev', 42, None))
+        self.assertEqual(parse_page_callback('adm_students'), (1, 'next', None, None))
+
+
+class BroadcastServiceTests(SimpleTestCase):
+    """Ommaviy yuborish: limitlar va RetryAfter (mahalliy soxta Bot API serveriga qarshi)"""
+
+    async def with_api(self, test):
+        """Soxta server va unga ulangan bot bilan testni bajarish"""
+        api = await FakeBotAPI().start()
+        bot = api.bot()
+        try:
+            await test(api, bot)
+        finally:
+            await bot.session.close()
+            await api.close()
+
+    async def test_token_bucket(self):
+        """capacity dan keyingi har bir token 1/rate soniyada"""
+        bucket = TokenBucket(rate=20, capacity=1)
+        started = time.monotonic()
+        for _ in range(5):
+            await bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 4 / 20 * 0.9)
+
+    async def test_global_rate(self):
+        """Turli chatlarga ham umumiy limitdan tez yuborilmaydi"""
+        async def test(api, bot):
+            broadcaster = BroadcastService(bot, global_rate=20, chat_rate=100, concurrency=10)
+            report = await broadcaster.run(
+                range(1, 31),
+                lambda chat_id: broadcaster.send_message(chat_id, 'Eslatma')
+            )
+            self.assertEqual((report['total'], report['sent'], report['failed']), (30, 30, 0))
+            self.assertEqual(len(api.requests), 30)
+
+            # 20 ta token darhol, qolgan 10 tasi 20/s tezlikda
+            times = sorted(at for at, _, _ in api.requests)
+            self.assertGreaterEqual(times[-1] - times[0], 10 / 20 * 0.9)
+        await self.with_api(test)
+
+    async def test_chat_rate(self):
+        """Bitta chatga chat_rate dan tez yuborilmaydi (guruhlar uchun group_rate)"""
+        async def test(api, bot):
+            broadcaster = BroadcastService(bot, global_rate=100, chat_rate=10, group_rate=5, concurrency=5)
+            await asyncio.gather(*(broadcaster.send_message(7, 'Salom') for _ in range(4)))
+            await asyncio.gather(*(broadcaster.send_message(-100, 'Salom') for _ in range(3)))
+
+            private, group = api.chat_requests(7), api.chat_requests(-100)
+            self.assertGreaterEqual(private[-1] - private[0], 3 / 10 * 0.9)
+            self.assertGreaterEqual(group[-1] - group[0], 2 / 5 * 0.9)
+        await self.with_api(test)
+
+    async def test_retry_after(self):
+        """429 dan keyin retry_after kutiladi va so'rov qaytariladi"""
+        async def test(api, bot):
+            api.retry_after[7] = [1]
+            broadcaster = BroadcastService(bot, global_rate=100, chat_rate=100)
+            message = await broadcaster.send_message(7, 'Salom')
+
+            self.assertEqual(message.chat.id, 7)
+            first, second = api.chat_requests(7)
+            self.assertGreaterEqual(second - first, 0.9)
+        await self.with_api(test)
+
+    async def test_retry_after_exhausted(self):
+        """max_retries dan keyin TelegramRetryAfter ko'tariladi, run() da muvaffaqiyatsiz hisoblanadi"""
+        async def test(api, bot):
+            api.retry_after[7] = [1]
+            broadcaster = BroadcastService(bot, global_rate=100, chat_rate=100, max_retries=0)
+            with self.assertRaises(TelegramRetryAfter):
+                await broadcaster.send_message(7, 'Salom')
+
+            api.retry_after[8] = [1]
+            report = await broadcaster.run([8, 9], lambda chat_id: broadcaster.send_message(chat_id, 'Salom'))
+            self.assertEqual((report['sent'], report['failed']), (1, 1))
+        await self.with_api(test)
+
+
+class GroupDigestTests(TestCase):
+    """Guruh digestlari: eslatma digest yetkazilgandan keyingina belgilanadi (ReminderService)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        schedule = PaymentSchedule.objects.create(
+            academic_year='2025-2026', stage='1/4', due_date=date.today() + timedelta(days=3)
+        )
+        cls.failing = Group.objects.create(name='1-guruh', telegram_chat_id=-100)
+        cls.working = Group.objects.create(name='2-guruh', telegram_chat_id=-200)
+        for i, group in enumerate([cls.failing, cls.failing, cls.working]):
+            user = User.objects.create(username=f'talaba{i}', telegram_id=3000 + i)
+            student = Student.objects.create(
+                user=user, student_id=f'S{i:04d}', first_name='Ism', last_name=f'Familiya{i}',
+                patronymic='Otasi', passport_series='AA', passport_number=f'{i:07d}',
+                jshshir=f'{i:014d}', phone='+998901234567', group=group
+            )
+            PaymentReminder.objects.create(payment_schedule=schedule, student=student, days_before=3)
+
+    def setUp(self):
+        checkpoints = TemporaryDirectory()
+        self.addCleanup(checkpoints.cleanup)
+        self.checkpoint = str(Path(checkpoints.name) / 'sent.checkpoint')
+
+    async def send(self, failing_chats):
+        api = await FakeBotAPI().start()
+        api.failing_chats = set(failing_chats)
+        bot = api.bot()
+        try:
+            report = await ReminderService.check_and_send_reminders(
+                bot, sent_buffer=SentReminderBuffer(self.checkpoint)
+            )
+        finally:
+            await bot.session.close()
+            await api.close()
+        return report, api
+
+    def sent_groups(self):
+        return set(
+            PaymentReminder.objects.filter(is_sent=True).values_list('student__group__name', flat=True)
+        )
+
+    def test_failed_digest_keeps_reminders_unsent(self):
+        """Guruhga yuborish muvaffaqiyatsiz bo'lsa eslatmalar belgilanmaydi va keyingi safar qayta yuboriladi"""
+        report, api = async_to_sync(self.send)([-100])
+        self.assertEqual((report['group_messages'], report['group_failed']), (1, 1))
+        self.assertEqual(self.sent_groups(), {'2-guruh'})
+
+        report, api = async_to_sync(self.send)([])
+        self.assertEqual((report['total'], report['group_messages'], report['group_failed']), (2, 1, 0))
+        self.assertEqual(len(api.chat_requests(-100)), 1)
+        self.assertEqual(self.sent_groups(), {'1-guruh', '2-guruh'})
@@ -0,0 +1,17 @@
+# webapp/admin_panel/urls.py
+from django.urls import path
+
+from . import views
+
+app_name = 'admin_panel'
+
+urlpatterns = [
+    path('', views.dashboard, name='dashboard'),
+    path('students/', views.students_list, name='students_list'),
+    path('students/<int:student_id>/', views.student_detail, name='student_detail'),
+    path('groups/', views.groups_list, name='groups_list'),
+    path('payments/', views.payments_schedule, name='payments_schedule'),
+    path('receipts/', views.receipts_list, name='receipts_list'),
+    path('receipts/bulk-review/', views.receipts_bulk_review, name='receipts_bulk_review'),
+    path('receipts/<int:receipt_id>/', views.receipt_review, name='receipt_review'),
+]
@@ -1,79 +1,108 @@
 # webapp/admin_panel/views.py
+import csv
+from itertools import chain
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Count, Q
-from datetime import datetime, timedelta
+from django.db.models import Count
+from django.utils import timezone
+from datetime import datetime, time, timedelta
 from .models import (
     Student, Group, PaymentSchedule, Receipt,
-    PaymentReminder, User
+    PaymentReminder, User, ReviewBatch
 )
+from .dashboard import get_dashboard, invalidate_dashboard
+from .pagination import CachedCountPaginator, cached_count, receipts_page
+
+# CSV eksportda bazadan bir martada o'qiladigan qatorlar
+EXPORT_CHUNK_SIZE = 2000
+
+
+class Echo:
+    """csv.writer uchun - yozilgan qatorni qaytaradi (StreamingHttpResponse)"""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(filename, header, rows):
+    """Qatorlarni bazadan o'qilishi bilan CSV sifatida yuborish (butun ro'yxat xotiraga olinmaydi)"""
+    writer = csv.writer(Echo())
+    response = StreamingHttpResponse(
+        (writer.writerow(row) for row in chain([header], rows)),
+        content_type='text/csv; charset=utf-8'
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def filter_query(request, *exclude):
+    """Sahifalash havolalari uchun joriy filtrlar (sahifa parametrlarisiz)"""
+    query = request.GET.copy()
+    for key in exclude:
+        query.pop(key, None)
+    return query.urlencode()
+
+
+def parse_date(value):
+    """YYYY-MM-DD sanani o'qish (noto'g'ri bo'lsa None)"""
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        return None
 
 
 @login_required
 def dashboard(request):
-    """Dashboard - asosiy sahifa"""
-    # Statistika
-    total_students = Student.objects.filter(is_active=True).count()
-    total_groups = Group.objects.filter(is_active=True).count()
-
-    pending_receipts = Receipt.objects.filter(status='pending').count()
-    approved_receipts = Receipt.objects.filter(status='approved').count()
-    rejected_receipts = Receipt.objects.filter(status='rejected').count()
-
-    # Yaqin kunlardagi to'lovlar
-    today = datetime.now().date()
-    upcoming_payments = PaymentSchedule.objects.filter(
-        due_date__gte=today,
-        due_date__lte=today + timedelta(days=30),
-        is_active=True
-    ).order_by('due_date')
-
-    # Oxirgi cheklar
-    recent_receipts = Receipt.objects.select_related(
-        'student', 'payment_schedule'
-    ).order_by('-submitted_at')[:10]
-
-    context = {
-        'total_students': total_students,
-        'total_groups': total_groups,
-        'pending_receipts': pending_receipts,
-        'approved_receipts': approved_receipts,
-        'rejected_receipts': rejected_receipts,
-        'upcoming_payments': upcoming_payments,
-        'recent_receipts': recent_receipts,
-    }
+    """Dashboard - asosiy sahifa (statistika keshdan, qarang: dashboard.get_dashboard)"""
+    context = get_dashboard()
 
     return render(request, 'admin_panel/dashboard.html', context)
 
 
 @login_required
 def students_list(request):
-    """Talabalar ro'yxati"""
-    students = Student.objects.select_related('group').order_by('last_name')
+    """Talabalar ro'yxati (sahifalangan, ?export=csv - to'liq ro'yxat)"""
+    students = Student.objects.select_related('group').only(
+        'id', 'student_id', 'first_name', 'last_name', 'patronymic', 'phone', 'is_active',
+        'group', 'group__name'
+    ).order_by('last_name', 'id')
 
-    # Qidiruv
+    # Qidiruv (natijalar mosligi bo'yicha saralanadi)
     search = request.GET.get('search', '')
     if search:
-        students = students.filter(
-            Q(student_id__icontains=search) |
-            Q(first_name__icontains=search) |
-            Q(last_name__icontains=search) |
-            Q(jshshir__icontains=search)
-        )
+        students = students.search(search)
 
     # Guruh bo'yicha filtr
     group_id = request.GET.get('group', '')
     if group_id:
         students = students.filter(group_id=group_id)
 
+    if request.GET.get('export') == 'csv':
+        rows = students.values_list(
+            'student_id', 'last_name', 'first_name', 'patronymic', 'group__name', 'phone', 'is_active'
+        ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        return stream_csv(
+            'talabalar.csv',
+            ['Talaba ID', 'Familiya', 'Ism', 'Otasining ismi', 'Guruh', 'Telefon', 'Faol'],
+            rows
+        )
+
+    paginator = CachedCountPaginator(students, settings.ADMIN_LIST_PAGE_SIZE)
+    page_obj = paginator.get_page(request.GET.get('page'))
+
     groups = Group.objects.filter(is_active=True).order_by('name')
 
     context = {
-        'students': students,
+        'students': page_obj,
+        'page_obj': page_obj,
         'groups': groups,
         'search': search,
         'selected_group': group_id,
+        'filter_query': filter_query(request, 'page'),
     }
 
     return render(request, 'admin_panel/students.html', context)
@@ -128,10 +157,20 @@ def payments_schedule(request):
 
 @login_required
 def receipts_list(request):
-    """Cheklar ro'yxati"""
+    """
+    Cheklar ro'yxati
+
+    (submitted_at, id) kursori bo'yicha sahifalanadi - chuqur sahifalar ham
+    birinchisi kabi indeks bo'yicha o'qiladi. ?export=csv - to'liq ro'yxat.
+    """
     receipts = Receipt.objects.select_related(
         'student', 'payment_schedule', 'reviewed_by'
-    ).order_by('-submitted_at')
+    ).only(
+        'id', 'status', 'submitted_at', 'reviewed_at',
+        'student', 'student__student_id', 'student__first_name', 'student__last_name', 'student__patronymic',
+        'payment_schedule', 'payment_schedule__stage',
+        'reviewed_by', 'reviewed_by__username', 'reviewed_by__first_name', 'reviewed_by__last_name'
+    )
 
     # Status bo'yicha filtr
     status = request.GET.get('status', '')
@@ -143,10 +182,56 @@ def receipts_list(request):
     if stage:
         receipts = receipts.filter(payment_schedule__stage=stage)
 
+    # Guruh bo'yicha filtr
+    group_id = request.GET.get('group', '')
+    if group_id:
+        receipts = receipts.filter(student__group_id=group_id)
+
+    # Sana oralig'i bo'yicha filtr (submitted_at indeksidan foydalanish uchun vaqt oralig'i)
+    date_from = request.GET.get('date_from', '')
+    if parse_date(date_from):
+        receipts = receipts.filter(
+            submitted_at__gte=timezone.make_aware(datetime.combine(parse_date(date_from), time.min))
+        )
+
+    date_to = request.GET.get('date_to', '')
+    if parse_date(date_to):
+        receipts = receipts.filter(
+            submitted_at__lt=timezone.make_aware(datetime.combine(parse_date(date_to) + timedelta(days=1), time.min))
+        )
+
+    if request.GET.get('export') == 'csv':
+        rows = receipts.order_by('-submitted_at', '-id').values_list(
+            'id', 'student__student_id', 'student__last_name', 'student__first_name',
+            'payment_schedule__stage', 'status', 'submitted_at', 'reviewed_by__username', 'reviewed_at'
+        ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        return stream_csv(
+            'cheklar.csv',
+            ['ID', 'Talaba ID', 'Familiya', 'Ism', 'Bosqich', 'Holat', 'Yuborilgan vaqt', "Ko'rib chiqdi",
+             "Ko'rilgan vaqt"],
+            rows
+        )
+
+    page, prev_cursor, next_cursor = receipts_page(
+        receipts,
+        after=request.GET.get('after'),
+        before=request.GET.get('before')
+    )
+
+    groups = Group.objects.filter(is_active=True).order_by('name')
+
     context = {
-        'receipts': receipts,
+        'receipts': page,
+        'total_receipts': cached_count(receipts),
+        'prev_cursor': prev_cursor,
+        'next_cursor': next_cursor,
+        'filter_query': filter_query(request, 'after', 'before'),
+        'groups': groups,
         'selected_status': status,
         'selected_stage': stage,
+        'selected_group': group_id,
+        'date_from': date_from,
+        'date_to': date_to,
     }
 
     return render(request, 'admin_panel/receipts.html', context)
@@ -165,14 +250,20 @@ def receipt_review(request, receipt_id):
         notes = request.POST.get('notes', '')
 
         if action in ['approved', 'rejected']:
-            receipt.status = action
-            receipt.reviewed_by = request.user
-            receipt.reviewed_at = datetime.now()
-            receipt.notes = notes
-            receipt.save()
-
-            status_text = 'tasdiqlandi' if action == 'approved' else 'rad etildi'
-            messages.success(request, f'Chek {status_text}!')
+            # Faqat kutilayotgan chek yangilanadi - boshqa admin bilan bir vaqtda ko'rib chiqilsa ham bir marta
+            updated = Receipt.objects.filter(id=receipt.id, status='pending').update(
+                status=action,
+                reviewed_by=request.user,
+                reviewed_at=timezone.now(),
+                notes=notes
+            )
+
+            if updated:
+                invalidate_dashboard()
+                status_text = 'tasdiqlandi' if action == 'approved' else 'rad etildi'
+                messages.success(request, f'Chek {status_text}!')
+            else:
+                messages.warning(request, 'Bu chek allaqachon ko\'rib chiqilgan!')
 
             return redirect('admin_panel:receipts_list')
 
@@ -180,4 +271,47 @@ def receipt_review(request, receipt_id):
         'receipt': receipt,
     }
 
-    return render(request, 'admin_panel/receipt_review.html', context)
\ No newline at end of file
+    return render(request, 'admin_panel/receipt_review.html', context)
+
+
+@login_required
+def receipts_bulk_review(request):
+    """Filtr bo'yicha kutilayotgan cheklarni ommaviy ko'rib chiqish"""
+    if request.method == 'POST':
+        action = request.POST.get('action')
+
+        if action in ['approved', 'rejected']:
+            group_id = request.POST.get('group') or None
+            if group_id is not None and not group_id.isdigit():
+                messages.error(request, 'Noto\'g\'ri guruh!')
+                return redirect('admin_panel:receipts_list')
+
+            try:
+                date_from = request.POST.get('date_from') or None
+                date_to = request.POST.get('date_to') or None
+                date_from = datetime.strptime(date_from, '%Y-%m-%d').date() if date_from else None
+                date_to = datetime.strptime(date_to, '%Y-%m-%d').date() if date_to else None
+            except ValueError:
+                messages.error(request, 'Noto\'g\'ri sana!')
+                return redirect('admin_panel:receipts_list')
+
+            batch = ReviewBatch.review(
+                action,
+                request.user,
+                stage=request.POST.get('stage') or None,
+                group_id=group_id,
+                date_from=date_from,
+                date_to=date_to
+            )
+
+            if batch.total:
+                invalidate_dashboard()
+                status_text = 'tasdiqlandi' if action == 'approved' else 'rad etildi'
+                messages.success(
+                    request,
+                    f'{batch.total} ta chek {status_text}! Talabalarga xabar bot orqali yuboriladi.'
+                )
+            else:
+                messages.warning(request, 'Filtrga mos kutilayotgan cheklar topilmadi!')
+
+    return redirect('admin_panel:receipts_list')
@@ -18,6 +18,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'admin_panel',
 ]
 
@@ -83,4 +84,27 @@ STATICFILES_DIRS = [BASE_DIR / 'static']
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
-DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
\ No newline at end of file
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Admin panel ro'yxatlari: sahifa hajmi va jami sonlar keshi (soniya)
+ADMIN_LIST_PAGE_SIZE = int(os.getenv('ADMIN_LIST_PAGE_SIZE', '50'))
+ADMIN_COUNT_CACHE_TTL = int(os.getenv('ADMIN_COUNT_CACHE_TTL', '60'))
+# Django admin: shundan katta jadvallarda filtrsiz ro'yxat soni PostgreSQL statistikasidan olinadi
+ADMIN_ESTIMATED_COUNT_MIN = int(os.getenv('ADMIN_ESTIMATED_COUNT_MIN', '100000'))
+
+ADMIN_DASHBOARD_CACHE_TTL = int(os.getenv('ADMIN_DASHBOARD_CACHE_TTL', '30'))
+
+# Kesh: CACHE_URL (redis://...) berilsa bot va web panel bitta keshni ishlatadi -
+# botdagi o'zgarishlar dashboard keshini, web paneldagi rol o'zgarishlari botdagi
+# foydalanuvchi keshini darhol tozalaydi (redis paketi kerak).
+# Aks holda har bir jarayonning o'z xotira keshi, boshqa jarayondagi o'zgarishlar TTL dan keyin ko'rinadi.
+CACHE_URL = os.getenv('CACHE_URL', '')
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': CACHE_URL,
+    } if CACHE_URL else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    }
+}